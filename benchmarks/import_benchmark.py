@@ -0,0 +1,81 @@
+"""
+Benchmark of the import time of the package, from the output of ``python -X importtime``.
+
+Importing the package only imports its version: the modules of its public names, and their dependencies (NumPy,
+pandas, spaCy, scikit-learn), are imported on first use of a name. For every statement, the benchmark gives the best
+import time over the runs and the heavy dependencies imported. With ``--check``, it fails if a statement expected to
+be light imports a heavy dependency or takes more than ``--max-ms``.
+
+Usage:
+    python benchmarks/import_benchmark.py --repeat 5 --check
+"""
+
+import argparse
+import subprocess
+import sys
+
+HEAVY_MODULES = ["numpy", "pandas", "spacy", "sklearn", "scipy", "thinc"]
+
+# The statements and whether they must stay light (without heavy dependency)
+STATEMENTS = [
+    ("import text_complexity_computer", True),
+    ("from text_complexity_computer import __version__", True),
+    ("from text_complexity_computer.tools import clean_text", True),
+    ("from text_complexity_computer import TextComplexityComputer", False),
+]
+
+
+def measure_import(statement):
+    """
+    Run a statement in a new interpreter with ``-X importtime``.
+
+    Returns:
+        A tuple (import_times, heavy_modules): the cumulative import time in milliseconds of every top-level import and
+        the heavy dependencies imported
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True, check=True
+    ).stderr
+    import_times = {}
+    heavy_modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        module = name.strip()
+        # The top-level imports are not indented, their cumulative times include the imports they triggered
+        if not name.startswith("  "):
+            import_times[module] = int(cumulative) / 1000
+        if module.split(".")[0] in HEAVY_MODULES:
+            heavy_modules.add(module.split(".")[0])
+    return import_times, sorted(heavy_modules)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="fail if a light statement regressed")
+    parser.add_argument("--max-ms", type=float, default=100.0, help="maximum import time of the light statements")
+    args = parser.parse_args()
+
+    # The modules imported by the interpreter startup (site, encodings, ...) are not imported by the statements
+    startup_modules = set(measure_import("pass")[0])
+    failures = []
+    print(f"{'statement':<62} {'time (ms)':>10}  heavy modules")
+    for statement, light in STATEMENTS:
+        measures = [measure_import(statement) for _ in range(args.repeat)]
+        import_time = min(
+            sum(module_time for module, module_time in import_times.items() if module not in startup_modules)
+            for import_times, _ in measures
+        )
+        heavy_modules = measures[0][1]
+        print(f"{statement:<62} {import_time:>10.1f}  {', '.join(heavy_modules) or '-'}")
+        if light and (len(heavy_modules) > 0 or import_time > args.max_ms):
+            failures.append(statement)
+
+    if args.check and len(failures) > 0:
+        raise SystemExit(f"Import regression of: {', '.join(failures)}")
+
+
+if __name__ == "__main__":
+    main()
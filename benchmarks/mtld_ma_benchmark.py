@@ -0,0 +1,98 @@
+"""
+Benchmark of the moving-average bidirectional MTLD (MTLD-MA bid) on long sequences of words.
+
+It compares ``lexical_diversity.measure_textual_lexical_diversity_ma_bid``, whose factors skip the words within which
+they cannot be complete, to the previous implementation where the factors of all the starts grew together one word at
+a time, which is quadratic on a diverse text (no factor is complete before the end of the text).
+
+Usage:
+    python benchmarks/mtld_ma_benchmark.py --num-words 5000 20000 40000 --repeat 3
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+import spacy
+from spacy.tokens import Doc
+
+from text_complexity_computer.calculation_functions import lexical_diversity
+
+
+# Previous implementation: the factors of every start grow one word per step until they are complete.
+def _legacy_factor_sizes(previous):
+    factor_sizes = np.zeros(len(previous), dtype=np.int64)
+    starts = np.arange(len(previous))
+    num_types = np.zeros(len(previous), dtype=np.int64)
+    count = 0
+    while len(starts) > 0:
+        in_sequence = starts + count < len(previous)
+        starts, num_types = starts[in_sequence], num_types[in_sequence]
+        is_new = previous[starts + count] < starts
+        num_types += is_new
+        count += 1
+        if count < 10:
+            continue
+        complete = ~is_new & (num_types / count <= 0.72)
+        factor_sizes[starts[complete]] = count
+        starts, num_types = starts[~complete], num_types[~complete]
+    return factor_sizes
+
+
+def _legacy_unidir(words):
+    previous = []
+    last_seen = {}
+    for i, word in enumerate(words):
+        previous.append(last_seen.get(word, -1))
+        last_seen[word] = i
+    factor_sizes = _legacy_factor_sizes(np.array(previous, dtype=np.int64))
+    complete = factor_sizes > 0
+    if not complete.any():
+        return lexical_diversity.measure_textual_lexical_diversity_unidir(np.array(words, dtype=np.uint64))
+    return float(factor_sizes[complete].mean())
+
+
+def legacy_ma_bid(sp_object):
+    words = [token.orth for token in lexical_diversity.get_filtered_words(sp_object, without_stop=True)]
+    return (_legacy_unidir(words) + _legacy_unidir(words[::-1])) / 2
+
+
+def get_sequences(num_words):
+    rng = np.random.default_rng(0)
+    return {
+        "distinct": np.arange(num_words),
+        "uniform": rng.integers(0, num_words // 2, num_words),
+        "zipf": rng.zipf(1.2, num_words) % 50000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-words", type=int, nargs="+", default=[5000, 20000, 40000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    vocab = spacy.blank("fr").vocab
+    print(f"{'sequence':>10} {'words':>8} {'legacy (s)':>11} {'current (s)':>12} {'speedup':>8}")
+    for num_words in args.num_words:
+        for name, sequence in get_sequences(num_words).items():
+            sp_object = Doc(vocab, words=[f"mot{i}" for i in sequence.tolist()])
+            if legacy_ma_bid(sp_object) != lexical_diversity.measure_textual_lexical_diversity_ma_bid(sp_object):
+                raise AssertionError("The MTLD-MA bid is not the same as the one of the legacy implementation.")
+
+            legacy_time = min(timeit.repeat(lambda: legacy_ma_bid(sp_object), number=1, repeat=args.repeat))
+            current_time = min(
+                timeit.repeat(
+                    lambda: lexical_diversity.measure_textual_lexical_diversity_ma_bid(sp_object),
+                    number=1,
+                    repeat=args.repeat,
+                )
+            )
+            print(
+                f"{name:>10} {num_words:>8} {legacy_time:>11.4f} {current_time:>12.4f} "
+                f"{legacy_time / current_time:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
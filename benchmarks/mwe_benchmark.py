@@ -0,0 +1,62 @@
+"""
+Benchmark of the multi-word expressions search of the Biber dimensions on long documents.
+
+It compares the single automaton of all the word lists (``biberpy.count_mwes``), which scans the text once, to the
+previous search with one automaton per word list (``tools.read_word_lists``), which scanned the text once per word
+list. Both searches are made on the cleaned text with the same word boundary checks.
+
+Usage:
+    python benchmarks/mwe_benchmark.py --num-paragraphs 200 --repeat 5
+"""
+
+import argparse
+import os
+import timeit
+
+from text_complexity_computer.calculation_functions import biberpy
+from text_complexity_computer.tools import build_mwe_automaton, clean_text, read_word_lists
+
+PARAGRAPH = (
+    "Par exemple, le conseil municipal a décidé en tout cas de lancer un appel d'offres. Tout le monde sait que les "
+    "travaux, au contraire, devaient être réalisés à l'étranger plus ou moins avant l'été. En revanche, il dit que tu "
+    "aimes nager à côté de la mer, mais je pense qu'il ment. D'autre part, elle viendra peu de temps après demain. "
+)
+
+
+def per_class_counts(text, mwe_list):
+    counts = {}
+    for ftclass, automaton in mwe_list.items():
+        for end, (_, key) in automaton.iter(text):
+            start = end - len(key)
+            if (start < 0 or not text[start].isalnum()) and (end + 1 >= len(text) or not text[end + 1].isalnum()):
+                counts[ftclass] = counts.get(ftclass, 0) + 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-paragraphs", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    word_lists, mwe_list = read_word_lists(
+        os.path.join(os.path.dirname(biberpy.__file__), "..", "resources", "fr", "fr.properties"), verbosity=0
+    )
+    biberpy.mwe_automaton, biberpy.mwe_classes = build_mwe_automaton(word_lists)
+    print(f"{len(mwe_list)} word lists with multi-word expressions")
+    print(f"{'paragraphs':>10} {'chars':>9} {'per list (s)':>13} {'single (s)':>11} {'speedup':>8}")
+    for num_paragraphs in args.num_paragraphs:
+        text = " ".join(clean_text(PARAGRAPH * num_paragraphs).lower().split())
+        if per_class_counts(text, mwe_list) != biberpy.count_mwes(text):
+            raise AssertionError("The single automaton does not give the same counts as the per list automata.")
+
+        per_class_time = min(timeit.repeat(lambda: per_class_counts(text, mwe_list), number=1, repeat=args.repeat))
+        single_time = min(timeit.repeat(lambda: biberpy.count_mwes(text), number=1, repeat=args.repeat))
+        print(
+            f"{num_paragraphs:>10} {len(text):>9} {per_class_time:>13.4f} {single_time:>11.4f} "
+            f"{per_class_time / single_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
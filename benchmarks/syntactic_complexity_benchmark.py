@@ -0,0 +1,135 @@
+"""
+Benchmark of the syntactic complexity metrics on long documents.
+
+It compares the fused extractor (``syntactic_complexity.get_syntactic_stats``), which walks the spaCy object once for
+all the syntactic metrics, to the previous implementation where every metric recounted its own sentences, words,
+clauses and T-Units.
+
+Usage:
+    python benchmarks/syntactic_complexity_benchmark.py --num-paragraphs 200 --repeat 5
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+import spacy
+
+from text_complexity_computer.calculation_functions import syntactic_complexity
+from text_complexity_computer.calculation_functions.metrics_utils import (
+    clear_memoized,
+    get_num_sentences,
+    get_num_words,
+    safe_divide,
+)
+
+PARAGRAPH = (
+    "Il joue au foot parce qu'il aime le beau sport. Quel joueur ! Le conseil municipal, réuni en séance ordinaire, "
+    "a décidé, après avoir entendu le rapport du maire et considérant que les travaux, dont le coût a été estimé par "
+    "les services techniques, devaient être réalisés avant l'été, de lancer un appel d'offres. Il dit que tu aimes "
+    "nager, mais je pense qu'il ment et que la mer ne lui plaît pas. "
+)
+
+
+# Previous implementation: every metric counts its own inputs.
+def _legacy_t_units(sp_object, complex_count=False):
+    t_unit_count = get_num_sentences(sp_object)
+    complex_t_unit_count = 0
+    for sentence in sp_object.sents:
+        complex_t_unit_pres = False
+        for token in sentence:
+            if token.dep_ == "conj":
+                t_unit_count += 1
+            if complex_count and token.dep_ == "ROOT":
+                complex_t_unit_pres = syntactic_complexity.check_if_complex(token)
+        if complex_count and complex_t_unit_pres:
+            complex_t_unit_count += 1
+    if complex_count:
+        return t_unit_count, complex_t_unit_count
+    return t_unit_count
+
+
+def _legacy_clauses(sp_object, dependent_count=False):
+    clause_count = get_num_sentences(sp_object)
+    dc_count = 0
+    for token in sp_object:
+        if token.dep_[:3] == "acl" or token.dep_ in ["conj", "ccomp", "orphan", "advcl"]:
+            clause_count += 1
+            dc_count += 1
+    if dependent_count:
+        return clause_count, dc_count
+    return clause_count
+
+
+def _legacy_coordinate(sp_object):
+    return len([token for token in sp_object if token.dep_ == "conj"])
+
+
+def _legacy_nws_90(sp_object):
+    sentences = list(range(get_num_sentences(sp_object)))
+    if len(sentences) == 0:
+        return 0
+    return get_num_words(list(sp_object.sents)[int(np.percentile(sentences, 90))])
+
+
+def legacy_metrics(sp_object):
+    return [
+        safe_divide(get_num_words(sp_object), get_num_sentences(sp_object)),
+        safe_divide(
+            len([s for s in sp_object.sents if get_num_words(s) >= 30]),
+            get_num_sentences(sp_object),
+        ),
+        _legacy_nws_90(sp_object),
+        safe_divide(get_num_words(sp_object), _legacy_t_units(sp_object)),
+        safe_divide(_legacy_t_units(sp_object), get_num_sentences(sp_object)),
+        safe_divide(*reversed(_legacy_t_units(sp_object, complex_count=True))),
+        safe_divide(*reversed(_legacy_clauses(sp_object, dependent_count=True))),
+        safe_divide(_legacy_clauses(sp_object), get_num_sentences(sp_object)),
+        safe_divide(_legacy_clauses(sp_object), _legacy_t_units(sp_object)),
+        safe_divide(_legacy_coordinate(sp_object), _legacy_clauses(sp_object)),
+        safe_divide(_legacy_coordinate(sp_object), _legacy_t_units(sp_object)),
+    ]
+
+
+def fused_metrics(sp_object):
+    # Drop the memoized token table and counts so that every run pays for its walk of the spaCy object.
+    clear_memoized(sp_object)
+    return [
+        syntactic_complexity.mean_length_sentences(sp_object),
+        syntactic_complexity.ps_30(sp_object),
+        syntactic_complexity.nws_90(sp_object),
+        syntactic_complexity.mean_length_tunit(sp_object),
+        syntactic_complexity.tu_s(sp_object),
+        syntactic_complexity.ctu_tu(sp_object),
+        syntactic_complexity.dc_c(sp_object),
+        syntactic_complexity.c_s(sp_object),
+        syntactic_complexity.c_tu(sp_object),
+        syntactic_complexity.cp_c(sp_object),
+        syntactic_complexity.cp_tu(sp_object),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-paragraphs", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tagger = spacy.load("fr_core_news_sm")
+    tagger.max_length = 5000000
+    print(f"{'paragraphs':>10} {'tokens':>8} {'legacy (s)':>11} {'fused (s)':>10} {'speedup':>8}")
+    for num_paragraphs in args.num_paragraphs:
+        sp_object = tagger(PARAGRAPH * num_paragraphs)
+        if legacy_metrics(sp_object) != fused_metrics(sp_object):
+            raise AssertionError("The fused extractor does not give the same metrics as the legacy implementation.")
+
+        legacy_time = min(timeit.repeat(lambda: legacy_metrics(sp_object), number=1, repeat=args.repeat))
+        fused_time = min(timeit.repeat(lambda: fused_metrics(sp_object), number=1, repeat=args.repeat))
+        print(
+            f"{num_paragraphs:>10} {len(sp_object):>8} {legacy_time:>11.4f} {fused_time:>10.4f} "
+            f"{legacy_time / fused_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
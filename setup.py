@@ -69,6 +69,9 @@ def main():
         data_files=[("resources.fr", glob.glob('*/*/fr/*')), ("resources.en", glob.glob('*/*/en/*'))],
         include_package_data=True,
         install_requires=["spacy", "numpy", "pandas", "pyahocorasick", "scikit-learn"],
+        entry_points={
+            "spacy_factories": ["text_complexity = text_complexity_computer.pipeline:create_text_complexity_component"]
+        },
         python_requires=">=3.8",
         description="A library for evaluate text difficulty in French.",
         long_description=readme,
@@ -4,4 +4,7 @@ from . import (
     test_syntactic_complexity,
     test_vocabulary_complexity,
     test_lexical_diversity,
+    test_lexicon,
+    test_biberpy,
+    test_registry,
 )
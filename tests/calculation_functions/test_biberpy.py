@@ -0,0 +1,145 @@
+from unittest import TestCase, main
+
+from text_complexity_computer import TextComplexityComputer
+from text_complexity_computer.calculation_functions import biberpy
+from text_complexity_computer.tools import build_mwe_automaton
+
+# A "most frequent tag" list in the format of read_num_list
+TAG_LIST = {
+    "il": ("1", "il", "PRON", "Gender=Masc|Number=Sing|Person=3"),
+    "dit": ("1", "dire", "VERB", "Mood=Ind|Number=Sing|Person=3|Tense=Pres|VerbForm=Fin"),
+    "a": ("1", "avoir", "AUX", "Mood=Ind|Number=Sing|Person=3|Tense=Pres|VerbForm=Fin"),
+    "fait": ("1", "faire", "VERB", "Gender=Masc|Number=Sing|Tense=Past|VerbForm=Part"),
+    "est": ("1", "être", "AUX", "Mood=Ind|Number=Sing|Person=3|Tense=Pres|VerbForm=Fin"),
+    "beau": ("1", "beau", "ADJ", "Gender=Masc|Number=Sing"),
+    "le": ("1", "le", "DET", "Definite=Def|Gender=Masc|Number=Sing|PronType=Art"),
+    "chat": ("1", "chat", "NOUN", "Gender=Masc|Number=Sing"),
+    "doit": ("1", "devoir", "VERB", "Mood=Ind|Number=Sing|Person=3|Tense=Pres|VerbForm=Fin"),
+    "pas": ("1", "pas", "ADV", "Polarity=Neg"),
+    "tous": ("1", "tout", "NOUN", "Gender=Masc|Number=Plur"),
+    "avec": ("1", "avec", "ADP", "_"),
+    "qui": ("1", "qui", "PRON", "PronType=Rel"),
+    ".": ("1", ".", "PUNCT", "_"),
+    "création": ("1", "création", "NOUN", "Gender=Fem|Number=Sing"),
+}
+
+TEXT = (
+    "Il dit il a fait le beau chat . Il dit le beau chat doit . Le chat est beau chat et il fait pas tous . "
+    "Avec qui il a fait la création ? C'est fait avec"
+)
+
+tcc = TextComplexityComputer()
+# Set the word lists of biberpy, which are loaded on first use
+tcc.warmup()
+
+
+class TestGetBiberDims(TestCase):
+    def setUp(self):
+        self.previous_tag_list = biberpy.tag_list
+        biberpy.tag_list = TAG_LIST
+
+    def tearDown(self):
+        biberpy.tag_list = self.previous_tag_list
+
+    def test_givenText_thenAllDimensions(self):
+        self.assertCountEqual(biberpy.getbiberdims(TEXT), biberpy.dimnames.values())
+
+    def test_givenText_thenSameFeaturesAsTheFeatureFunctions(self):
+        doc = TEXT.strip().lower().split()
+        normalise = len(doc) + 0.000001
+        expected = {
+            "pastVerbs": biberpy.simplePartsOfSpeech(doc, "VERB", "Tense=Past")[0] / normalise,
+            "demonstrProns": biberpy.demonstrativePronouns(doc) / normalise,
+            "doAsProVerb": biberpy.doAsProVerb(doc) / normalise,
+            "nominalizations": biberpy.nominalizations(doc) / normalise,
+            "beAsMain": biberpy.beAsMainVerb(doc) / normalise,
+            "piedPiping": biberpy.piedPiping(doc) / normalise,
+            "TTR": biberpy.typeTokenRatio(doc),
+            "wordLength": biberpy.wordLength(doc),
+            "conjuncts": biberpy.conjuncts(doc) / normalise,
+            "contractions": biberpy.contractions(doc) / normalise,
+            "thatDeletion": biberpy.thatDeletion(doc) / normalise,
+            "strandedPrep": biberpy.strandedPrepositions(doc) / normalise,
+            "syntNegn": biberpy.syntheticNegation(doc) / normalise,
+        }
+        dims = biberpy.getbiberdims(TEXT)
+        for name, value in expected.items():
+            with self.subTest(name=name):
+                self.assertEqual(dims[name], value)
+
+    def test_givenThatDeletionPrescriptions_thenCounted(self):
+        # 'dit il' (subject pronoun) and 'dit le beau chat doit' (optional adjective, noun and modal)
+        dims = biberpy.getbiberdims("il dit il a fait . il dit le beau chat doit .")
+        self.assertEqual(dims["thatDeletion"], 2 / (13 + 0.000001))
+
+    def test_givenPrepositionAtTheEnd_thenNotStranded(self):
+        self.assertEqual(biberpy.getbiberdims("il fait avec")["strandedPrep"], 0)
+        self.assertEqual(biberpy.getbiberdims("il fait avec .")["strandedPrep"], 1 / (4 + 0.000001))
+
+    def test_givenEmptyText_thenNoFeature(self):
+        dims = biberpy.getbiberdims("")
+        self.assertCountEqual(dims, biberpy.dimnames.values())
+        self.assertTrue(all(value == 0 for value in dims.values()))
+
+
+class TestGetBiberDimsFromDoc(TestCase):
+    def test_givenDoc_thenSameFeaturesAsTheTaggedTokens(self):
+        sp_object = tcc.tagger("Il dit que tu viens.  Il ne fait pas beau, avec qui est-il venu ?")
+        # The non whitespace tokens in the [word, lemma, pos, fine tag] format of the feature functions
+        doc = [
+            [token.text, token.lemma_, token.pos_, str(token.morph) or "_"] for token in sp_object if not token.is_space
+        ]
+        normalise = len(doc) + 0.000001
+        expected = {
+            "pastVerbs": biberpy.simplePartsOfSpeech(doc, "VERB", "Tense=Past")[0] / normalise,
+            "presVerbs": biberpy.simplePartsOfSpeech(doc, "VERB", "Tense=Pres")[0] / normalise,
+            "2persProns": biberpy.pos_with_lemma_filter(doc, "PRON", "secondPersonPronouns") / normalise,
+            "Nouns": biberpy.simplePartsOfSpeech(doc, "NOUN")[0] / normalise - biberpy.nominalizations(doc) / normalise,
+            "TTR": biberpy.typeTokenRatio(doc),
+            "wordLength": biberpy.wordLength(doc),
+            "thatDeletion": biberpy.thatDeletion(doc) / normalise,
+            "syntNegn": biberpy.syntheticNegation(doc) / normalise,
+            "analNegn": biberpy.pos_with_lemma_filter(doc, "", "notWord") / normalise,
+        }
+        dims = biberpy.getbiberdims_from_doc(sp_object)
+        for name, value in expected.items():
+            with self.subTest(name=name):
+                self.assertEqual(dims[name], value)
+
+    def test_givenDocWithWhitespaces_thenWhitespacesSkipped(self):
+        self.assertEqual(
+            biberpy.getbiberdims_from_doc(tcc.tagger("Il ne fait pas beau.\n\nIl pleut.")),
+            biberpy.getbiberdims_from_doc(tcc.tagger("Il ne fait pas beau. Il pleut.")),
+        )
+
+
+class TestCountMwes(TestCase):
+    def test_givenMweOfSeveralWordLists_thenCountedInEveryList(self):
+        counts = biberpy.count_mwes("il vient par exemple en tout cas , tout le monde le sait")
+        self.assertEqual(counts, {"conjunctsSingle": 1, "conjunctsMWE": 2, "indefinitePronouns": 1})
+
+    def test_givenMweInsideWords_thenNotCounted(self):
+        self.assertEqual(biberpy.count_mwes("il sépar exemples"), {})
+
+    def test_givenMweInText_thenCountedInTheDimensions(self):
+        without_mwe = biberpy.getbiberdims_from_doc(tcc.tagger("Il vient, il part."))
+        with_mwe = biberpy.getbiberdims_from_doc(tcc.tagger("Il vient, par exemple."))
+        self.assertEqual(without_mwe["conjuncts"], 0)
+        self.assertGreater(with_mwe["conjuncts"], 0)
+
+
+class TestBuildMweAutomaton(TestCase):
+    def test_givenWordLists_thenOnlyMwesWithTheirClasses(self):
+        automaton, mwe_classes = build_mwe_automaton({"a": {"un", "par exemple"}, "b": {"Par exemple"}, "c": {"deux"}})
+        self.assertEqual(mwe_classes, ["a", "b"])
+        self.assertEqual(list(automaton.keys()), ["par exemple"])
+        self.assertEqual(automaton.get("par exemple"), (11, (0, 1)))
+
+    def test_givenNoMwe_thenEmptyAutomaton(self):
+        automaton, mwe_classes = build_mwe_automaton({"c": {"deux"}})
+        self.assertEqual(mwe_classes, [])
+        self.assertEqual(len(automaton), 0)
+
+
+if __name__ == "__main__":
+    main()
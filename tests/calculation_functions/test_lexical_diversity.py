@@ -1,5 +1,8 @@
 from unittest import TestCase, main
 
+import numpy as np
+from spacy.tokens import Doc
+
 from text_complexity_computer import TextComplexityComputer
 from text_complexity_computer.calculation_functions import lexical_diversity as ld
 
@@ -56,6 +59,17 @@ class TestMSTTR(TestCase):
         sp_object = tcc.get_sp_object(text)
         self.assertEqual(ld.mean_sequential_ttr(sp_object, segment_size=3), 2 / 3)
 
+    def test_givenManySegmentSizes_thenGetMetricOfEach(self):
+        # 6 words (without stopwords): segments of 2 words: (1/2+1+1/2)/3 = 2/3, of 6 words (the whole text): 4/6,
+        # and no segment of 100 words
+        text = "une journée journée est forte plaisante lorsque le matin est matin."
+        sp_object = tcc.get_sp_object(text)
+        msttrs = ld.mean_sequential_ttrs(sp_object, segment_sizes=[2, 3, 6, 100])
+        self.assertEqual(msttrs[2], 2 / 3)
+        self.assertEqual(msttrs[3], ld.mean_sequential_ttr(sp_object, segment_size=3))
+        self.assertEqual(msttrs[6], 4 / 6)
+        self.assertEqual(msttrs[100], 0)
+
 
 class TestMATTR(TestCase):
     # The window size has been reduced to 3 to avoid having to compute long texts (at least >100 words).
@@ -67,11 +81,22 @@ class TestMATTR(TestCase):
         self.assertEqual(ld.moving_average_ttr(sp_object, window_size=3), 0.8333333333333333)
 
     def test_givenNotDivisibleText_thenGetMetric(self):
-        # 7 words (without stopwords) with 2 repeated words and window size is not a multiple of 3:
-        # mattr = (2/3+1+1+2/3)/4 = 5/6
+        # 7 words (without stopwords) with 2 repeated words and window size is not a multiple of 3, every window of 3
+        # words being averaged: mattr = (2/3+1+1+2/3+2/3)/5 = 4/5
         text = "une journée journée est forte plaisante lorsque le matin est matin erreur."
         sp_object = tcc.get_sp_object(text)
-        self.assertEqual(ld.moving_average_ttr(sp_object, window_size=3), 0.8333333333333333)
+        self.assertAlmostEqual(ld.moving_average_ttr(sp_object, window_size=3), 0.8)
+
+    def test_givenManyWindowSizes_thenGetMetricOfEach(self):
+        # 6 words (without stopwords): windows of 2 words: (1/2+1+1+1+1/2)/5 = 4/5, of 6 words (the whole text): 4/6,
+        # and a window longer than the text is the whole text
+        text = "une journée journée est forte plaisante lorsque le matin est matin."
+        sp_object = tcc.get_sp_object(text)
+        mattrs = ld.moving_average_ttrs(sp_object, window_sizes=[2, 3, 6, 100])
+        self.assertAlmostEqual(mattrs[2], 0.8)
+        self.assertEqual(mattrs[3], ld.moving_average_ttr(sp_object, window_size=3))
+        self.assertAlmostEqual(mattrs[6], 4 / 6)
+        self.assertAlmostEqual(mattrs[100], 4 / 6)
 
     def test_givenTextWithPunctuations_thenGetMetric(self):
         # 6 words (without stopwords and punctuations) with 2 repeated: mattr = (2/3+1+1+2/3)/4 = 5/6
@@ -96,6 +121,61 @@ class TestMTLD(TestCase):
         sp_object = tcc.get_sp_object(text)
         self.assertEqual(ld.measure_textual_lexical_diversity(sp_object), 63.00000000000002)
 
+    def test_givenTokens_thenSameUnidirectionalMetric(self):
+        text = "Je ronge les lapins et les lapins rongent. " * 5
+        sp_object = tcc.get_sp_object(text)
+        filtered_words = ld.get_filtered_words(sp_object, without_stop=True)
+        filtered_ids = np.array([word.orth for word in filtered_words], dtype=np.uint64)
+        self.assertEqual(
+            ld.measure_textual_lexical_diversity_unidir(filtered_words),
+            ld.measure_textual_lexical_diversity_unidir(filtered_ids),
+        )
+
+
+class TestMTLDMABid(TestCase):
+    def test_givenRepeatedText_thenGetMetric(self):
+        # "ronge lapins lapins rongent" repeated (3 types): every factor, forward and backward, is complete at its 10th
+        # word, the minimum size of a factor
+        text = "Je ronge les lapins et les lapins rongent. " * 10
+        sp_object = tcc.get_sp_object(text)
+        self.assertEqual(ld.measure_textual_lexical_diversity_ma_bid(sp_object), 10)
+
+    def test_givenTextWithoutCompleteFactor_thenGetMTLD(self):
+        text = "une journée journée est forte plaisante lorsque le matin est matin."
+        sp_object = tcc.get_sp_object(text)
+        self.assertEqual(
+            ld.measure_textual_lexical_diversity_ma_bid(sp_object), ld.measure_textual_lexical_diversity(sp_object)
+        )
+
+    def test_givenRandomWords_thenSameMetricAsGrowingFactors(self):
+        rng = np.random.default_rng(0)
+        words = [f"mot{i}" for i in rng.integers(0, 40, 400).tolist()]
+        sp_object = Doc(tcc.tagger.vocab, words=words)
+        expected = (factors_mean_size(words) + factors_mean_size(words[::-1])) / 2
+        self.assertAlmostEqual(ld.measure_textual_lexical_diversity_ma_bid(sp_object), expected)
+
+    def test_givenManyDistinctWords_thenGetMTLD(self):
+        # No factor is ever complete (see benchmarks/mtld_ma_benchmark.py for the time taken)
+        sp_object = Doc(tcc.tagger.vocab, words=[f"mot{i}" for i in range(40000)])
+        self.assertEqual(
+            ld.measure_textual_lexical_diversity_ma_bid(sp_object), ld.measure_textual_lexical_diversity(sp_object)
+        )
+
+
+def factors_mean_size(words):
+    # The factors growing one word at a time from every start, as described by McCarthy and Jarvis
+    factor_sizes = []
+    for start in range(len(words)):
+        types = set()
+        for end in range(start, len(words)):
+            is_new = words[end] not in types
+            types.add(words[end])
+            size = end - start + 1
+            if size >= 10 and not is_new and len(types) / size <= 0.72:
+                factor_sizes.append(size)
+                break
+    return sum(factor_sizes) / len(factor_sizes)
+
 
 if __name__ == "__main__":
     main()
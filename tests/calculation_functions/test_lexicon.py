@@ -0,0 +1,49 @@
+from math import log
+from unittest import TestCase, main
+
+import numpy as np
+from spacy.strings import get_string_id  # pylint: disable=no-name-in-module
+
+from text_complexity_computer.calculation_functions import lexicon as lx
+
+
+class TestLexicon(TestCase):
+    def test_givenLanguage_thenLexiconIsLoadedOnce(self):
+        self.assertIs(lx.get_lexicon("fr"), lx.get_lexicon("fr"))
+
+    def test_givenEasyWord_thenIsEasy(self):
+        self.assertTrue(lx.get_lexicon("fr").is_easy(get_string_id("chien")))
+
+    def test_givenWordNotInList_thenIsNotEasy(self):
+        self.assertFalse(lx.get_lexicon("fr").is_easy(get_string_id("sandale")))
+
+    def test_givenSubstringOfEasyWord_thenIsEasy(self):
+        # 'lors' is found in 'alors', as with a substring test against the list
+        self.assertTrue(lx.get_lexicon("fr").is_easy(get_string_id("lors")))
+
+    def test_givenWord_thenGetLogProb(self):
+        self.assertEqual(lx.get_lexicon("fr").log_prob(get_string_id("avoir")), log(0.18817190699999997))
+
+    def test_givenZeroProbabilityWord_thenGetLowestLogProb(self):
+        # 'a l'instar' has a probability of 0.0
+        self.assertEqual(lx.get_lexicon("fr").log_prob(get_string_id("a l'instar")), lx.UNKNOWN_LOG_PROB)
+
+    def test_givenUnknownWord_thenGetLowestLogProb(self):
+        self.assertEqual(lx.get_lexicon("fr").log_prob(get_string_id("sheeeesh")), lx.UNKNOWN_LOG_PROB)
+
+    def test_givenWords_thenGetAllAtOnce(self):
+        lexicon = lx.get_lexicon("fr")
+        keys = np.array([get_string_id(word) for word in ["chien", "sandale", "avoir", "sheeeesh"]], dtype=np.uint64)
+
+        np.testing.assert_array_equal(lexicon.are_easy(keys), [True, False, True, False])
+        np.testing.assert_array_equal(lexicon.log_probs_of(keys), [lexicon.log_prob(key) for key in keys.tolist()])
+
+    def test_givenFiles_thenSameLexicon(self):
+        lexicon = lx.Lexicon.from_files("fr")
+
+        np.testing.assert_array_equal(lexicon.easy_words, lx.get_lexicon("fr").easy_words)
+        np.testing.assert_array_equal(lexicon.log_prob_values, lx.get_lexicon("fr").log_prob_values)
+
+
+if __name__ == "__main__":
+    main()
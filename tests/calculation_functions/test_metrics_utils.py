@@ -63,6 +63,69 @@ class TestGetNumSyllables(TestCase):
         self.assertEqual(mu.get_num_syllables(sp_object), 100)
 
 
+class TestTokenTable(TestCase):
+    def test_givenText_thenGetTokenTable(self):
+        text = "Le cheval, de feu. Il montre le plus 'fort'"
+        sp_object = tcc.get_sp_object(text)
+        token_table = mu.get_token_table(sp_object)
+        self.assertEqual(len(token_table), len(sp_object))
+        self.assertEqual(list(token_table.lengths), [len(token.text) for token in sp_object])
+        self.assertEqual(
+            list(token_table.word_mask), [not token.is_punct and "'" not in token.text for token in sp_object]
+        )
+        self.assertEqual(list(token_table.sentence_starts), [sentence.start for sentence in sp_object.sents])
+        self.assertEqual(list(token_table.head), [token.head.i for token in sp_object])
+
+    def test_givenText_thenTokenTableIsMemoized(self):
+        sp_object = tcc.get_sp_object("Le cheval de feu montre le plus fort")
+        self.assertIs(mu.get_token_table(sp_object), mu.get_token_table(sp_object))
+
+    def test_givenComputedText_thenSpObjectIsSerializable(self):
+        sp_object = tcc.get_sp_object("Le cheval de feu montre le plus fort")
+        mu.get_num_words(sp_object)
+        self.assertEqual(sp_object.user_data, {})
+        self.assertIsInstance(sp_object.to_bytes(), bytes)
+
+    def test_givenRetokenizedText_thenTokenTableIsRebuilt(self):
+        sp_object = tcc.get_sp_object("Le cheval de feu montre le plus fort")
+        token_table = mu.get_token_table(sp_object)
+        with sp_object.retokenize() as retokenizer:
+            retokenizer.merge(sp_object[1:4])
+        self.assertIsNot(mu.get_token_table(sp_object), token_table)
+        self.assertEqual(len(mu.get_token_table(sp_object)), len(sp_object))
+
+    def test_givenEmptyText_thenGetTokenTable(self):
+        sp_object = tcc.get_sp_object("")
+        self.assertEqual(mu.get_num_words(sp_object), 0)
+        self.assertEqual(mu.get_num_sentences(sp_object), 0)
+        self.assertEqual(mu.get_num_syllables(sp_object), 0)
+
+
+class TestLexemeTable(TestCase):
+    def test_givenTexts_thenGetAttributes(self):
+        lexeme_table = mu.LexemeTable()
+        sp_object = tcc.get_sp_object("été d'aujourd'hui")
+        rows = lexeme_table.get_rows(mu.get_token_table(sp_object).orth, sp_object.vocab.strings)
+        self.assertEqual(rows.tolist(), [[3, 3, 2, 0], [2, 2, 0, 1], [11, 11, 3, 1]])
+
+    def test_givenSeenTexts_thenCountHits(self):
+        lexeme_table = mu.LexemeTable()
+        sp_object = tcc.get_sp_object("Le chat et le chien")
+        orths = mu.get_token_table(sp_object).orth
+        lexeme_table.get_rows(orths[:3], sp_object.vocab.strings)
+        lexeme_table.get_rows(orths, sp_object.vocab.strings)
+        self.assertEqual(lexeme_table.stats(), {"hits": 3, "misses": 5, "hit_rate": 3 / 8, "entries": 5})
+
+    def test_givenMoreTextsThanMaxEntries_thenEvictLeastRecentlyUsed(self):
+        lexeme_table = mu.LexemeTable(max_entries=2)
+        sp_object = tcc.get_sp_object("un deux trois")
+        orths = mu.get_token_table(sp_object).orth
+        lexeme_table.get_rows(orths, sp_object.vocab.strings)
+        self.assertEqual(len(lexeme_table), 2)
+        lexeme_table.get_rows(orths[1:], sp_object.vocab.strings)
+        self.assertEqual((lexeme_table.hits, lexeme_table.misses), (2, 3))
+
+
 class TestSafeDivide(TestCase):
     def test_givenInts_thenGetSafeDivide(self):
         self.assertEqual(mu.safe_divide(1, 2), 1 / 2)
@@ -0,0 +1,90 @@
+from unittest import TestCase, main
+
+from text_complexity_computer import TextComplexityComputer
+from text_complexity_computer.calculation_functions import registry
+
+tcc = TextComplexityComputer(scaler=None)
+
+
+class TestRegistry(TestCase):
+    def test_givenBuiltInMetrics_thenAreRegistered(self):
+        for name in ["mls", "ctu_tu", "pa", "uni_gram_lem", "msttr", "mattr", "mtld", "fk_ease", "km_score"]:
+            self.assertEqual(registry.get_metric(name).name, name)
+
+    def test_givenMovingAverageTTR_thenNotAModelMetric(self):
+        self.assertEqual(registry.get_metric("mattr_100").requires, frozenset([registry.TOKEN_TABLE]))
+        self.assertNotIn("mattr_100", registry.MODEL_METRICS)
+        self.assertIn("mattr", registry.MODEL_METRICS)
+
+    def test_givenDefaultMetrics_thenOnlyModelMetricsComputed(self):
+        metrics_scores = tcc.get_metrics_scores("Ce matin est un matin.", with_biberpy=False)
+        self.assertEqual(sorted(metrics_scores.columns), sorted(registry.MODEL_METRICS))
+        self.assertNotIn("mtld_ma_bid", metrics_scores.columns)
+        metrics_scores = tcc.get_metrics_scores("Ce matin est un matin.", metrics=["mtld_ma_bid"], with_biberpy=False)
+        self.assertEqual(list(metrics_scores.columns), ["mtld_ma_bid"])
+        metrics_scores = tcc.get_metrics_scores("Ce matin est un matin.", metrics=["mattr_100"], with_biberpy=False)
+        self.assertEqual(list(metrics_scores.columns), ["mattr_100"])
+
+    def test_givenSyntacticMetric_thenRequiresParser(self):
+        metric = registry.get_metric("ctu_tu")
+        self.assertIn(registry.SYNTACTIC_STATS, metric.requires)
+        self.assertIn("parser", metric.pipes)
+
+    def test_givenLexicalMetric_thenRequiresNoPipes(self):
+        self.assertEqual(registry.get_metric("mtld").pipes, frozenset())
+
+    def test_givenUnknownMetric_thenRaise(self):
+        with self.assertRaises(ValueError):
+            registry.get_metric("unknown")
+
+    def test_givenAlreadyRegisteredMetric_thenRaise(self):
+        with self.assertRaises(ValueError):
+            registry.register_metric("mls", len)
+
+    def test_givenCustomMetric_thenGetScore(self):
+        registry.register_metric("num_tokens", len, requires=())
+        try:
+            metrics_scores = tcc.get_metrics_scores("Ce matin est un matin.", metrics=["num_tokens", "mls"])
+            self.assertEqual(metrics_scores["num_tokens"].iloc[0], 6)
+            self.assertEqual(metrics_scores["mls"].iloc[0], 5)
+            # The model only uses the metrics of the package
+            self.assertEqual(len(tcc.compute("Ce matin est un matin.")), 1)
+        finally:
+            registry.METRICS.pop("num_tokens")
+
+
+class TestGetPlan(TestCase):
+    def test_givenLexicalMetrics_thenNoPipes(self):
+        plan = registry.get_plan(["mtld", "msttr"], with_biberpy=False)
+        self.assertEqual(plan.pipes, frozenset())
+        self.assertEqual(plan.intermediates, (registry.TOKEN_TABLE,))
+        self.assertEqual(plan.get_disabled_pipes(tcc.tagger.pipe_names), tcc.tagger.pipe_names)
+
+    def test_givenSyntacticMetric_thenParserOnly(self):
+        plan = registry.get_plan(["ctu_tu"], with_biberpy=False)
+        self.assertEqual(plan.intermediates, (registry.TOKEN_TABLE, registry.SENTENCES, registry.SYNTACTIC_STATS))
+        self.assertCountEqual(
+            plan.get_disabled_pipes(tcc.tagger.pipe_names), ["morphologizer", "attribute_ruler", "lemmatizer", "ner"]
+        )
+
+    def test_givenBiberpy_thenLemmatizerPipes(self):
+        plan = registry.get_plan([], with_biberpy=True)
+        self.assertEqual(plan.intermediates, ())
+        self.assertCountEqual(plan.get_disabled_pipes(tcc.tagger.pipe_names), ["parser", "ner"])
+
+    def test_givenUnknownPipes_thenNotDisabled(self):
+        plan = registry.get_plan(["mtld"], with_biberpy=False)
+        self.assertEqual(plan.get_disabled_pipes(["tok2vec", "custom"]), ["tok2vec"])
+
+    def test_givenDuplicatedMetrics_thenComputedOnce(self):
+        self.assertEqual(registry.get_plan(["mls", "mls", "pa"], with_biberpy=False).names, ["mls", "pa"])
+
+    def test_givenLexicalMetrics_thenSameScoresAsFullPipeline(self):
+        text = "Ce matin, le petit chat de la voisine est monté sur le toit. Il a peur de descendre."
+        full_sp_object = tcc.get_sp_object(text)
+        metrics_scores = tcc.get_metrics_scores(text, metrics=["mtld", "nlm", "pa"], with_biberpy=True)
+        self.assertTrue(metrics_scores.equals(tcc.get_metrics_scores(full_sp_object, metrics=["mtld", "nlm", "pa"])))
+
+
+if __name__ == "__main__":
+    main()
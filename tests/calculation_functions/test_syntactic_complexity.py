@@ -1,6 +1,9 @@
 # pylint: disable=protected-access
 
 from unittest import TestCase, main
+
+from spacy.tokens import Doc
+
 from text_complexity_computer.calculation_functions import syntactic_complexity as sc
 from text_complexity_computer import TextComplexityComputer
 
@@ -77,6 +80,31 @@ class TestPs30(TestCase):
         self.assertEqual(sc.ps_30(sp_object), 0.0)
 
 
+class TestGetSyntacticStats(TestCase):
+    def test_givenText_thenGetSyntacticStats(self):
+        # 2 sentences (10 and 2 words), 1 matrix plus 1 subordinate clause in the first one
+        text = "Il joue au foot parce qu'il aime le beau sport. Quel joueur !"
+        sp_object = tcc.get_sp_object(text)
+        syntactic_stats = sc.get_syntactic_stats(sp_object)
+        self.assertEqual(syntactic_stats.num_sentences, 2)
+        self.assertEqual(syntactic_stats.sentences_num_words, [10, 2])
+        self.assertEqual(syntactic_stats.num_words, 12)
+        self.assertEqual(syntactic_stats.num_clauses, 3)
+        self.assertEqual(syntactic_stats.num_t_units, 2)
+        self.assertEqual(syntactic_stats.num_complex_t_units, 1)
+
+    def test_givenText_thenSyntacticStatsAreMemoized(self):
+        text = "Il joue au foot et il aime le beau sport."
+        sp_object = tcc.get_sp_object(text)
+        self.assertIs(sc.get_syntactic_stats(sp_object), sc.get_syntactic_stats(sp_object))
+
+    def test_givenComputedText_thenSpObjectIsSerializable(self):
+        sp_object = tcc.get_sp_object("Il joue au foot et il aime le beau sport.")
+        sc.mean_length_sentences(sp_object)
+        self.assertEqual(sp_object.user_data, {})
+        self.assertIsInstance(sp_object.to_bytes(), bytes)
+
+
 # ==================== I - T-UNITS ==================== #
 class TestGetTUnits(TestCase):
     def test_givenText_thenGetTUnits(self):
@@ -125,6 +153,18 @@ class TestGetTUnits(TestCase):
         sp_object = tcc.get_sp_object(text)
         self.assertEqual(sc._get_t_units(sp_object, complex_count=True), (1, 1))
 
+    def test_givenVeryDeepParse_whenComplexCountIsTrue_thenGetComplexAndBaseTUnits(self):
+        # A chain of 5000 tokens (deeper than the recursion limit) ending with a subordinate clause -> 1 Complex
+        num_tokens = 5000
+        sp_object = Doc(
+            tcc.tagger.vocab,
+            words=["mot"] * num_tokens,
+            heads=[max(i - 1, 0) for i in range(num_tokens)],
+            deps=["ROOT"] + ["obj"] * (num_tokens - 2) + ["advcl"],
+        )
+        self.assertEqual(sc.get_syntactic_stats(sp_object).num_complex_t_units, 1)
+        self.assertTrue(sc.check_if_complex(sp_object[0]))
+
 
 class TestMlt(TestCase):
     def test_givenText_thenGetMetric(self):
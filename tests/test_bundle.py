@@ -0,0 +1,104 @@
+import os
+import pickle
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+from unittest.mock import patch
+
+import numpy as np
+
+from text_complexity_computer.bundle import FORMAT_VERSION, RESOURCES_DIR, ResourceBundle, build_bundle, get_bundle
+from text_complexity_computer.calculation_functions.lexicon import Lexicon
+from text_complexity_computer.tools import build_mwe_automaton, read_word_lists
+
+
+class TestResourceBundle(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = TemporaryDirectory()  # pylint: disable=consider-using-with
+        cls.bundle = ResourceBundle(build_bundle("fr", os.path.join(cls.directory.name, "fr.bundle")))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_givenBundle_thenSameWordLists(self):
+        word_lists, mwe_list = read_word_lists(os.path.join(RESOURCES_DIR, "fr", "fr.properties"), verbosity=0)
+        automaton, mwe_classes = build_mwe_automaton(word_lists)
+
+        bundle_word_lists, bundle_mwe_list, bundle_automaton, bundle_mwe_classes = self.bundle.get_word_lists()
+
+        self.assertEqual(bundle_word_lists, word_lists)
+        self.assertEqual(list(bundle_word_lists), list(word_lists))
+        self.assertEqual(bundle_mwe_list.keys(), mwe_list.keys())
+        self.assertEqual(list(bundle_automaton.items()), list(automaton.items()))
+        self.assertEqual(bundle_mwe_classes, mwe_classes)
+
+    def test_givenBundle_thenSameLexicon(self):
+        lexicon = Lexicon.from_files("fr")
+        easy_words, log_prob_keys, log_prob_values = self.bundle.get_lexicon_arrays()
+
+        np.testing.assert_array_equal(easy_words, lexicon.easy_words)
+        np.testing.assert_array_equal(log_prob_keys, lexicon.log_prob_keys)
+        np.testing.assert_array_equal(log_prob_values, lexicon.log_prob_values)
+        self.assertFalse(easy_words.flags.writeable)
+
+    def test_givenBundle_thenSameScaling(self):
+        values = np.random.default_rng(0).uniform(-1, 10, size=(5, 63))
+        for scaler in ["MinMaxScaler", "StandardScaler"]:
+            with open(os.path.join(RESOURCES_DIR, "fr", f"fr_{scaler}.pickle"), "rb") as file:
+                sklearn_scaler = pickle.load(file)
+
+            np.testing.assert_array_equal(
+                self.bundle.get_scaler(scaler).transform(values), sklearn_scaler.transform(values)
+            )
+
+    def test_givenBundle_thenSameModel(self):
+        with open(os.path.join(RESOURCES_DIR, "fr", "fr_model.pickle"), "rb") as file:
+            model = pickle.load(file)
+        values = np.random.default_rng(0).uniform(0, 1, size=(20, 63))
+
+        np.testing.assert_array_equal(self.bundle.get_model().predict(values), model.predict(values))
+
+    def test_givenFreshBundle_thenNotStale(self):
+        self.assertFalse(self.bundle.is_stale())
+        self.assertEqual(self.bundle.header["language"], "fr")
+
+    def test_givenChangedSource_thenStale(self):
+        with patch.dict(self.bundle.header["sources"]["easy_words.txt"], size=0):
+            self.assertTrue(self.bundle.is_stale())
+
+    def test_givenChangedSourceOfSameSize_thenStale(self):
+        with patch.dict(self.bundle.header["sources"]["easy_words.txt"], mtime_ns=0, sha256="0" * 64):
+            self.assertTrue(self.bundle.is_stale())
+
+    def test_givenTouchedSource_thenNotStale(self):
+        with patch.dict(self.bundle.header["sources"]["easy_words.txt"], mtime_ns=0):
+            self.assertFalse(self.bundle.is_stale())
+
+    def test_givenOtherPackageVersion_thenStale(self):
+        with patch.dict(self.bundle.header, version="0.0.0"):
+            self.assertTrue(self.bundle.is_stale())
+
+    def test_givenNotABundle_thenRaise(self):
+        path = os.path.join(self.directory.name, "not.bundle")
+        with open(path, "wb") as file:
+            file.write(b"not a bundle at all")
+
+        with self.assertRaises(ValueError):
+            ResourceBundle(path)
+
+    def test_givenOtherFormatVersion_thenRaise(self):
+        path = os.path.join(self.directory.name, "other.bundle")
+        with patch("text_complexity_computer.bundle.FORMAT_VERSION", FORMAT_VERSION + 1):
+            build_bundle("fr", path)
+
+        with self.assertRaises(ValueError):
+            ResourceBundle(path)
+
+    def test_givenNoBundle_thenReadFromFiles(self):
+        with patch("text_complexity_computer.bundle.get_bundle_path", return_value="missing.bundle"):
+            self.assertIsNone(get_bundle.__wrapped__("fr"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+import spacy
+
+from text_complexity_computer.cache import ParseCache, ResultCache, get_cache_key
+
+tagger = spacy.load("fr_core_news_sm")
+
+
+class TestGetCacheKey(TestCase):
+    def test_givenSameInputs_thenSameKey(self):
+        self.assertEqual(get_cache_key("Un texte.", "0.2", ["mls"]), get_cache_key("Un texte.", "0.2", ["mls"]))
+
+    def test_givenOtherParts_thenOtherKey(self):
+        self.assertNotEqual(get_cache_key("Un texte.", "0.2", ["mls"]), get_cache_key("Un texte.", "0.2", ["pa"]))
+        self.assertNotEqual(get_cache_key("Un texte.", "a", "bc"), get_cache_key("Un texte.", "ab", "c"))
+
+
+class TestResultCache(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.path = os.path.join(self.directory.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_givenMissingKey_thenMiss(self):
+        cache = ResultCache()
+
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+    def test_givenSetKey_thenHit(self):
+        cache = ResultCache()
+        cache.set("key", {"mls": 1.0})
+
+        self.assertEqual(cache.get("key"), {"mls": 1.0})
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+    def test_givenMoreEntriesThanMax_thenLeastRecentlyUsedEvictedFromMemory(self):
+        cache = ResultCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_givenDiskTier_thenResultsPersisted(self):
+        cache = ResultCache(self.path)
+        cache.set("key", [1, 2, 3])
+        cache.close()
+
+        cache = ResultCache(self.path)
+        self.assertEqual(cache.get("key"), [1, 2, 3])
+        self.assertEqual(cache.stats()["memory_entries"], 1)
+        cache.close()
+
+    def test_givenDiskTierOverMaxSize_thenLeastRecentlyUsedEvicted(self):
+        # Every result takes about 115 bytes once pickled
+        cache = ResultCache(self.path, max_entries=0, max_size=350)
+        for key in ["a", "b", "c"]:
+            cache.set(key, "x" * 100)
+        cache.get("a")
+        cache.set("d", "x" * 100)
+
+        self.assertLessEqual(cache.stats()["disk_size"], 350)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "x" * 100)
+        self.assertEqual(cache.get("c"), "x" * 100)
+        self.assertEqual(cache.get("d"), "x" * 100)
+        cache.close()
+
+    def test_givenDiskHit_thenAccessWrittenOnClose(self):
+        cache = ResultCache(self.path, max_entries=0, max_size=350)
+        for key in ["a", "b", "c"]:
+            cache.set(key, "x" * 100)
+        cache.close()
+        cache = ResultCache(self.path, max_entries=0, max_size=350)
+        cache.get("a")
+        cache.close()
+
+        cache = ResultCache(self.path, max_entries=0, max_size=350)
+        cache.set("d", "x" * 100)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "x" * 100)
+        cache.close()
+
+    def test_givenClear_thenEmpty(self):
+        cache = ResultCache(self.path)
+        cache.set("key", 1)
+        cache.clear()
+
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(cache.stats(), {"hits": 0, "misses": 1, "memory_entries": 0, "disk_size": 0})
+        cache.close()
+
+
+class TestParseCache(TestCase):
+    texts = ["Je suis une tortue.", "Il joue au foot. Quel joueur !", "Bonjour à tous."]
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()  # pylint: disable=consider-using-with
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertSameSpObject(self, sp_object, expected_sp_object):
+        self.assertEqual(sp_object.text, expected_sp_object.text)
+        self.assertEqual([sentence.text for sentence in sp_object.sents], [s.text for s in expected_sp_object.sents])
+        for token, expected_token in zip(sp_object, expected_sp_object):
+            self.assertEqual(
+                (token.pos_, token.lemma_, token.dep_, token.head.i, str(token.morph)),
+                (
+                    expected_token.pos_,
+                    expected_token.lemma_,
+                    expected_token.dep_,
+                    expected_token.head.i,
+                    str(expected_token.morph),
+                ),
+            )
+
+    def test_givenMissingKey_thenMiss(self):
+        with ParseCache(self.directory.name) as parse_cache:
+            self.assertIsNone(parse_cache.get("key", tagger.vocab))
+            self.assertEqual((parse_cache.hits, parse_cache.misses), (0, 1))
+
+    def test_givenAddedSpObject_thenHitBeforeFlush(self):
+        sp_object = tagger(self.texts[0])
+        with ParseCache(self.directory.name) as parse_cache:
+            parse_cache.add("key", sp_object)
+            self.assertIs(parse_cache.get("key", tagger.vocab), sp_object)
+
+    def test_givenClosedCache_thenSpObjectsLoadedFromShards(self):
+        sp_objects = list(tagger.pipe(self.texts))
+        with ParseCache(self.directory.name, shard_size=2) as parse_cache:
+            for text, sp_object in zip(self.texts, sp_objects):
+                parse_cache.add(get_cache_key(text), sp_object)
+
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ["index.sqlite", "shard_0.spacy", "shard_1.spacy"])
+        with ParseCache(self.directory.name, max_loaded_shards=1) as parse_cache:
+            for text, sp_object in reversed(list(zip(self.texts, sp_objects))):
+                self.assertSameSpObject(parse_cache.get(get_cache_key(text), tagger.vocab), sp_object)
+            self.assertEqual(parse_cache.hits, 3)
+
+
+if __name__ == "__main__":
+    main()
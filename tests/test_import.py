@@ -0,0 +1,29 @@
+import subprocess
+import sys
+from unittest import TestCase, main
+
+import text_complexity_computer
+
+
+class TestImport(TestCase):
+    def test_givenPackageImport_thenNoHeavyDependency(self):
+        heavy_modules = ["numpy", "pandas", "spacy", "sklearn"]
+        statement = f"import sys, text_complexity_computer; print([m for m in {heavy_modules} if m in sys.modules])"
+        output = subprocess.run([sys.executable, "-c", statement], capture_output=True, text=True, check=True).stdout
+
+        self.assertEqual(output.strip(), "[]")
+
+    def test_givenPublicName_thenImportedOnFirstUse(self):
+        # pylint: disable=import-outside-toplevel
+        from text_complexity_computer.text_complexity_computer import TextComplexityComputer
+
+        self.assertIs(text_complexity_computer.TextComplexityComputer, TextComplexityComputer)
+        self.assertIn("ResultCache", dir(text_complexity_computer))
+
+    def test_givenUnknownName_thenRaise(self):
+        with self.assertRaises(AttributeError):
+            _ = text_complexity_computer.UnknownName
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+from unittest import TestCase, main
+
+import numpy as np
+import spacy
+
+from text_complexity_computer import MODEL_METRICS, TextComplexityComponent, TextComplexityComputer, clean_text
+
+
+class TestTextComplexityComponent(TestCase):
+    texts = [
+        "Il joue au foot parce qu'il aime le beau sport. Quel joueur !",
+        "Je mange un arbre. Il fait vraiment beau.",
+        "Bonjour à toutes et à tous.",
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tcc = TextComplexityComputer()
+        cls.nlp = spacy.load("fr_core_news_sm")
+        cls.nlp.add_pipe("text_complexity", config={"batch_size": 2})
+
+    def test_givenPipeline_thenComponentAdded(self):
+        self.assertIsInstance(self.nlp.get_pipe("text_complexity"), TextComplexityComponent)
+        self.assertIs(self.nlp.get_pipe("text_complexity").tcc.tagger, self.nlp)
+
+    def test_givenText_thenSetFeaturesAndLevel(self):
+        doc = self.nlp(self.texts[0])
+
+        self.assertEqual(
+            doc._.tcc_features, self.tcc.get_metrics_scores(self.texts[0], metrics=MODEL_METRICS).iloc[0].to_dict()
+        )
+        self.assertEqual(doc._.tcc_level, self.tcc.compute(self.texts[0])[0])
+
+    def test_givenTextChangedByCleaning_thenScoredAsGiven(self):
+        text = "1. Le  chat…dort (a) bien, « Il dit que c'est-à-dire… »  Bon."
+        self.assertNotEqual(clean_text(text), text)
+
+        doc = self.nlp(text)
+        cleaned_doc = self.nlp(clean_text(text))
+
+        # The component scores the text as given, and compute the cleaned text
+        self.assertEqual(doc._.tcc_features, self.tcc.get_metrics_scores(doc, metrics=MODEL_METRICS).iloc[0].to_dict())
+        self.assertNotEqual(doc._.tcc_features, cleaned_doc._.tcc_features)
+        self.assertEqual(
+            cleaned_doc._.tcc_features, self.tcc.get_metrics_scores(text, metrics=MODEL_METRICS).iloc[0].to_dict()
+        )
+        self.assertEqual(cleaned_doc._.tcc_level, self.tcc.compute(text)[0])
+
+    def test_givenTexts_whenPipe_thenSetLevelsInOrder(self):
+        docs = list(self.nlp.pipe(self.texts))
+
+        np.testing.assert_array_equal([doc._.tcc_level for doc in docs], self.tcc.compute_batch(self.texts))
+
+    def test_givenTexts_whenPipeWithProcesses_thenSameFeaturesAndLevels(self):
+        expected_docs = list(self.nlp.pipe(self.texts))
+
+        docs = list(self.nlp.pipe(self.texts, n_process=2, batch_size=1))
+
+        self.assertEqual([doc.text for doc in docs], self.texts)
+        self.assertEqual([doc._.tcc_features for doc in docs], [doc._.tcc_features for doc in expected_docs])
+        np.testing.assert_array_equal([doc._.tcc_level for doc in docs], self.tcc.compute_batch(self.texts))
+
+    def test_givenScoredDoc_thenSerializable(self):
+        doc = self.nlp(self.texts[1])
+
+        restored_doc = spacy.tokens.Doc(self.nlp.vocab).from_bytes(doc.to_bytes())
+
+        self.assertEqual(restored_doc._.tcc_level, doc._.tcc_level)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+from unittest import TestCase, main
+
+import numpy as np
+
+from text_complexity_computer.results import MetricsScores
+
+
+class TestMetricsScores(TestCase):
+    def setUp(self):
+        self.values = np.asfortranarray([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+        self.metrics_scores = MetricsScores(["a", "b", "c"], self.values)
+
+    def test_givenMetricsScores_thenConversionsWithoutCopy(self):
+        self.assertIs(self.metrics_scores.to_numpy(), self.values)
+        self.assertTrue(np.shares_memory(self.metrics_scores.to_frame()["b"].to_numpy(), self.values))
+        self.assertTrue(np.shares_memory(self.metrics_scores.to_dict()["b"], self.values))
+        self.assertTrue(np.shares_memory(self.metrics_scores["b"], self.values))
+
+    def test_givenMetricsScores_thenFrameAndDict(self):
+        metrics_scores_frame = self.metrics_scores.to_frame()
+
+        self.assertEqual(list(metrics_scores_frame.columns), ["a", "b", "c"])
+        np.testing.assert_array_equal(metrics_scores_frame.to_numpy(), self.values)
+        np.testing.assert_array_equal(self.metrics_scores.to_dict()["c"], [3.0, 6.0])
+
+    def test_givenMetricsScores_thenRecordsByText(self):
+        self.assertEqual(
+            self.metrics_scores.to_records(), [{"a": 1.0, "b": 2.0, "c": 3.0}, {"a": 4.0, "b": 5.0, "c": 6.0}]
+        )
+        self.assertEqual([row.to_records()[0]["a"] for row in self.metrics_scores], [1.0, 4.0])
+        self.assertEqual(len(self.metrics_scores.row(1)), 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import os
+import pickle
+from unittest import TestCase, main
+
+import numpy as np
+
+from text_complexity_computer.bundle import RESOURCES_DIR
+from text_complexity_computer.scaler import AffineScaler
+
+
+class TestAffineScaler(TestCase):
+    values = np.random.default_rng(0).uniform(-1, 10, size=(5, 63))
+
+    def test_givenSklearnScalers_thenSameTransform(self):
+        for scaler in ["MinMaxScaler", "StandardScaler"]:
+            with open(os.path.join(RESOURCES_DIR, "fr", f"fr_{scaler}.pickle"), "rb") as file:
+                sklearn_scaler = pickle.load(file)
+
+            affine_scaler = AffineScaler.from_sklearn(sklearn_scaler)
+
+            np.testing.assert_array_equal(affine_scaler.transform(self.values), sklearn_scaler.transform(self.values))
+            self.assertEqual(list(affine_scaler.feature_names_in_), list(sklearn_scaler.feature_names_in_))
+
+    def test_givenSomeColumns_thenSameAsTransform(self):
+        affine_scaler = AffineScaler(
+            "MinMaxScaler",
+            ["a", "b", "c"],
+            {"scale": np.array([1.0, 2.0, 3.0]), "min": np.array([0.0, -1.0, 1.0])},
+            {"clip": False, "feature_range": [0, 1]},
+        )
+        values = np.array([[1.0, 2.0, 3.0]])
+
+        np.testing.assert_array_equal(
+            affine_scaler.transform_columns(values[:, [0, 2]], [0, 2]), affine_scaler.transform(values)[:, [0, 2]]
+        )
+
+    def test_givenSubset_thenSameAsTransform(self):
+        with open(os.path.join(RESOURCES_DIR, "fr", "fr_StandardScaler.pickle"), "rb") as file:
+            affine_scaler = AffineScaler.from_sklearn(pickle.load(file))
+        features = list(affine_scaler.feature_names_in_[[5, 2, 40]])
+
+        subset = affine_scaler.subset(features)
+
+        self.assertEqual(list(subset.feature_names_in_), features)
+        np.testing.assert_array_equal(
+            subset.transform(self.values[:, [5, 2, 40]]), affine_scaler.transform(self.values)[:, [5, 2, 40]]
+        )
+
+    def test_givenUnknownScaler_thenRaise(self):
+        with self.assertRaises(ValueError):
+            AffineScaler("RobustScaler", [], {}, {})
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,14 @@
+from tempfile import TemporaryDirectory
 from unittest import TestCase, main
+from unittest.mock import patch
 
+import numpy as np
 import spacy
 from spacy.cli import download
-from spacy.tokens import Doc
+from spacy.language import Language
+from spacy.tokens import Doc, DocBin
 
-from text_complexity_computer import TextComplexityComputer
+from text_complexity_computer import MODEL_METRICS, ParseCache, ResultCache, TextComplexityComputer
 
 
 class TestTCC(TestCase):
@@ -34,5 +38,275 @@ class TestTCC(TestCase):
             self.assertEqual(token.dep_, token_test.dep_)
 
 
+class TestTCCBatch(TestCase):
+    texts = [
+        "Il joue au foot parce qu'il aime le beau sport. Quel joueur !",
+        "Je mange un arbre. Il fait vraiment beau.",
+        "Bonjour à toutes et à tous.",
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tcc = TextComplexityComputer()
+
+    def test_givenTexts_thenGetMetricsScoresBatch(self):
+        metrics_scores = self.tcc.get_metrics_scores_batch(self.texts, batch_size=2)
+
+        self.assertEqual(metrics_scores.shape[0], len(self.texts))
+        for i, text in enumerate(self.texts):
+            expected_metrics_scores = self.tcc.get_metrics_scores(text)
+            self.assertEqual(list(metrics_scores.columns), list(expected_metrics_scores.columns))
+            np.testing.assert_allclose(metrics_scores.iloc[i].values, expected_metrics_scores.iloc[0].values)
+
+    def test_givenTexts_whenMetricsAreSet_thenGetMetricsScoresBatch(self):
+        metrics_scores = self.tcc.get_metrics_scores_batch(self.texts, metrics=["pa", "mls"], with_biberpy=False)
+
+        self.assertEqual(list(metrics_scores.columns), ["mls", "pa"])
+        self.assertEqual(metrics_scores.shape[0], len(self.texts))
+
+    def test_givenNoTexts_thenGetEmptyMetricsScoresBatch(self):
+        metrics_scores = self.tcc.get_metrics_scores_batch([], metrics="mls", with_biberpy=False)
+
+        self.assertEqual(list(metrics_scores.columns), ["mls"])
+        self.assertEqual(metrics_scores.shape[0], 0)
+
+    def test_givenTexts_thenIterScoresInOrder(self):
+        for text, metrics_scores in zip(self.texts, self.tcc.iter_scores(iter(self.texts), batch_size=2)):
+            np.testing.assert_allclose(metrics_scores.values, self.tcc.get_metrics_scores(text).values)
+
+    def test_givenTexts_thenComputeBatch(self):
+        expected_levels = np.concatenate([self.tcc.compute(text) for text in self.texts])
+        np.testing.assert_array_equal(self.tcc.compute_batch(self.texts, batch_size=2), expected_levels)
+
+    def test_givenTextsNotAsFrame_thenSameMetricsScores(self):
+        expected_metrics_scores = self.tcc.get_metrics_scores_batch(self.texts)
+
+        metrics_scores = self.tcc.get_metrics_scores_batch(self.texts, batch_size=2, as_frame=False)
+
+        self.assertEqual(metrics_scores.columns, list(expected_metrics_scores.columns))
+        np.testing.assert_array_equal(metrics_scores.to_numpy(), expected_metrics_scores.to_numpy())
+        self.assertTrue(metrics_scores.to_numpy().flags.f_contiguous)
+        self.assertTrue(
+            self.tcc.get_metrics_scores(self.texts[0], as_frame=False).to_frame().equals(expected_metrics_scores[:1])
+        )
+
+    def test_givenTexts_thenComputeSameAsModelOnMetricsScores(self):
+        for text in self.texts:
+            np.testing.assert_array_equal(
+                self.tcc.compute(text), self.tcc.model.predict(self.tcc.get_metrics_scores(text))
+            )
+
+    def test_givenModelMetricsScores_thenPredictSameAsComputeBatch(self):
+        metrics_scores = self.tcc.get_metrics_scores_batch(self.texts, metrics=MODEL_METRICS, as_frame=False)
+
+        np.testing.assert_array_equal(self.tcc.predict(metrics_scores), self.tcc.compute_batch(self.texts))
+        with self.assertRaises(ValueError):
+            self.tcc.predict(self.tcc.get_metrics_scores_batch(self.texts, metrics=["mls"], as_frame=False))
+
+
+class TestTCCDocInput(TestCase):
+    texts = [
+        "Il joue au foot parce qu'il aime le beau sport. Quel joueur !",
+        "Je mange un arbre. Il fait vraiment beau.",
+        "Bonjour à toutes et à tous.",
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tcc = TextComplexityComputer()
+        cls.sp_objects = [cls.tcc.get_sp_object(text) for text in cls.texts]
+
+    def test_givenDoc_thenGetMetricsScoresWithoutParsing(self):
+        expected_metrics_scores = self.tcc.get_metrics_scores(self.texts[0])
+
+        with patch.object(Language, "__call__", side_effect=AssertionError("The text was parsed.")):
+            metrics_scores = self.tcc.get_metrics_scores(self.sp_objects[0])
+            level = self.tcc.compute(self.sp_objects[0])
+
+        self.assertTrue(metrics_scores.equals(expected_metrics_scores))
+        np.testing.assert_array_equal(level, self.tcc.compute(self.texts[0]))
+
+    def test_givenTextsAndDocs_thenGetMetricsScoresBatchInOrder(self):
+        expected_metrics_scores = self.tcc.get_metrics_scores_batch(self.texts)
+
+        metrics_scores = self.tcc.get_metrics_scores_batch(
+            [self.sp_objects[0], self.texts[1], self.sp_objects[2]], batch_size=2
+        )
+
+        self.assertTrue(metrics_scores.equals(expected_metrics_scores))
+
+    def test_givenDocBin_thenComputeBatchWithoutParsing(self):
+        expected_levels = self.tcc.compute_batch(self.texts)
+        doc_bin = DocBin(docs=self.sp_objects)
+
+        with patch.object(Language, "pipe", side_effect=AssertionError("The texts were parsed.")):
+            levels = self.tcc.compute_batch(doc_bin)
+
+        np.testing.assert_array_equal(levels, expected_levels)
+
+
+class TestTCCCache(TestCase):
+    text = "Il joue au foot parce qu'il aime le beau sport. Quel joueur !"
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tcc = TextComplexityComputer(cache=ResultCache())
+
+    def setUp(self):
+        self.tcc.cache.clear()
+
+    def test_givenCachedText_thenGetMetricsScoresWithoutParsing(self):
+        expected_metrics_scores = self.tcc.get_metrics_scores(self.text)
+
+        with patch.object(self.tcc, "tagger", side_effect=AssertionError("The text was parsed.")):
+            metrics_scores = self.tcc.get_metrics_scores(self.text)
+
+        self.assertTrue(metrics_scores.equals(expected_metrics_scores))
+        self.assertEqual((self.tcc.cache.hits, self.tcc.cache.misses), (1, 1))
+
+    def test_givenSameCleanedText_thenCacheHit(self):
+        self.tcc.get_metrics_scores(self.text)
+        self.tcc.get_metrics_scores(self.text.replace(" ", "  "))
+
+        self.assertEqual(self.tcc.cache.hits, 1)
+
+    def test_givenOtherMetrics_thenCacheMiss(self):
+        self.tcc.get_metrics_scores(self.text)
+        metrics_scores = self.tcc.get_metrics_scores(self.text, metrics=["pa", "mls"], with_biberpy=False)
+
+        self.assertEqual(list(metrics_scores.columns), ["mls", "pa"])
+        self.assertEqual((self.tcc.cache.hits, self.tcc.cache.misses), (0, 2))
+
+    def test_givenCachedText_thenComputeWithoutParsing(self):
+        expected_level = self.tcc.compute(self.text)
+
+        with patch.object(self.tcc, "tagger", side_effect=AssertionError("The text was parsed.")):
+            level = self.tcc.compute(self.text)
+
+        np.testing.assert_array_equal(level, expected_level)
+
+    def test_givenCachedMetricsScoresModified_thenCacheUnchanged(self):
+        self.tcc.get_metrics_scores(self.text)["mls"] = -1
+
+        self.assertNotEqual(self.tcc.get_metrics_scores(self.text)["mls"][0], -1)
+
+
+class TestTCCParseCache(TestCase):
+    texts = [
+        "Il joue au foot parce qu'il aime le beau sport. Quel joueur !",
+        "Je mange un arbre. Il fait vraiment beau.",
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tcc = TextComplexityComputer()
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()  # pylint: disable=consider-using-with
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_givenParsedTexts_thenScoresWithoutParsing(self):
+        expected_metrics_scores = self.tcc.get_metrics_scores_batch(self.texts)
+        with ParseCache(self.directory.name) as parse_cache:
+            self.tcc.parse_cache = parse_cache
+            self.tcc.get_metrics_scores_batch(self.texts)
+        with ParseCache(self.directory.name) as parse_cache:
+            self.tcc.parse_cache = parse_cache
+            with patch.object(Language, "__call__", side_effect=AssertionError("The text was parsed.")), patch.object(
+                Language, "pipe", side_effect=fail_parsing
+            ):
+                metrics_scores = self.tcc.get_metrics_scores_batch(self.texts)
+                level = self.tcc.compute(self.texts[0])
+            self.assertEqual(parse_cache.hits, 3)
+        self.tcc.parse_cache = None
+
+        self.assertTrue(metrics_scores.equals(expected_metrics_scores))
+        np.testing.assert_array_equal(level, self.tcc.compute(self.texts[0]))
+
+    def test_givenSomeParsedTexts_thenOthersParsedInOneStream(self):
+        texts = [self.texts[1], self.texts[0], "Le chat dort."]
+        expected_metrics_scores = self.tcc.get_metrics_scores_batch(texts)
+        with ParseCache(self.directory.name) as parse_cache:
+            self.tcc.parse_cache = parse_cache
+            self.tcc.get_metrics_scores_batch(self.texts[:1])
+            with patch.object(Language, "pipe", autospec=True, side_effect=Language.pipe) as pipe:
+                metrics_scores = self.tcc.get_metrics_scores_batch(texts, batch_size=1)
+            self.assertEqual(pipe.call_count, 1)
+            self.assertEqual(parse_cache.hits, 1)
+        self.tcc.parse_cache = None
+
+        self.assertTrue(metrics_scores.equals(expected_metrics_scores))
+
+    def test_givenParsedTexts_whenOtherMetrics_thenNotParsedAgain(self):
+        with ParseCache(self.directory.name) as parse_cache:
+            self.tcc.parse_cache = parse_cache
+            self.tcc.get_metrics_scores_batch(self.texts)
+            self.assertEqual(parse_cache.misses, len(self.texts))
+            metrics_scores = self.tcc.get_metrics_scores_batch(self.texts, metrics=["mls"], with_biberpy=False)
+            self.tcc.get_metrics_scores_batch(self.texts, metrics=["nlm"], with_biberpy=False)
+            level = self.tcc.compute(self.texts[0])
+            sp_object = self.tcc.get_sp_object(self.texts[0])
+            self.assertEqual(parse_cache.misses, len(self.texts))
+        self.tcc.parse_cache = None
+
+        self.assertTrue(
+            metrics_scores.equals(self.tcc.get_metrics_scores_batch(self.texts, metrics=["mls"], with_biberpy=False))
+        )
+        np.testing.assert_array_equal(level, self.tcc.compute(self.texts[0]))
+        self.assertEqual(sp_object.to_json()["tokens"], self.tcc.get_sp_object(self.texts[0]).to_json()["tokens"])
+
+    def test_givenSpObject_thenScoredFromParseCache(self):
+        with ParseCache(self.directory.name) as parse_cache:
+            self.tcc.parse_cache = parse_cache
+            sp_object = self.tcc.get_sp_object(self.texts[0])
+            metrics_scores = self.tcc.get_metrics_scores(self.texts[0])
+            self.assertEqual((parse_cache.hits, parse_cache.misses), (1, 1))
+        self.tcc.parse_cache = None
+
+        self.assertTrue(metrics_scores.equals(self.tcc.get_metrics_scores(sp_object)))
+
+
+def fail_parsing(texts, **kwargs):  # pylint: disable=unused-argument
+    for _ in texts:
+        raise AssertionError("The texts were parsed.")
+    yield from ()
+
+
+class TestTCCLazyLoading(TestCase):
+    text = "Il joue au foot parce qu'il aime le beau sport. Quel joueur !"
+
+    def test_givenNewComputer_thenNothingLoaded(self):
+        tcc = TextComplexityComputer()
+
+        self.assertEqual(tcc.load_times, {})
+        for component in ["tagger", "lexicon", "scaler", "model"]:
+            self.assertNotIn(component, vars(tcc))
+
+    def test_givenLexicalMetrics_thenOnlyTaggerAndScalerLoaded(self):
+        tcc = TextComplexityComputer()
+        tcc.get_metrics_scores(self.text, metrics=["mtld"], with_biberpy=False)
+
+        self.assertCountEqual(tcc.load_times, ["tagger", "scaler"])
+
+    def test_givenWarmup_thenEveryComponentLoaded(self):
+        tcc = TextComplexityComputer()
+        load_times = tcc.warmup()
+
+        self.assertCountEqual(load_times, ["tagger", "word_lists", "lexicon", "scaler", "model"])
+        self.assertTrue(all(load_time >= 0 for load_time in load_times.values()))
+
+    def test_givenCachedText_thenComputeWithoutLoadingTagger(self):
+        cache = ResultCache()
+        expected_level = TextComplexityComputer(cache=cache).compute(self.text)
+
+        tcc = TextComplexityComputer(cache=cache)
+        level = tcc.compute(self.text)
+
+        np.testing.assert_array_equal(level, expected_level)
+        self.assertNotIn("tagger", tcc.load_times)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,51 @@
+import time
+from unittest import TestCase, main
+
+from text_complexity_computer.tools import clean_text
+
+
+class TestCleanText(TestCase):
+    examples = [
+        ("• Premier point_suivant○ fin", " Premier point suivant fin"),
+        ("Il dit [...] puis […] et… voilà", "Il dit [...] puis et . voilà"),
+        ("- 12 - Page 3.- 4 - suite", " Page suite"),
+        ("1. Intro 2) Suite (3.2) Fin 12 ans", " Intro Suite Fin ans"),
+        ("Voir (a) et b) ici...Ensuite..ok", "Voir et ici. Ensuite. ok"),
+        ("Un\n\ndeux\t trois   quatre", "Un deux trois quatre"),
+    ]
+
+    def test_givenTexts_thenCleanedTexts(self):
+        for text, expected_text in self.examples:
+            with self.subTest(text=text):
+                self.assertEqual(clean_text(text), expected_text)
+
+    def test_givenTexts_whenReturnOffsets_thenOffsetsInOriginalText(self):
+        for text, expected_text in self.examples:
+            with self.subTest(text=text):
+                cleaned_text, offsets = clean_text(text, return_offsets=True)
+
+                self.assertEqual(cleaned_text, expected_text)
+                self.assertEqual(len(offsets), len(cleaned_text))
+                self.assertEqual(list(offsets), sorted(offsets))
+                # The characters kept are mapped to themselves, the inserted ones are spaces and points
+                for character, offset in zip(cleaned_text, offsets):
+                    self.assertTrue(character == text[offset] or character in " .")
+
+    def test_givenOffsets_thenWordsFoundInOriginalText(self):
+        text = "1. Le  chat…dort (a) bien."
+        cleaned_text, offsets = clean_text(text, return_offsets=True)
+
+        start = cleaned_text.index("dort")
+        original_start, original_end = int(offsets[start]), int(offsets[start + 3]) + 1
+        self.assertEqual(text[original_start:original_end], "dort")
+
+    def test_givenLongRuns_thenLinearTime(self):
+        # Each of these texts took minutes when the patterns retried every position of the run
+        for text in ["1" * 100000, "a" * 100000, "." * 100000, "1." * 50000]:
+            start = time.perf_counter()
+            clean_text(text)
+            self.assertLess(time.perf_counter() - start, 5)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import os
+import pickle
+from unittest import TestCase, main
+
+import numpy as np
+import pandas as pd
+
+from text_complexity_computer.bundle import RESOURCES_DIR
+from text_complexity_computer.tree_ensemble import TreeEnsemble
+
+
+class TestTreeEnsemble(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(os.path.join(RESOURCES_DIR, "fr", "fr_model.pickle"), "rb") as file:
+            cls.sklearn_model = pickle.load(file)
+        cls.model = TreeEnsemble.from_sklearn(cls.sklearn_model)
+
+        # Scaled features, some of them set to the thresholds of the trees where the float32 rounding matters
+        rng = np.random.default_rng(0)
+        cls.values = rng.uniform(-0.5, 1.5, size=(200, 63))
+        trees = [estimator.tree_ for estimator in cls.sklearn_model.estimators_]
+        features = np.concatenate([tree.feature[tree.children_left != -1] for tree in trees])
+        thresholds = np.concatenate([tree.threshold[tree.children_left != -1] for tree in trees])
+        for row in cls.values[:100]:
+            nodes = rng.integers(len(features), size=20)
+            row[features[nodes]] = thresholds[nodes]
+
+    def test_givenFeatures_thenSamePredictions(self):
+        np.testing.assert_array_equal(self.model.predict(self.values), self.sklearn_model.predict(self.values))
+        np.testing.assert_array_equal(
+            self.model.predict_proba(self.values), self.sklearn_model.predict_proba(self.values)
+        )
+
+    def test_givenMissingFeatures_thenSamePredictions(self):
+        values = self.values.copy()
+        values[np.random.default_rng(1).random(values.shape) < 0.1] = np.nan
+
+        np.testing.assert_array_equal(self.model.predict(values), self.sklearn_model.predict(values))
+
+    def test_givenDataFrame_thenColumnsTakenByName(self):
+        values = pd.DataFrame(self.values[:5], columns=self.model.feature_names_in_)
+
+        np.testing.assert_array_equal(
+            self.model.predict(values[values.columns[::-1]]), self.sklearn_model.predict(self.values[:5])
+        )
+
+    def test_givenWrongNumberOfFeatures_thenRaise(self):
+        with self.assertRaises(ValueError):
+            self.model.predict(self.values[:, :10])
+
+
+if __name__ == "__main__":
+    main()
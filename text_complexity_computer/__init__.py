@@ -1,3 +1,45 @@
-# pylint: disable=wildcard-import
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 from .version import __version__
-from .text_complexity_computer import *
+
+if TYPE_CHECKING:
+    # The lazy names, for the type checkers and linters, which do not run __getattr__
+    from .cache import ParseCache, ResultCache, get_cache_key
+    from .pipeline import TextComplexityComponent
+    from .results import MetricsScores
+    from .text_complexity_computer import FEATURES, MODEL_METRICS, MODEL_NAME, TextComplexityComputer
+    from .tools import clean_text
+
+# The public names of the package and their modules. The modules, and their dependencies (NumPy, pandas, spaCy, ...),
+# are imported on first use of one of their names, so that importing the package is fast.
+_LAZY_NAMES = {
+    "TextComplexityComputer": "text_complexity_computer",
+    "MODEL_METRICS": "text_complexity_computer",
+    "FEATURES": "text_complexity_computer",
+    "MODEL_NAME": "text_complexity_computer",
+    "ResultCache": "cache",
+    "ParseCache": "cache",
+    "get_cache_key": "cache",
+    "MetricsScores": "results",
+    "TextComplexityComponent": "pipeline",
+    "clean_text": "tools",
+}
+_SUBMODULES = ["cache", "calculation_functions", "loaders", "pipeline", "results", "text_complexity_computer", "tools"]
+
+__all__ = ["__version__", *_LAZY_NAMES]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_NAMES:
+        value = getattr(import_module(f".{_LAZY_NAMES[name]}", __name__), name)
+    elif name in _SUBMODULES:
+        value = import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *_LAZY_NAMES, *_SUBMODULES])
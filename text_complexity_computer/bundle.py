@@ -0,0 +1,407 @@
+# pylint: disable=c-extension-no-member
+"""
+Precompiled binary bundle of the resources of a language (``resources/<language>/<language>.bundle``): the interned
+word lists of biberpy and their serialized automata, the lexicon arrays, the scaler coefficients and the node arrays
+of the classifier.
+
+The bundle is memory-mapped: the arrays are read in place, without parsing, and the processes forked from a process
+which loaded it share its pages. When the bundle was not built or is out of date, the resources are read from their
+files. Build it with:
+    python -m text_complexity_computer.bundle fr
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+import sys
+import warnings
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple, Union
+
+import ahocorasick
+import numpy as np
+
+from .scaler import AffineScaler
+from .tree_ensemble import TreeEnsemble
+from .version import __version__
+
+RESOURCES_DIR = os.path.join(os.path.dirname(__file__), "resources")
+SCALERS = ("MinMaxScaler", "StandardScaler")
+
+MAGIC = b"TCCBUNDL"
+FORMAT_VERSION = 2
+# magic, format version, header size and offset of the sections
+_PREFIX = struct.Struct("<8sIIQ")
+_ALIGNMENT = 64
+# The arrays of TreeEnsemble, in the order of its arguments
+_MODEL_ARRAYS = (
+    "classes_",
+    "roots",
+    "feature",
+    "threshold",
+    "children_left",
+    "children_right",
+    "missing_go_to_left",
+    "values",
+)
+
+
+def get_bundle_path(language: str) -> str:
+    """
+    Get the path of the resource bundle of a language.
+
+    Args:
+        language (str): the language of the resources.
+
+    Returns:
+        str: the path of the bundle
+    """
+    return os.path.join(RESOURCES_DIR, language, f"{language}.bundle")
+
+
+def _get_sources(language: str) -> List[str]:
+    return [
+        f"{language}.properties",
+        "easy_words.txt",
+        "word_frequencies.json",
+        *[f"{language}_{scaler}.pickle" for scaler in SCALERS],
+        f"{language}_model.pickle",
+    ]
+
+
+class ResourceBundle:
+    """
+    Memory-mapped resource bundle of a language (see build_bundle).
+
+    Attributes:
+        path (str): the path of the bundle.
+        header (dict): the language, the versions of the package and of the format, the sizes, modification times and
+            hashes of the source files, the sections, the parameters of the scalers and the depth of the classifier of
+            the bundle.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): the path of the bundle.
+
+        Raises:
+            ValueError: if the file is not a resource bundle or has another format version.
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._buffer) < _PREFIX.size:
+            raise ValueError(f"{path} is not a resource bundle.")
+        magic, version, header_size, self._data_offset = _PREFIX.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a resource bundle.")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"The resource bundle {path} has the format {version} instead of {FORMAT_VERSION}.")
+        self.header = json.loads(self._buffer[_PREFIX.size : _PREFIX.size + header_size].decode("utf-8"))
+
+    def is_stale(self) -> bool:
+        """
+        Check if the bundle was built by another version of the package or format, or if a source file has changed
+        since it was built. The hash of a source file is only computed when its size is the same but not its
+        modification time.
+
+        Returns:
+            bool: True if the bundle must be rebuilt
+        """
+        if self.header.get("version") != __version__ or self.header.get("format_version") != FORMAT_VERSION:
+            return True
+        directory = os.path.join(RESOURCES_DIR, self.header["language"])
+        for source, description in self.header["sources"].items():
+            source_path = os.path.join(directory, source)
+            if not os.path.exists(source_path):
+                return True
+            stat = os.stat(source_path)
+            if stat.st_size != description["size"]:
+                return True
+            if stat.st_mtime_ns != description["mtime_ns"] and _get_sha256(source_path) != description["sha256"]:
+                return True
+        return False
+
+    def array(self, name: str) -> np.ndarray:
+        """
+        Get an array of the bundle. The array is a read-only view of the memory-mapped file.
+
+        Args:
+            name (str): the name of the section.
+
+        Returns:
+            np.ndarray: the array
+        """
+        section = self.header["sections"][name]
+        return np.frombuffer(
+            self._buffer,
+            dtype=section["dtype"],
+            count=int(np.prod(section["shape"])),
+            offset=self._data_offset + section["offset"],
+        ).reshape(section["shape"])
+
+    def bytes(self, name: str) -> memoryview:
+        """
+        Get the bytes of a section of the bundle, without copy.
+
+        Args:
+            name (str): the name of the section.
+
+        Returns:
+            memoryview: the bytes
+        """
+        section = self.header["sections"][name]
+        start = self._data_offset + section["offset"]
+        return memoryview(self._buffer)[start : start + section["size"]]
+
+    def strings(self, name: str) -> List[str]:
+        """
+        Get an interned string table of the bundle.
+
+        Args:
+            name (str): the name of the string table.
+
+        Returns:
+            List[str]: the strings
+        """
+        data = self.bytes(f"{name}.data").tobytes()
+        offsets = self.array(f"{name}.offsets").tolist()
+        return [sys.intern(data[start:end].decode("utf-8")) for start, end in zip(offsets[:-1], offsets[1:])]
+
+    def get_word_lists(self) -> Tuple[Dict, Dict, ahocorasick.Automaton, List[str]]:
+        """
+        Get the word lists of biberpy and their automata (see loaders.load_word_lists).
+
+        Returns:
+            A tuple (word_lists, mwe_list, mwe_automaton, mwe_classes)
+        """
+        words = self.strings("word_lists.words")
+        offsets = self.array("word_lists.offsets").tolist()
+        ids = self.array("word_lists.ids").tolist()
+        word_lists = {
+            name: {words[i] for i in ids[start:end]}
+            for name, start, end in zip(self.strings("word_lists.names"), offsets[:-1], offsets[1:])
+        }
+        mwe_list, mwe_automaton, mwe_classes = pickle.loads(self.bytes("word_lists.automata"))
+        return word_lists, mwe_list, mwe_automaton, mwe_classes
+
+    def get_lexicon_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the arrays of the lexicon (see Lexicon).
+
+        Returns:
+            A tuple (easy_words, log_prob_keys, log_prob_values)
+        """
+        return (
+            self.array("lexicon.easy_words"),
+            self.array("lexicon.log_prob_keys"),
+            self.array("lexicon.log_prob_values"),
+        )
+
+    def get_scaler(self, scaler: str) -> AffineScaler:
+        """
+        Get a scaler of the bundle.
+
+        Args:
+            scaler (str): the name of the scaler (MinMaxScaler or StandardScaler).
+
+        Returns:
+            AffineScaler: the scaler
+        """
+        params = self.header["scalers"][scaler]
+        coefficients = {
+            coefficient: self.array(f"scaler.{scaler}.{coefficient}")
+            for coefficient in ("scale", "min" if scaler == "MinMaxScaler" else "mean")
+        }
+        return AffineScaler(scaler, self.strings(f"scaler.{scaler}.features"), coefficients, params)
+
+    def get_model(self) -> TreeEnsemble:
+        """
+        Get the classifier of the bundle.
+
+        Returns:
+            TreeEnsemble: the classifier
+        """
+        return TreeEnsemble(
+            self.strings("model.features"),
+            *(self.array(f"model.{name}") for name in _MODEL_ARRAYS),
+            self.header["model"]["max_depth"],
+        )
+
+
+def _get_sha256(path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def get_bundle(language: str) -> Union[ResourceBundle, None]:
+    """
+    Get the resource bundle of a language, memory-mapped once per process.
+
+    Args:
+        language (str): the language of the resources.
+
+    Returns:
+        The bundle, or None if it was not built or is out of date (the resources are then read from their files)
+    """
+    path = get_bundle_path(language)
+    if not os.path.exists(path):
+        return None
+    try:
+        bundle = ResourceBundle(path)
+    except ValueError as error:
+        warnings.warn(f"{error} The resources are read from their files.")
+        return None
+    if bundle.is_stale():
+        warnings.warn(f"The resource bundle {path} is out of date, the resources are read from their files.")
+        return None
+    return bundle
+
+
+class _BundleWriter:
+    def __init__(self):
+        self.sections = {}
+        self.chunks = []
+        self.size = 0
+
+    def add_bytes(self, name: str, data: bytes, **description) -> None:
+        padding = -self.size % _ALIGNMENT
+        self.chunks.append(b"\0" * padding)
+        self.size += padding
+        self.sections[name] = {"offset": self.size, "size": len(data), **description}
+        self.chunks.append(data)
+        self.size += len(data)
+
+    def add_array(self, name: str, array: np.ndarray) -> None:
+        array = np.ascontiguousarray(array)
+        self.add_bytes(name, array.tobytes(), dtype=array.dtype.str, shape=list(array.shape))
+
+    def add_strings(self, name: str, strings: List[str]) -> None:
+        encoded = [string.encode("utf-8") for string in strings]
+        self.add_bytes(f"{name}.data", b"".join(encoded))
+        self.add_array(f"{name}.offsets", np.cumsum([0, *map(len, encoded)], dtype=np.int64))
+
+    def write(self, path: str, header: Dict[str, Any]) -> None:
+        header = json.dumps({**header, "sections": self.sections}).encode("utf-8")
+        data_offset = _PREFIX.size + len(header)
+        data_offset += -data_offset % _ALIGNMENT
+        with open(path, "wb") as file:
+            file.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(header), data_offset))
+            file.write(header)
+            file.write(b"\0" * (data_offset - _PREFIX.size - len(header)))
+            for chunk in self.chunks:
+                file.write(chunk)
+
+
+def build_bundle(language: str, path: Union[str, None] = None) -> str:
+    """
+    Compile the resources of a language into a resource bundle.
+
+    Args:
+        language (str): the language of the resources.
+        path (Union[str, None]): the path of the bundle. By default, the bundle is written with the resources of the
+            language, where it is loaded from.
+
+    Returns:
+        str: the path of the bundle
+    """
+    directory = os.path.join(RESOURCES_DIR, language)
+    writer = _BundleWriter()
+    _add_word_lists(writer, directory, language)
+    _add_lexicon(writer, language)
+    scalers = _add_scalers(writer, directory, language)
+    model = _add_model(writer, directory, language)
+
+    sources = {}
+    for source in _get_sources(language):
+        source_path = os.path.join(directory, source)
+        stat = os.stat(source_path)
+        sources[source] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": _get_sha256(source_path)}
+
+    path = path or get_bundle_path(language)
+    writer.write(
+        path,
+        {
+            "language": language,
+            "version": __version__,
+            "format_version": FORMAT_VERSION,
+            "sources": sources,
+            "scalers": scalers,
+            "model": {"max_depth": model.max_depth},
+        },
+    )
+    return path
+
+
+def _add_word_lists(writer: _BundleWriter, directory: str, language: str) -> None:
+    # The readers of the resource files are only needed to build the bundle
+    from .tools import build_mwe_automaton, read_word_lists  # pylint: disable=import-outside-toplevel
+
+    word_lists, mwe_list = read_word_lists(os.path.join(directory, f"{language}.properties"), verbosity=0)
+    words = sorted(set().union(*word_lists.values()))
+    word_ids = {word: i for i, word in enumerate(words)}
+    writer.add_strings("word_lists.names", list(word_lists))
+    writer.add_strings("word_lists.words", words)
+    writer.add_array("word_lists.offsets", np.cumsum([0, *map(len, word_lists.values())], dtype=np.int64))
+    writer.add_array(
+        "word_lists.ids",
+        np.array([word_ids[word] for values in word_lists.values() for word in sorted(values)], dtype=np.uint32),
+    )
+    writer.add_bytes(
+        "word_lists.automata",
+        pickle.dumps((mwe_list, *build_mwe_automaton(word_lists)), protocol=pickle.HIGHEST_PROTOCOL),
+    )
+
+
+def _add_lexicon(writer: _BundleWriter, language: str) -> None:
+    from .calculation_functions.lexicon import Lexicon  # pylint: disable=import-outside-toplevel
+
+    lexicon = Lexicon.from_files(language)
+    writer.add_array("lexicon.easy_words", lexicon.easy_words)
+    writer.add_array("lexicon.log_prob_keys", lexicon.log_prob_keys)
+    writer.add_array("lexicon.log_prob_values", lexicon.log_prob_values)
+
+
+def _add_scalers(writer: _BundleWriter, directory: str, language: str) -> Dict[str, Dict[str, Any]]:
+    scalers = {}
+    for scaler in SCALERS:
+        with open(os.path.join(directory, f"{language}_{scaler}.pickle"), "rb") as file:
+            affine_scaler = AffineScaler.from_sklearn(pickle.load(file))
+        writer.add_strings(f"scaler.{scaler}.features", list(affine_scaler.feature_names_in_))
+        for coefficient, values in affine_scaler.coefficients.items():
+            writer.add_array(f"scaler.{scaler}.{coefficient}", np.asarray(values, dtype=np.float64))
+        scalers[scaler] = affine_scaler.params
+    return scalers
+
+
+def _add_model(writer: _BundleWriter, directory: str, language: str) -> TreeEnsemble:
+    with open(os.path.join(directory, f"{language}_model.pickle"), "rb") as file:
+        model = TreeEnsemble.from_sklearn(pickle.load(file))
+    writer.add_strings("model.features", list(model.feature_names_in_))
+    for name in _MODEL_ARRAYS:
+        writer.add_array(f"model.{name}", getattr(model, name))
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("languages", nargs="*", default=["fr"])
+    parser.add_argument("--output", default=None, help="path of the bundle (with a single language)")
+    args = parser.parse_args()
+
+    for language in args.languages:
+        path = build_bundle(language, args.output)
+        print(f"Built {path} ({os.path.getsize(path)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+from collections import OrderedDict
+from typing import Any, Dict, List, Union
+
+from spacy.tokens import Doc, DocBin
+from spacy.vocab import Vocab  # pylint: disable=no-name-in-module
+
+
+def get_cache_key(text: str, *parts: Any) -> str:
+    """
+    Content address of a result: a hash of the (cleaned) text and of everything the result depends on.
+
+    Args:
+        text (str): the cleaned text.
+        parts: the other inputs of the result (e.g. package version, model, scaler and metrics), as reprs.
+
+    Returns:
+        str: the key of the result in a ResultCache
+    """
+    digest = hashlib.sha256(text.encode("utf-8"))
+    for part in parts:
+        digest.update(b"\0")
+        digest.update(repr(part).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Cache of the results of TextComplexityComputer with an in-memory LRU tier and an optional on-disk tier (SQLite).
+    The in-memory tier keeps the ``max_entries`` most recently used results. The on-disk tier evicts the least
+    recently used results once the stored results exceed ``max_size`` bytes. The accesses to the on-disk results are
+    recorded in memory and written with the next result added, every ``accessed_flush_size`` accesses and on ``close``,
+    so that a lookup found on disk does not commit.
+
+    Attributes:
+        hits (int): the number of lookups found in the cache.
+        misses (int): the number of lookups not found in the cache.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, None] = None,
+        max_entries: int = 1024,
+        max_size: int = 256 * 1024 * 1024,
+        accessed_flush_size: int = 1024,
+    ):
+        """
+        Args:
+            path (Union[str, None]): the SQLite database of the on-disk tier. If None, only the in-memory tier is used.
+            max_entries (int): the maximum number of results of the in-memory tier (default at 1024).
+            max_size (int): the maximum size in bytes of the results of the on-disk tier (default at 256 MiB).
+            accessed_flush_size (int): the number of accesses to the on-disk results recorded in memory before they
+                are written (default at 1024).
+        """
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.accessed_flush_size = accessed_flush_size
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._connection = None
+        self._disk_size = 0
+        self._clock = 0
+        # The last access to the on-disk results, by key, not written yet
+        self._accessed: Dict[str, int] = {}
+        if path is not None:
+            self._connection = sqlite3.connect(path)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed INTEGER NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+            self._connection.commit()
+            self._disk_size, self._clock = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0), COALESCE(MAX(accessed), 0) FROM results"
+            ).fetchone()
+
+    def get(self, key: str) -> Any:
+        """
+        Get a result and mark it as the most recently used.
+
+        Args:
+            key (str): the key of the result (see get_cache_key).
+
+        Returns:
+            The result, or None if it is not in the cache
+        """
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+        if self._connection is not None:
+            row = self._connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._accessed[key] = self._tick()
+                if len(self._accessed) >= self.accessed_flush_size:
+                    self._write_accessed()
+                    self._connection.commit()
+                value = pickle.loads(row[0])
+                self._set_in_memory(key, value)
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Add a result to every tier of the cache, evicting the least recently used results if needed.
+
+        Args:
+            key (str): the key of the result (see get_cache_key).
+            value (Any): the result, which must be picklable.
+        """
+        self._set_in_memory(key, value)
+        if self._connection is not None:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            previous = self._connection.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+            if previous is not None:
+                self._disk_size -= previous[0]
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, blob, len(blob), self._tick()),
+            )
+            self._disk_size += len(blob)
+            self._accessed.pop(key, None)
+            self._write_accessed()
+            self._evict_from_disk()
+            self._connection.commit()
+
+    def clear(self) -> None:
+        """
+        Remove all the results from the cache and reset the counters.
+        """
+        self._memory.clear()
+        self._accessed.clear()
+        if self._connection is not None:
+            self._connection.execute("DELETE FROM results")
+            self._connection.commit()
+        self._disk_size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def close(self) -> None:
+        """
+        Write the accesses to the on-disk results and close the on-disk tier. The in-memory tier stays usable.
+        """
+        if self._connection is not None:
+            self._write_accessed()
+            self._connection.commit()
+            self._connection.close()
+            self._connection = None
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Getter of the counters of the cache.
+
+        Returns:
+            dict: the hits, misses, number of results in memory and size in bytes of the results on disk
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+            "disk_size": self._disk_size,
+        }
+
+    def _set_in_memory(self, key: str, value: Any) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _write_accessed(self) -> None:
+        self._connection.executemany(
+            "UPDATE results SET accessed = ? WHERE key = ?",
+            [(accessed, key) for key, accessed in self._accessed.items()],
+        )
+        self._accessed.clear()
+
+    def _evict_from_disk(self) -> None:
+        if self._disk_size <= self.max_size:
+            return
+        evicted = []
+        for key, size in self._connection.execute("SELECT key, size FROM results ORDER BY accessed"):
+            if self._disk_size <= self.max_size:
+                break
+            evicted.append((key,))
+            self._disk_size -= size
+        self._connection.executemany("DELETE FROM results WHERE key = ?", evicted)
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+
+class ParseCache:
+    """
+    On-disk cache of the spaCy objects. The objects are serialized in DocBin shards of ``shard_size`` objects and an
+    SQLite index gives the shard and position of every object. The objects added are kept in memory until their shard
+    is full or ``flush`` is called, and the ``max_loaded_shards`` most recently read shards are kept deserialized.
+
+    Attributes:
+        hits (int): the number of lookups found in the cache.
+        misses (int): the number of lookups not found in the cache.
+    """
+
+    def __init__(self, directory: str, shard_size: int = 1000, max_loaded_shards: int = 2):
+        """
+        Args:
+            directory (str): the directory of the shards and the index. It is created if needed.
+            shard_size (int): the number of spaCy objects per shard (default at 1000).
+            max_loaded_shards (int): the number of shards kept deserialized in memory (default at 2).
+        """
+        self.directory = directory
+        self.shard_size = shard_size
+        self.max_loaded_shards = max_loaded_shards
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(os.path.join(directory, "index.sqlite"))
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS docs (key TEXT PRIMARY KEY, shard INTEGER NOT NULL, position INTEGER NOT NULL)"
+        )
+        self._connection.commit()
+        self._next_shard = self._connection.execute("SELECT COALESCE(MAX(shard), -1) + 1 FROM docs").fetchone()[0]
+        self._pending = OrderedDict()
+        self._loaded_shards = OrderedDict()
+
+    def __enter__(self) -> "ParseCache":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def get(self, key: str, vocab: Vocab) -> Union[Doc, None]:
+        """
+        Get a spaCy object.
+
+        Args:
+            key (str): the key of the spaCy object (see get_cache_key).
+            vocab (Vocab): the vocabulary of the spaCy model used to deserialize the object.
+
+        Returns:
+            The spaCy object, or None if it is not in the cache
+        """
+        if key in self._pending:
+            self.hits += 1
+            return self._pending[key]
+        row = self._connection.execute("SELECT shard, position FROM docs WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        shard, position = row
+        return self._load_shard(shard, vocab)[position]
+
+    def add(self, key: str, sp_object: Doc) -> None:
+        """
+        Add a spaCy object to the cache. It is written to disk once its shard is full or on ``flush``.
+
+        Args:
+            key (str): the key of the spaCy object (see get_cache_key).
+            sp_object (Doc): the spaCy object.
+        """
+        self._pending[key] = sp_object
+        if len(self._pending) >= self.shard_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write the spaCy objects added since the last flush to a new shard.
+        """
+        if len(self._pending) == 0:
+            return
+        doc_bin = DocBin(store_user_data=False, docs=self._pending.values())
+        doc_bin.to_disk(self._get_shard_path(self._next_shard))
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO docs (key, shard, position) VALUES (?, ?, ?)",
+            [(key, self._next_shard, position) for position, key in enumerate(self._pending)],
+        )
+        self._connection.commit()
+        self._next_shard += 1
+        self._pending.clear()
+
+    def close(self) -> None:
+        """
+        Write the pending spaCy objects and close the index.
+        """
+        self.flush()
+        self._connection.close()
+
+    def _load_shard(self, shard: int, vocab: Vocab) -> List[Doc]:
+        if shard in self._loaded_shards:
+            self._loaded_shards.move_to_end(shard)
+            return self._loaded_shards[shard]
+        docs = list(DocBin().from_disk(self._get_shard_path(shard)).get_docs(vocab))
+        self._loaded_shards[shard] = docs
+        while len(self._loaded_shards) > self.max_loaded_shards:
+            self._loaded_shards.popitem(last=False)
+        return docs
+
+    def _get_shard_path(self, shard: int) -> str:
+        return os.path.join(self.directory, f"shard_{shard}.spacy")
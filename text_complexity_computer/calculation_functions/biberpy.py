@@ -1,4 +1,4 @@
-# pylint: disable=bare-except, too-many-boolean-expressions, too-many-nested-blocks
+# pylint: disable=bare-except, too-many-boolean-expressions, too-many-nested-blocks, too-many-locals, too-many-statements
 
 # -*- coding: utf-8 -*-
 # Code adaptated and taken from the Python version for doug Biber's MDA
@@ -15,6 +15,8 @@ It has been adapted by le-smog for use in the TextComplexityComputer framework.
 All these modifications are preceded by a comment tagged with #*.
 """
 
+import numpy as np
+
 dimnames = {
     "A01": "pastVerbs",
     "A03": "presVerbs",
@@ -65,6 +67,10 @@ language = None
 tag_list = None
 word_lists = None
 mwe_list = None
+# * A single automaton for the multi-word expressions of all the word lists and the names of these lists, by identifier
+# * (see tools.build_mwe_automaton).
+mwe_automaton = None
+mwe_classes = None
 
 
 def word_at(w):
@@ -433,6 +439,309 @@ def typeTokenRatio(doc):
     return len(seenBefore) / (tokenCounter + 0.000001)
 
 
+# * Single-pass feature engine. Each token is resolved once (lemma, POS, fine tag and word list memberships) into
+# * arrays, then every feature of dimnames is computed from these arrays instead of rescanning the document.
+# * The per-feature functions above are kept as the reference implementation of the features.
+_lemma_classes = (
+    "placeAdverbials",
+    "timeAdverbials",
+    "firstPersonPronouns",
+    "secondPersonPronouns",
+    "thirdPersonPronouns",
+    "itWord",
+    "demonstrativePronouns",
+    "indefinitePronouns",
+    "doVerb",
+    "whQuestions",
+    "beVerb",
+    "whMarkers",
+    "piedPiping",
+    "sentenceRelatives",
+    "becauseWord",
+    "conditionalSubordination",
+    "osubordinators",
+    "conjunctsSingle",
+    "downtopers",
+    "amplifiers",
+    "generalEmphatics",
+    "discourseParticles",
+    "possibilityModals",
+    "necessityModals",
+    "predictionModals",
+    "publicVerbs",
+    "privateVerbs",
+    "suasiveVerbs",
+    "seemappear",
+    "specialVerbs",
+    "notWord",
+    "neitherWord",
+)
+_word_classes = ("modalVerbs", "clausePunctuation", "subjectPronouns", "whQuestions", "whMarkers", "quantifiers")
+_nominalization_suffixes = {
+    "en": ["ion", "ent", "ess", "ism"],
+    "es": ["ión", "nto", "leo", "cia", "dad"],
+    "fr": ["ion", "ent", "ité", "eté", "nce", "loi"],
+    "ru": ["ция", "сть", "ние", "тие", "тво"],
+}
+# Value of the arrays past the end of the document, where the reference functions hit an IndexError
+_out_of_doc = -2
+
+
+class BiberTokens:
+    """
+    Tokens of a document resolved once into arrays. The attributes of a token are only resolved for its first
+    occurrence and broadcast to the other occurrences.
+
+    Attributes:
+        pos (np.ndarray): the code of the POS of every token (see ``pos_code``).
+        lemma_ids (np.ndarray): an identifier of the lemma of every token.
+        lemma_classes (Dict[str, np.ndarray]): for every word list, the mask of the tokens whose lemma is in the list.
+        word_classes (Dict[str, np.ndarray]): for every word list, the mask of the tokens whose word is in the list.
+        empty_word_classes (Dict[str, bool]): for every word list, whether the empty word is in the list (the word
+            used by ``isDemonstrativePronoun`` past the end of the document).
+        is_and (np.ndarray): the mask of the tokens whose word is "and".
+        past (np.ndarray): the mask of the tokens whose fine tag holds Tense=Past.
+        present (np.ndarray): the mask of the tokens whose fine tag holds Tense=Pres.
+        nominalization (np.ndarray): the mask of the tokens whose lemma has a nominalization suffix.
+        contraction (np.ndarray): the mask of the tokens whose word holds a quote.
+        word_length (np.ndarray): the length of the word of every token.
+    """
+
+    def __init__(self, keys, resolve):
+        """
+        Args:
+            keys (Iterable[Hashable]): a key for every token of the document. Tokens with the same key share their
+                attributes.
+            resolve (Callable[[Hashable], Tuple[str, str, str, str]]): gives the word, lemma, POS and fine tag of a key.
+        """
+        index = {}
+        inverse = np.fromiter((index.setdefault(key, len(index)) for key in keys), dtype=np.int64)
+        resolved = [resolve(key) for key in index]
+
+        self.pos_codes = {}
+        lemma_codes = {}
+        suffixes = _nominalization_suffixes.get(language, [])
+        pos = np.empty(len(resolved), dtype=np.int64)
+        lemma_ids = np.empty(len(resolved), dtype=np.int64)
+        lemma_classes = np.zeros((len(_lemma_classes), len(resolved)), dtype=bool)
+        word_classes = np.zeros((len(_word_classes), len(resolved)), dtype=bool)
+        flags = np.zeros((6, len(resolved)), dtype=np.int64)
+        for i, (word, lemma, pos_tag, fine_position) in enumerate(resolved):
+            pos[i] = self.pos_codes.setdefault(pos_tag, len(self.pos_codes))
+            lemma_ids[i] = lemma_codes.setdefault(lemma, len(lemma_codes))
+            for j, word_type in enumerate(_lemma_classes):
+                lemma_classes[j, i] = lemma in word_lists[word_type]
+            for j, word_type in enumerate(_word_classes):
+                word_classes[j, i] = word in word_lists[word_type]
+            flags[:, i] = (
+                word == "and",
+                fine_position.find("Tense=Past") >= 0,
+                fine_position.find("Tense=Pres") >= 0,
+                lemma[-3:] in suffixes,
+                word.find("'") >= 0,
+                len(word),
+            )
+
+        self.pos = pos[inverse]
+        self.lemma_ids = lemma_ids[inverse]
+        self.lemma_classes = {word_type: lemma_classes[j][inverse] for j, word_type in enumerate(_lemma_classes)}
+        self.word_classes = {word_type: word_classes[j][inverse] for j, word_type in enumerate(_word_classes)}
+        self.empty_word_classes = {word_type: "" in word_lists[word_type] for word_type in _word_classes}
+        flags = flags[:, inverse]
+        self.is_and = flags[0].astype(bool)
+        self.past = flags[1].astype(bool)
+        self.present = flags[2].astype(bool)
+        self.nominalization = flags[3].astype(bool)
+        self.contraction = flags[4].astype(bool)
+        self.word_length = flags[5]
+
+    def __len__(self):
+        return len(self.pos)
+
+    def pos_code(self, pos):
+        return self.pos_codes.get(pos, -1)
+
+    def pos_in(self, pos_values, *pos_tags):
+        return np.isin(pos_values, [self.pos_code(pos_tag) for pos_tag in pos_tags])
+
+
+def _next(values, offset, fill):
+    """Values of the token ``offset`` positions after every token, ``fill`` past the end of the document."""
+    return np.concatenate([values[offset:], np.full(min(offset, len(values)), fill, dtype=values.dtype)])
+
+
+def _previous(values):
+    """Values of the token before every token. As with ``doc[l - 1]``, the first token gets the last one."""
+    return np.roll(values, 1)
+
+
+def _compute_biberdims(tokens, mwe_counts):
+    n = len(tokens)
+    positions = np.arange(n)
+    word_classes = tokens.word_classes
+
+    def count(mask):
+        return int(np.count_nonzero(mask))
+
+    def lemma_filter(pos, ftclass):
+        mask = tokens.lemma_classes[ftclass]
+        if pos:
+            mask = mask & (tokens.pos == tokens.pos_code(pos))
+        return mwe_counts.get(ftclass, 0) + count(mask)
+
+    def is_pos(*pos_tags):
+        return tokens.pos_in(tokens.pos, *pos_tags)
+
+    in_doc_1 = positions + 1 < n
+    in_doc_2 = positions + 2 < n
+    in_doc_3 = positions + 3 < n
+    next_pos_1 = _next(tokens.pos, 1, _out_of_doc)
+    next_pos_2 = _next(tokens.pos, 2, _out_of_doc)
+    next_pos_3 = _next(tokens.pos, 3, _out_of_doc)
+    previous_pos = _previous(tokens.pos)
+    next_modal_2 = _next(word_classes["modalVerbs"], 2, False)
+    next_modal_3 = _next(word_classes["modalVerbs"], 3, False)
+    next_modal_4 = _next(word_classes["modalVerbs"], 4, False)
+    next_clause_punctuation = _next(word_classes["clausePunctuation"], 1, False)
+
+    # isDemonstrativePronoun(doc, l) of every position l, the word past the end of the document being ""
+    is_demonstrative = ~np.logical_or.reduce(
+        [
+            _next(word_classes["modalVerbs"], 1, tokens.empty_word_classes["modalVerbs"]),
+            next_pos_1 == tokens.pos_code("PRON"),
+            _next(word_classes["clausePunctuation"], 1, tokens.empty_word_classes["clausePunctuation"]),
+            _next(tokens.is_and, 1, False),
+        ]
+    )
+
+    is_noun = is_pos("NOUN")
+    is_adj = is_pos("ADJ")
+    is_verb = is_pos("VERB")
+    is_adp = is_pos("ADP")
+
+    dimlist = {}
+    normalise = n + 0.000001
+    dimlist[dimnames["A01"]] = count(is_verb & tokens.past) / normalise
+    dimlist[dimnames["A03"]] = count(is_verb & tokens.present) / normalise
+
+    dimlist[dimnames["B04"]] = lemma_filter("", "placeAdverbials") / normalise
+    dimlist[dimnames["B05"]] = lemma_filter("", "timeAdverbials") / normalise
+
+    dimlist[dimnames["C06"]] = lemma_filter("", "firstPersonPronouns") / normalise
+    dimlist[dimnames["C07"]] = lemma_filter("PRON", "secondPersonPronouns") / normalise
+    dimlist[dimnames["C08"]] = lemma_filter("", "thirdPersonPronouns") / normalise
+    dimlist[dimnames["C09"]] = lemma_filter("", "itWord") / normalise
+    demonstrative_pronouns = mwe_counts.get("demonstrativePronouns", 0) + count(
+        tokens.lemma_classes["demonstrativePronouns"] & is_demonstrative
+    )
+    dimlist[dimnames["C10"]] = demonstrative_pronouns / normalise
+    dimlist[dimnames["C11"]] = lemma_filter("", "indefinitePronouns") / normalise
+    not_do_as_pro_verb = (
+        ~in_doc_1
+        | (next_pos_1 == tokens.pos_code("VERB"))
+        | (tokens.pos_in(next_pos_1, "ADV", "PART") & (~in_doc_2 | (next_pos_2 == tokens.pos_code("VERB"))))
+        | _previous(word_classes["whQuestions"] | word_classes["whMarkers"])
+    )
+    do_as_pro_verb = mwe_counts.get("doVerb", 0) + count(tokens.lemma_classes["doVerb"] & ~not_do_as_pro_verb)
+    dimlist[dimnames["C12"]] = do_as_pro_verb / normalise
+
+    dimlist[dimnames["D13"]] = lemma_filter("", "whQuestions") / normalise
+    dimlist[dimnames["E14"]] = count(is_noun & tokens.nominalization) / normalise
+    dimlist[dimnames["E16"]] = (count(is_noun) / normalise) - dimlist[dimnames["E14"]]  # we substract nominalizations
+
+    be_as_main = in_doc_1 & tokens.pos_in(next_pos_1, "DET", "ADJ", "PRON", "ADP")
+    be_as_main_verb = mwe_counts.get("beVerb", 0) + count(tokens.lemma_classes["beVerb"] & be_as_main)
+    dimlist[dimnames["G19"]] = be_as_main_verb / normalise
+    dimlist[dimnames["H23"]] = lemma_filter("", "whMarkers") / normalise
+    pied_piping = mwe_counts.get("piedPiping", 0) + count(
+        tokens.lemma_classes["piedPiping"] & (previous_pos == tokens.pos_code("ADP"))
+    )
+    dimlist[dimnames["H33"]] = pied_piping / normalise
+    dimlist[dimnames["H34"]] = lemma_filter("", "sentenceRelatives") / normalise
+    dimlist[dimnames["H35"]] = lemma_filter("", "becauseWord") / normalise
+    dimlist[dimnames["H37"]] = lemma_filter("", "conditionalSubordination") / normalise
+    dimlist[dimnames["H38"]] = lemma_filter("", "osubordinators") / normalise
+
+    dimlist[dimnames["I39"]] = count(is_adp) / normalise
+    predicative_adjectives = count(
+        is_adj & in_doc_1 & _previous(tokens.lemma_classes["beVerb"]) & tokens.pos_in(next_pos_1, "ADJ", "NOUN")
+    )
+    dimlist[dimnames["I40"]] = (count(is_adj) / normalise) - predicative_adjectives / normalise
+    dimlist[dimnames["I42"]] = count(is_pos("ADV")) / normalise
+
+    biber_length = min(400, n)
+    ttr_words = ~word_classes["clausePunctuation"][:biber_length]
+    num_lemmas = len(np.unique(tokens.lemma_ids[:biber_length][ttr_words]))
+    dimlist[dimnames["J43"]] = num_lemmas / (count(ttr_words) + 0.000001)
+    words = ~word_classes["clausePunctuation"]
+    dimlist[dimnames["J44"]] = int(tokens.word_length[words].sum()) / (count(words) + 0.000001)
+
+    be_verb = tokens.lemma_classes["beVerb"]
+    conjuncts_count = (
+        lemma_filter("", "conjunctsSingle")
+        + mwe_counts.get("beVerb", 0)
+        + count(be_verb)
+        + count(be_verb & (previous_pos != tokens.pos_code("PUNCT")))
+    )
+    dimlist[dimnames["K45"]] = conjuncts_count / normalise
+    dimlist[dimnames["K46"]] = lemma_filter("", "downtopers") / normalise
+    dimlist[dimnames["K48"]] = lemma_filter("", "amplifiers") / normalise
+    dimlist[dimnames["K49"]] = lemma_filter("", "generalEmphatics") / normalise
+    discourse_particles = mwe_counts.get("discourseParticles", 0) + count(
+        tokens.lemma_classes["discourseParticles"] & (previous_pos == tokens.pos_code("PUNCT"))
+    )
+    dimlist[dimnames["K50"]] = discourse_particles / normalise
+
+    dimlist[dimnames["L52"]] = lemma_filter("", "possibilityModals") / normalise
+    dimlist[dimnames["L53"]] = lemma_filter("", "necessityModals") / normalise
+    dimlist[dimnames["L54"]] = lemma_filter("", "predictionModals") / normalise
+
+    dimlist[dimnames["K55"]] = lemma_filter("VERB", "publicVerbs") / normalise
+    dimlist[dimnames["K56"]] = lemma_filter("VERB", "privateVerbs") / normalise
+    dimlist[dimnames["K57"]] = lemma_filter("", "suasiveVerbs") / normalise
+    dimlist[dimnames["K58"]] = lemma_filter("", "seemappear") / normalise
+
+    dimlist[dimnames["N59"]] = count(tokens.contraction) / normalise
+
+    # thatDeletion, prescription by prescription
+    special_verbs = tokens.lemma_classes["specialVerbs"] & is_verb
+    first_prescription = (
+        special_verbs
+        & in_doc_1
+        & (_next(is_demonstrative, 1, False) | _next(word_classes["subjectPronouns"], 1, False))
+    )
+    remaining = special_verbs & in_doc_2 & ~first_prescription
+    second_prescription = remaining & (
+        (next_pos_1 == tokens.pos_code("PRON")) | ((next_pos_1 == tokens.pos_code("NOUN")) & next_modal_2)
+    )
+    remaining = remaining & ~second_prescription & tokens.pos_in(next_pos_1, "ADJ", "ADV", "DET", "PRON")
+    optional_adjective = next_pos_2 == tokens.pos_code("ADJ")
+    third_prescription = remaining & np.where(
+        optional_adjective,
+        in_doc_3 & (next_pos_3 == tokens.pos_code("NOUN")) & next_modal_4,
+        (next_pos_2 == tokens.pos_code("NOUN")) & next_modal_3,
+    )
+    that_deletion = count(first_prescription) + count(second_prescription) + count(third_prescription)
+    dimlist[dimnames["N60"]] = that_deletion / normalise
+
+    dimlist[dimnames["N61"]] = count(is_adp & in_doc_1 & next_clause_punctuation) / normalise
+
+    synthetic_negation = (
+        mwe_counts.get("notWord", 0)
+        + count(
+            tokens.lemma_classes["notWord"]
+            & in_doc_1
+            & tokens.pos_in(next_pos_1, "ADJ", "NOUN")
+            & _next(word_classes["quantifiers"], 1, False)
+        )
+        + lemma_filter("", "neitherWord")
+    )
+    dimlist[dimnames["P66"]] = synthetic_negation / normalise
+    dimlist[dimnames["P67"]] = lemma_filter("", "notWord") / normalise
+
+    return dimlist
+
+
 def getbiberdims(doc):
     """
     processes each document as a list of tokenised words
@@ -442,72 +751,53 @@ def getbiberdims(doc):
 
     doc = doc.strip().lower().split()
 
-    dimlist = {}
-    normalise = len(doc) + 0.000001
-    dimlist[dimnames["A01"]] = simplePartsOfSpeech(doc, "VERB", "Tense=Past")[0] / normalise
-    dimlist[dimnames["A03"]] = simplePartsOfSpeech(doc, "VERB", "Tense=Pres")[0] / normalise
-
-    dimlist[dimnames["B04"]] = pos_with_lemma_filter(doc, "", "placeAdverbials") / normalise
-    dimlist[dimnames["B05"]] = pos_with_lemma_filter(doc, "", "timeAdverbials") / normalise
-
-    dimlist[dimnames["C06"]] = pos_with_lemma_filter(doc, "", "firstPersonPronouns") / normalise
-    dimlist[dimnames["C07"]] = pos_with_lemma_filter(doc, "PRON", "secondPersonPronouns") / normalise
-    dimlist[dimnames["C08"]] = pos_with_lemma_filter(doc, "", "thirdPersonPronouns") / normalise
-    dimlist[dimnames["C09"]] = pos_with_lemma_filter(doc, "", "itWord") / normalise  # impersonal
-    dimlist[dimnames["C10"]] = demonstrativePronouns(doc) / normalise
-    dimlist[dimnames["C11"]] = pos_with_lemma_filter(doc, "", "indefinitePronouns") / normalise
-    dimlist[dimnames["C12"]] = doAsProVerb(doc) / normalise
-
-    dimlist[dimnames["D13"]] = pos_with_lemma_filter(doc, "", "whQuestions") / normalise
-    dimlist[dimnames["E14"]] = nominalizations(doc) / normalise
-    dimlist[dimnames["E16"]] = (simplePartsOfSpeech(doc, "NOUN")[0] / normalise) - dimlist[
-        dimnames["E14"]
-    ]  # we substract nominalizations
-
-    # * dimlist['F18'] =  BYpassives(doc)/normalise # to debug
-
-    dimlist[dimnames["G19"]] = beAsMainVerb(doc) / normalise
-    dimlist[dimnames["H23"]] = pos_with_lemma_filter(doc, "", "whMarkers") / normalise
-    # * dimlist['H25'] = presentParticipialClauses(doc)/normalise
-    dimlist[dimnames["H33"]] = piedPiping(doc) / normalise  # the manner in which he was told
-    dimlist[dimnames["H34"]] = (
-        pos_with_lemma_filter(doc, "", "sentenceRelatives") / normalise
-    )  # Bob likes fried mangoes, which is the most disgusting
-    dimlist[dimnames["H35"]] = pos_with_lemma_filter(doc, "", "becauseWord") / normalise
-    # * dimlist['H36'] = posWithLemmaFilter(doc,'','concessives')/normalise
-    dimlist[dimnames["H37"]] = pos_with_lemma_filter(doc, "", "conditionalSubordination") / normalise
-    dimlist[dimnames["H38"]] = osubordinators(doc) / normalise
-
-    dimlist[dimnames["I39"]] = simplePartsOfSpeech(doc, "ADP")[0] / normalise
-    # * dimlist['I41'] = predicativeAdjectives(doc)/normalise
-    dimlist[dimnames["I40"]] = (simplePartsOfSpeech(doc, "ADJ")[0] / normalise) - predicativeAdjectives(doc) / normalise
-    dimlist[dimnames["I42"]] = simplePartsOfSpeech(doc, "ADV")[0] / normalise
-
-    dimlist[dimnames["J43"]] = typeTokenRatio(doc)
-    dimlist[dimnames["J44"]] = wordLength(doc)
-
-    dimlist[dimnames["K45"]] = conjuncts(doc) / normalise
-    dimlist[dimnames["K46"]] = pos_with_lemma_filter(doc, "", "downtopers") / normalise
-    # * dimlist['K47'] = posWithLemmaFilter(doc,'','generalHedges')/normalise
-    dimlist[dimnames["K48"]] = pos_with_lemma_filter(doc, "", "amplifiers") / normalise
-    dimlist[dimnames["K49"]] = pos_with_lemma_filter(doc, "", "generalEmphatics") / normalise
-    dimlist[dimnames["K50"]] = discourseParticles(doc) / normalise
-
-    dimlist[dimnames["L52"]] = pos_with_lemma_filter(doc, "", "possibilityModals") / normalise
-    dimlist[dimnames["L53"]] = pos_with_lemma_filter(doc, "", "necessityModals") / normalise
-    dimlist[dimnames["L54"]] = pos_with_lemma_filter(doc, "", "predictionModals") / normalise
-
-    dimlist[dimnames["K55"]] = pos_with_lemma_filter(doc, "VERB", "publicVerbs") / normalise
-    dimlist[dimnames["K56"]] = pos_with_lemma_filter(doc, "VERB", "privateVerbs") / normalise
-    dimlist[dimnames["K57"]] = pos_with_lemma_filter(doc, "", "suasiveVerbs") / normalise
-    dimlist[dimnames["K58"]] = pos_with_lemma_filter(doc, "", "seemappear") / normalise
-
-    dimlist[dimnames["N59"]] = contractions(doc) / normalise
-    dimlist[dimnames["N60"]] = thatDeletion(doc) / normalise
-
-    dimlist[dimnames["N61"]] = strandedPrepositions(doc) / normalise
-
-    dimlist[dimnames["P66"]] = syntheticNegation(doc) / normalise
-    dimlist[dimnames["P67"]] = pos_with_lemma_filter(doc, "", "notWord") / normalise
+    # * All the features are computed in one pass over the resolved tokens, see _compute_biberdims.
+    tokens = BiberTokens(doc, lambda w: (word_at(w), lemma_at(w), pos_at(w), fine_position_at(w)))
+    return _compute_biberdims(tokens, count_mwes(" ".join(doc)))
 
-    return dimlist
+
+# * Entry point on a document already parsed by spaCy: the words, lemmas, POS and morphology given by the tagger are
+# * used instead of a whitespace tokenization and the tag_list "most frequent tag" substitute.
+_doc_attributes = ["LOWER", "LEMMA", "POS", "MORPH", "IS_SPACE"]
+
+
+def getbiberdims_from_doc(sp_object):
+    """
+    Processes a document parsed by spaCy. The whitespace tokens are skipped, as with the whitespace tokenization of
+    getbiberdims.
+
+    Args:
+        sp_object (Doc): the document parsed by spaCy.
+
+    Returns:
+        dict: the value of every Biber dimension, by name (see dimnames).
+    """
+    strings = sp_object.vocab.strings
+    attributes = sp_object.to_array(_doc_attributes)
+    attributes = attributes[attributes[:, -1] == 0, :-1]
+    tokens = BiberTokens(map(tuple, attributes.tolist()), lambda key: tuple(strings[value] for value in key))
+    return _compute_biberdims(tokens, count_mwes(" ".join(sp_object.text.lower().split())))
+
+
+def _is_word_boundary(text, position):
+    return position < 0 or position >= len(text) or not text[position].isalnum()
+
+
+def count_mwes(text):
+    """
+    Counts the multi-word expressions of every word list in one scan of a text. Only the expressions starting and
+    ending at word boundaries are counted.
+
+    Args:
+        text (str): the lowercased text, with single spaces between words.
+
+    Returns:
+        dict: the number of multi-word expressions found, by word list (only the word lists with expressions found).
+    """
+    counts = [0] * len(mwe_classes)
+    if len(mwe_automaton) > 0:
+        for end, (length, class_ids) in mwe_automaton.iter(text):
+            if _is_word_boundary(text, end - length) and _is_word_boundary(text, end + 1):
+                for class_id in class_ids:
+                    counts[class_id] += 1
+    return {mwe_classes[class_id]: count for class_id, count in enumerate(counts) if count > 0}
@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
-from typing import Union, List
+from typing import Dict, Iterable, List, Tuple, Union
 
+import numpy as np
 from spacy.tokens import Doc, Token
 
-from .metrics_utils import get_num_words, safe_divide
+from .metrics_utils import get_num_words, get_token_table, safe_divide
 
 
 def get_filtered_words(sp_object: Doc, without_stop: bool = False) -> List[Token]:
@@ -16,11 +17,17 @@ def get_filtered_words(sp_object: Doc, without_stop: bool = False) -> List[Token
     Returns:
         List[spacy.tokens.token.Token]: the list of filtered words as spaCy token.
     """
-    return [
-        word
-        for word in sp_object
-        if not word.is_punct and "'" not in word.text and (not word.is_stop or not without_stop)
-    ]
+    mask = get_token_table(sp_object).get_word_mask(without_stop=without_stop)
+    return [sp_object[i] for i in np.flatnonzero(mask).tolist()]
+
+
+def _get_filtered_ids(sp_object: Doc, attribute: str = "lower") -> np.ndarray:
+    """
+    Get the ids of all filtered words, without punctuations and without stopwords: the hashes ``lower`` or ``orth``,
+    or the dense ``orth_ids``.
+    """
+    token_table = get_token_table(sp_object)
+    return getattr(token_table, attribute)[token_table.get_word_mask(without_stop=True)]
 
 
 def type_token_ratio(sp_object: Union[Doc, List[Token]]) -> float:
@@ -38,6 +45,36 @@ def type_token_ratio(sp_object: Union[Doc, List[Token]]) -> float:
     return safe_divide(num_unique_words, num_words)
 
 
+def mean_sequential_ttrs(sp_object: Doc, segment_sizes: Iterable[int] = (50, 100)) -> Dict[int, float]:
+    """
+    Mean Sequential TTR (MSTTR) of many segment sizes
+        (Johnson et al., 1944)
+
+    A word is a new type of its segment if its previous occurrence is before the start of the segment: the number of
+    types of every segment is the sum of the rows of the new types reshaped into segments, the previous occurrences
+    being found once for all the segment sizes. The last words that do not fill a segment are left out.
+
+    Args:
+        sp_object (spacy.tokens.doc.Doc): spaCy object based on the text that will be computed.
+        segment_sizes (Iterable[int], optional): the sizes of the segments for the sequential mean
+
+    Returns:
+        Dict[int, float]: the MSTTR of every segment size
+    """
+    filtered_ids = _get_filtered_ids(sp_object)
+    previous, _ = _get_previous_occurrences(filtered_ids)
+    positions = np.arange(len(filtered_ids))
+    msttrs = {}
+    for segment_size in segment_sizes:
+        num_segments = len(filtered_ids) // segment_size
+        segmented = slice(0, num_segments * segment_size)
+        is_new = previous[segmented] < positions[segmented] - positions[segmented] % segment_size
+        ttrs = is_new.reshape(num_segments, segment_size).sum(axis=1) / segment_size
+        # Summed in order, as a Python sum of the TTRs
+        msttrs[segment_size] = safe_divide(sum(ttrs.tolist()), num_segments)
+    return msttrs
+
+
 def mean_sequential_ttr(sp_object: Doc, segment_size: int = 50) -> float:
     """
     Mean Sequential TTR (MSTTR)
@@ -50,12 +87,72 @@ def mean_sequential_ttr(sp_object: Doc, segment_size: int = 50) -> float:
     Returns:
         float: the MSTTR
     """
-    sttr = []
-    filtered_words = get_filtered_words(sp_object, without_stop=True)
-    num_words = len(filtered_words)
-    for i in range(0, num_words - num_words % segment_size, segment_size):
-        sttr.append(type_token_ratio(filtered_words[i : i + segment_size]))
-    return safe_divide(sum(sttr), len(sttr))
+    return mean_sequential_ttrs(sp_object, segment_sizes=[segment_size])[segment_size]
+
+
+def _get_previous_occurrences(ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the position of the previous occurrence of every word in a sequence of ids (-1 for a first occurrence), and of
+    the next occurrence (the number of words for a last occurrence).
+    """
+    order = np.argsort(ids, kind="stable")
+    repeated = ids[order[1:]] == ids[order[:-1]]
+    previous = np.full(len(ids), -1, dtype=np.int64)
+    previous[order[1:][repeated]] = order[:-1][repeated]
+    following = np.full(len(ids), len(ids), dtype=np.int64)
+    following[order[:-1][repeated]] = order[1:][repeated]
+    return previous, following
+
+
+def _reverse_occurrences(following: np.ndarray) -> np.ndarray:
+    """Get the previous occurrences of the reversed sequence of words from the next occurrences of the sequence."""
+    return (len(following) - 1 - following)[::-1]
+
+
+def _windows_num_types(previous: np.ndarray, window_size: int) -> np.ndarray:
+    """
+    Get the number of types of every window of ``window_size`` words, from the previous occurrences of the words.
+
+    A word at position j is the first occurrence of its type in the windows starting from max(previous[j] + 1,
+    j - window_size + 1) to j: each word adds one to a range of windows, summed with a difference array.
+    """
+    num_windows = len(previous) - window_size + 1
+    positions = np.arange(len(previous))
+    first_windows = np.maximum(previous + 1, positions - window_size + 1)
+    last_windows = np.minimum(positions, num_windows - 1)
+    counted = first_windows <= last_windows
+    differences = np.bincount(first_windows[counted], minlength=num_windows + 1) - np.bincount(
+        last_windows[counted] + 1, minlength=num_windows + 1
+    )
+    return np.cumsum(differences[:num_windows])
+
+
+def moving_average_ttrs(sp_object: Doc, window_sizes: Iterable[int] = (50, 100)) -> Dict[int, float]:
+    """
+    Moving Average TTR (MATTR) of many window sizes
+        (Covington and McFall, 2008)
+
+    The number of types of every window is computed from the previous occurrence of every word, found once for all the
+    window sizes, in linear time instead of building the set of every window. A text shorter than a window is a single
+    window.
+
+    Args:
+        sp_object (spacy.tokens.doc.Doc): spaCy object based on the text that will be computed.
+        window_sizes (Iterable[int], optional): the sizes of the windows for the moving average
+
+    Returns:
+        Dict[int, float]: the MATTR of every window size
+    """
+    filtered_ids = _get_filtered_ids(sp_object)
+    previous, _ = _get_previous_occurrences(filtered_ids)
+    mattrs = {}
+    for window_size in window_sizes:
+        if len(filtered_ids) < window_size:
+            mattrs[window_size] = safe_divide(int((previous < 0).sum()), len(filtered_ids))
+            continue
+        ttrs = _windows_num_types(previous, window_size) / window_size
+        mattrs[window_size] = safe_divide(float(ttrs.sum()), len(ttrs))
+    return mattrs
 
 
 def moving_average_ttr(sp_object: Doc, window_size: int = 100) -> float:
@@ -68,36 +165,158 @@ def moving_average_ttr(sp_object: Doc, window_size: int = 100) -> float:
         window_size (int, optional): the size of the window for the moving average
 
     Returns:
-        float: the MATTR
+        float: the MATTR, the mean of the TTR of every window of ``window_size`` words
 
     """
-    wttr = []
-    filtered_words = get_filtered_words(sp_object, without_stop=True)
-    num_word = len(filtered_words) - window_size
-    for i in range(num_word - num_word % window_size + 1):
-        wttr.append(type_token_ratio(filtered_words[i : i + window_size]))
-    return safe_divide(sum(wttr), len(wttr))
+    return moving_average_ttrs(sp_object, window_sizes=[window_size])[window_size]
+
 
+# The TTR equilibrium point (at 0.720) is described by P.M. McCarthy et al, 2010
+_MTLD_THRESHOLD = 0.72
+_MTLD_MIN_FACTOR_SIZE = 10
+_MTLD_MA_STEPPED_SIZE = 64
+_MTLD_MA_BLOCK_SIZE = 1024
 
-def measure_textual_lexical_diversity_unidir(sp_object):
-    ttr_unidir = 0
-    word_bank = set()
+
+def _mtld_unidir(previous: List[int], num_words: int) -> float:
+    """
+    Unidirectional MTLD of a sequence of words given by the previous occurrence of every word: a word is a new type of
+    the current factor if it did not occur since the start of the factor, so the factors need no set of types.
+    """
+    num_factors = 0.0
+    factor_start = 0
     count = 0
     t = 0
-    for word in sp_object:
+    for position, previous_position in enumerate(previous):
         count += 1
-        if word.text not in word_bank:
-            word_bank.add(word.text)
+        if previous_position < factor_start:
             t += 1
-        else:
-            # The TTR equilibrium point (at 0.720) is described by P.M. McCarthy et al, 2010
-            if t / count <= 0.72 and count >= 10:
-                ttr_unidir += 1
-                word_bank = set()
-                t = 0
-                count = 0
-    ttr_unidir += (1 - safe_divide(t, count, returned_value=1)) / 0.28  # 1-0.72
-    return safe_divide(get_num_words(sp_object), ttr_unidir)
+        elif t / count <= _MTLD_THRESHOLD and count >= _MTLD_MIN_FACTOR_SIZE:
+            num_factors += 1
+            factor_start = position + 1
+            t = 0
+            count = 0
+    num_factors += (1 - safe_divide(t, count, returned_value=1)) / (1 - _MTLD_THRESHOLD)
+    return safe_divide(num_words, num_factors)
+
+
+def _get_sorted_blocks(previous: np.ndarray) -> List[np.ndarray]:
+    """
+    Get the previous occurrences of the blocks of 2^k words of every level k, sorted within each block, as the keys
+    ``block * (n + 1) + previous + 1`` so that a block is searched in the sorted keys of its level.
+    """
+    levels = []
+    for level in range(len(previous).bit_length()):
+        blocks = np.arange(len(previous), dtype=np.int64) >> level
+        levels.append(np.sort(blocks * (len(previous) + 1) + previous + 1))
+    return levels
+
+
+def _count_types(levels: List[np.ndarray], starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Count the types of the words from ``starts`` to ``ends`` (excluded), the words whose previous occurrence is before
+    the start. The words before ``ends`` are the union of a block of every level of ``ends``'s bits, whose words with a
+    previous occurrence before the start are counted with a binary search. All the words before the start are
+    counted, so they are removed.
+    """
+    counts = -starts
+    for level, keys in enumerate(levels):
+        shifted = ends >> level
+        in_level = np.flatnonzero(shifted & 1)
+        blocks = shifted[in_level] - 1
+        found = np.searchsorted(keys, blocks * (len(keys) + 1) + starts[in_level], side="right")
+        counts[in_level] += found - (blocks << level)
+    return counts
+
+
+def _can_be_complete(previous: np.ndarray, starts: np.ndarray, excess: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Check whether the factors of the sorted ``starts``, of ``excess`` (see ``_mtld_ma_factor_sizes``) up to ``ends``
+    (excluded), can still be complete. Every word is a new type of the factor of the first start of a block of starts
+    only if it is one of the factors of the other starts of the block, so the excess of their factors cannot decrease
+    more than the one of the first start after a given word.
+    """
+    can_be_complete = np.zeros(len(starts), dtype=bool)
+    # The blocks are large enough to bound their number, each one scanning the rest of the sequence once
+    block_size = max(_MTLD_MA_BLOCK_SIZE, len(previous) // 64)
+    blocks = starts // block_size
+    for block in np.unique(blocks).tolist():
+        block_start = block * block_size
+        in_block = np.flatnonzero(blocks == block)
+        first_excess = np.cumsum(np.where(previous[block_start:] < block_start, 7, -18))
+        lowest_after = np.append(np.minimum.accumulate(first_excess[::-1])[::-1][1:], np.iinfo(np.int64).max // 2)
+        last_words = ends[in_block] - 1 - block_start
+        can_be_complete[in_block] = excess[in_block] <= first_excess[last_words] - lowest_after[last_words]
+    return can_be_complete
+
+
+def _mtld_ma_factor_sizes(previous: np.ndarray) -> np.ndarray:
+    """
+    Get the size of the factor starting from every word of a sequence (see ``_mtld_unidir``), 0 for the factors
+    reaching the end of the sequence.
+
+    The factors of all the starts first grow together, one word per step, most of them being complete within a few
+    words. The excess 25 * types - 18 * words of a factor is not positive when its TTR is lower or equal to 0.72 =
+    18/25. The factors whose excess can no longer decrease to 0 are dropped (``_can_be_complete``). The excess
+    decreases by 18 at most per word, so a factor of positive excess cannot be complete within the next excess / 18
+    words, which are skipped, their types being counted at once (``_count_types``). So the long factors of a diverse
+    text take a few steps, instead of growing one word at a time.
+    """
+    factor_sizes = np.zeros(len(previous), dtype=np.int64)
+    starts = np.arange(len(previous))
+    num_types = np.zeros(len(previous), dtype=np.int64)
+    count = 0
+    while len(starts) > 0 and count < _MTLD_MA_STEPPED_SIZE:
+        in_sequence = starts + count < len(previous)
+        starts, num_types = starts[in_sequence], num_types[in_sequence]
+        is_new = previous[starts + count] < starts
+        num_types += is_new
+        count += 1
+        if count < _MTLD_MIN_FACTOR_SIZE:
+            continue
+        complete = ~is_new & (num_types / count <= _MTLD_THRESHOLD)
+        factor_sizes[starts[complete]] = count
+        starts, num_types = starts[~complete], num_types[~complete]
+    if len(starts) == 0:
+        return factor_sizes
+
+    counts = np.full(len(starts), count)
+    pending = _can_be_complete(previous, starts, 25 * num_types - 18 * counts, starts + counts)
+    starts, counts, num_types = starts[pending], counts[pending], num_types[pending]
+    levels = _get_sorted_blocks(previous)
+    while len(starts) > 0:
+        excess = 25 * num_types - 18 * counts
+        counts = np.maximum(counts + np.maximum(1, -(-excess // 18)), _MTLD_MIN_FACTOR_SIZE)
+        in_sequence = starts + counts <= len(previous)
+        starts, counts = starts[in_sequence], counts[in_sequence]
+        num_types = _count_types(levels, starts, starts + counts)
+        complete = (previous[starts + counts - 1] >= starts) & (num_types / counts <= _MTLD_THRESHOLD)
+        factor_sizes[starts[complete]] = counts[complete]
+        starts, counts, num_types = starts[~complete], counts[~complete], num_types[~complete]
+    return factor_sizes
+
+
+def _mtld_ma_unidir(previous: np.ndarray) -> float:
+    factor_sizes = _mtld_ma_factor_sizes(previous)
+    complete = factor_sizes > 0
+    if not complete.any():
+        # No factor reaches the TTR threshold: the partial factor of the whole text is extrapolated, as in MTLD
+        return _mtld_unidir(previous.tolist(), len(previous))
+    return float(factor_sizes[complete].mean())
+
+
+def measure_textual_lexical_diversity_unidir(sp_object: Union[List[Token], np.ndarray]) -> float:
+    """
+    Unidirectional MTLD of a sequence of filtered words (spaCy tokens or ``orth`` hashes).
+    """
+    if isinstance(sp_object, np.ndarray):
+        ids = sp_object
+        num_words = len(ids)
+    else:
+        ids = np.fromiter((word.orth for word in sp_object), dtype=np.uint64, count=len(sp_object))
+        num_words = get_num_words(sp_object)
+    previous, _ = _get_previous_occurrences(ids)
+    return _mtld_unidir(previous.tolist(), num_words)
 
 
 def measure_textual_lexical_diversity(sp_object: Doc) -> float:
@@ -111,10 +330,29 @@ def measure_textual_lexical_diversity(sp_object: Doc) -> float:
     Returns:
         float: the MTLD
     """
-
-    filtered_words = get_filtered_words(sp_object, without_stop=True)
-    filtered_words_rev = list(reversed(filtered_words))
+    filtered_ids = _get_filtered_ids(sp_object, attribute="orth_ids")
+    # The occurrences of the reversed text are derived from the ones of the text, without sorting it again
+    previous, following = _get_previous_occurrences(filtered_ids)
     return (
-        measure_textual_lexical_diversity_unidir(filtered_words)
-        + measure_textual_lexical_diversity_unidir(filtered_words_rev)
+        _mtld_unidir(previous.tolist(), len(filtered_ids))
+        + _mtld_unidir(_reverse_occurrences(following).tolist(), len(filtered_ids))
     ) / 2
+
+
+def measure_textual_lexical_diversity_ma_bid(sp_object: Doc) -> float:
+    """
+    Moving-Average Bidirectional MTLD (MTLD-MA bid)
+        (P.M. McCarthy and S. Jarvis, 2010)
+
+    The mean size of the factors starting from every word, forward and backward. The factors reaching the end of the
+    text are left out, unless no factor is complete.
+
+    Args:
+        sp_object (spacy.tokens.doc.Doc): spaCy object based on the text that will be computed.
+
+    Returns:
+        float: the MTLD-MA bid
+    """
+    filtered_ids = _get_filtered_ids(sp_object, attribute="orth_ids")
+    previous, following = _get_previous_occurrences(filtered_ids)
+    return (_mtld_ma_unidir(previous) + _mtld_ma_unidir(_reverse_occurrences(following))) / 2
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import pkgutil
+from functools import lru_cache
+from math import log
+from typing import Dict, Set
+
+import numpy as np
+from spacy.strings import get_string_id  # pylint: disable=no-name-in-module
+
+from ..bundle import get_bundle
+
+# The lowest log probability of all the frequency list, given to unknown words and words with a probability of 0
+UNKNOWN_LOG_PROB = -10
+
+
+class Lexicon:
+    """
+    Lexical resources of a language indexed by spaCy string hash (the ``lemma``/``orth`` values of the tokens), as
+    sorted arrays so that they are loaded in place from the resource bundle and looked up for many words at once.
+
+    Attributes:
+        language (str): the language of the resources.
+        easy_words (np.ndarray): the sorted hashes of the strings found in the easy word reference list (Gougenheim
+            list). As for the original substring test against the list, every substring of an entry of the list is
+            included.
+        log_prob_keys (np.ndarray): the sorted hashes of the words of the frequency list (Lexique383).
+        log_prob_values (np.ndarray): the log probability of every word of ``log_prob_keys``. The words with a
+            probability of 0 have the lowest log probability of the list.
+    """
+
+    def __init__(self, language: str, easy_words: np.ndarray, log_prob_keys: np.ndarray, log_prob_values: np.ndarray):
+        self.language = language
+        self.easy_words = easy_words
+        self.log_prob_keys = log_prob_keys
+        self.log_prob_values = log_prob_values
+
+    @classmethod
+    def from_files(cls, language: str) -> "Lexicon":
+        """
+        Read the lexicon of a language from its resource files.
+
+        Args:
+            language (str): the language of the lexicon.
+
+        Returns:
+            Lexicon: the lexicon of the language
+        """
+        log_probs = cls._read_log_probs(language)
+        log_prob_keys = np.array(sorted(log_probs), dtype=np.uint64)
+        return cls(
+            language,
+            np.array(sorted(cls._read_easy_words(language)), dtype=np.uint64),
+            log_prob_keys,
+            np.array([log_probs[key] for key in log_prob_keys.tolist()], dtype=np.float64),
+        )
+
+    @staticmethod
+    def _read_easy_words(language: str) -> Set[int]:
+        data = pkgutil.get_data(__name__, os.path.join("../resources", language, "easy_words.txt")).decode("utf-8")
+        substrings = {""}
+        for line in data.split("\n"):
+            for start in range(len(line)):
+                for end in range(start + 1, len(line) + 1):
+                    substrings.add(line[start:end])
+        # The line breaks themselves (e.g. a "\n" whitespace token) were also found by the substring test.
+        line_breaks = "\n"
+        while line_breaks in data:
+            substrings.add(line_breaks)
+            line_breaks += "\n"
+        return {get_string_id(substring) for substring in substrings}
+
+    @staticmethod
+    def _read_log_probs(language: str) -> Dict[int, float]:
+        data = pkgutil.get_data(__name__, os.path.join("../resources", language, "word_frequencies.json"))
+        return {
+            get_string_id(word): log(prob) if prob > 0 else UNKNOWN_LOG_PROB
+            for word, prob in json.loads(data.decode()).items()
+        }
+
+    def is_easy(self, key: int) -> bool:
+        """
+        Check if a word is in the easy word reference list.
+
+        Args:
+            key (int): the spaCy hash of the word.
+
+        Returns:
+            bool: True if the word is in the reference list
+        """
+        return bool(self.are_easy(np.array([key], dtype=np.uint64))[0])
+
+    def are_easy(self, keys: np.ndarray) -> np.ndarray:
+        """
+        Check if words are in the easy word reference list.
+
+        Args:
+            keys (np.ndarray): the spaCy hashes of the words.
+
+        Returns:
+            np.ndarray: the mask of the words in the reference list
+        """
+        return _find(self.easy_words, keys) >= 0
+
+    def log_prob(self, key: int) -> float:
+        """
+        Get the log probability of a word.
+
+        Args:
+            key (int): the spaCy hash of the word.
+
+        Returns:
+            float: the log probability of the word, or the lowest log probability of the list for unknown words
+        """
+        return float(self.log_probs_of(np.array([key], dtype=np.uint64))[0])
+
+    def log_probs_of(self, keys: np.ndarray) -> np.ndarray:
+        """
+        Get the log probability of words.
+
+        Args:
+            keys (np.ndarray): the spaCy hashes of the words.
+
+        Returns:
+            np.ndarray: the log probability of every word, the lowest log probability of the list for unknown words
+        """
+        positions = _find(self.log_prob_keys, keys)
+        return np.where(positions >= 0, self.log_prob_values[positions], UNKNOWN_LOG_PROB)
+
+
+def _find(sorted_keys: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """
+    Find keys in a sorted array.
+
+    Returns:
+        np.ndarray: the position of every key in the array, -1 for the keys not found
+    """
+    if len(sorted_keys) == 0:
+        return np.full(len(keys), -1)
+    positions = np.searchsorted(sorted_keys, keys)
+    positions[positions == len(sorted_keys)] = 0
+    return np.where(sorted_keys[positions] == keys, positions, -1)
+
+
+@lru_cache(maxsize=None)
+def get_lexicon(language: str) -> Lexicon:
+    """
+    Get the lexicon of a language, loaded once per process from the resource bundle of the language if it was built,
+    else read from its resource files.
+
+    Args:
+        language (str): the language of the lexicon.
+
+    Returns:
+        Lexicon: the lexicon of the language
+    """
+    bundle = get_bundle(language)
+    if bundle is not None:
+        return Lexicon(language, *bundle.get_lexicon_arrays())
+    return Lexicon.from_files(language)
@@ -1,9 +1,329 @@
 # -*- coding: utf-8 -*-
 import re
-from typing import Union, Tuple, List
+import weakref
+from collections import OrderedDict
+from functools import cached_property
+from typing import Any, Callable, Dict, Union, Tuple, List
 
+import numpy as np
+from spacy.strings import StringStore  # pylint: disable=no-name-in-module
 from spacy.tokens import Doc, Token
 
+_TOKEN_TABLE_ATTRIBUTES = ["ORTH", "LOWER", "LEMMA", "POS", "DEP", "HEAD", "IS_PUNCT", "IS_STOP", "SENT_START"]
+
+_SYLLABLES = re.compile(r"[aeiouyœéèëêîïôûüùâàô]+")
+
+
+class LexemeTable:
+    """
+    Process-wide table of the attributes of the token texts (``LexemeTable.ATTRIBUTES``), keyed by ``orth`` hash and
+    shared by the token tables of all the documents. The attributes of a text are computed the first time it is seen,
+    and the ``max_entries`` most recently used texts are kept: as the words of a language follow Zipf's law, the
+    frequent words are computed once per process.
+
+    Attributes:
+        max_entries (int): the maximum number of texts in the table.
+        hits (int): the number of texts found in the table.
+        misses (int): the number of texts computed.
+    """
+
+    ATTRIBUTES = ("length", "lower_length", "syllables", "has_quote")
+
+    def __init__(self, max_entries: int = 100000):
+        """
+        Args:
+            max_entries (int): the maximum number of texts in the table (default at 100000).
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._rows = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get_rows(self, orths: np.ndarray, strings: StringStore) -> np.ndarray:
+        """
+        Get the attributes of texts, computing the ones not in the table and evicting the least recently used ones.
+
+        Args:
+            orths (np.ndarray): the ``orth`` hashes of the texts.
+            strings (StringStore): the strings of the vocabulary of the hashes.
+
+        Returns:
+            np.ndarray: the attributes of every text, one row per text and one column per attribute
+        """
+        rows = []
+        for orth in orths.tolist():
+            row = self._rows.get(orth)
+            if row is None:
+                self.misses += 1
+                text = strings[orth]
+                row = (len(text), len(text.lower()), syllables_estimate(text), "'" in text)
+                self._rows[orth] = row
+            else:
+                self.hits += 1
+                self._rows.move_to_end(orth)
+            rows.append(row)
+        while len(self._rows) > self.max_entries:
+            self._rows.popitem(last=False)
+        return np.array(rows, dtype=np.int64).reshape(len(rows), len(self.ATTRIBUTES))
+
+    def clear(self) -> None:
+        """
+        Remove all the texts from the table and reset the counters.
+        """
+        self._rows.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Getter of the counters of the table.
+
+        Returns:
+            dict: the hits, misses, hit rate and number of texts in the table
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": safe_divide(self.hits, self.hits + self.misses),
+            "entries": len(self._rows),
+        }
+
+
+# The lexeme table of the process
+LEXEME_TABLE = LexemeTable()
+
+
+class TokenTable:
+    """
+    Compact per-document token table built once from ``Doc.to_array``. The metrics compute from its NumPy columns and
+    masks instead of looping over the spaCy tokens.
+
+    The string attributes (``orth``, ``lower``, ``lemma`` and ``dep``) are spaCy hashes. The attributes that only
+    depend on the text of a token (length, syllables, ...) are taken from the process-wide ``LEXEME_TABLE`` once per
+    distinct token of the document.
+
+    Attributes:
+        orth (np.ndarray): the hash of the text of every token.
+        lower (np.ndarray): the hash of the lowercase text of every token.
+        lemma (np.ndarray): the hash of the lemma of every token.
+        pos (np.ndarray): the coarse-grained part-of-speech of every token.
+        dep (np.ndarray): the hash of the syntactic dependency label of every token.
+        head (np.ndarray): the index of the syntactic head of every token.
+        is_punct (np.ndarray): the punctuation mask.
+        is_stop (np.ndarray): the stopword mask.
+        sentence_starts (np.ndarray): the index of the first token of every sentence.
+    """
+
+    def __init__(self, sp_object: Doc):
+        self.strings = sp_object.vocab.strings
+        array = sp_object.to_array(_TOKEN_TABLE_ATTRIBUTES)
+        self.orth = array[:, 0]
+        self.lower = array[:, 1]
+        self.lemma = array[:, 2]
+        self.pos = array[:, 3]
+        self.dep = array[:, 4]
+        self.head = np.arange(len(array), dtype=np.int64) + array[:, 5].view(np.int64)
+        self.is_punct = array[:, 6].astype(bool)
+        self.is_stop = array[:, 7].astype(bool)
+
+        sent_start = array[:, 8].view(np.int64) == 1
+        if len(sent_start) > 0:
+            sent_start[0] = True
+        self.sentence_starts = np.flatnonzero(sent_start)
+
+    def __len__(self) -> int:
+        return len(self.orth)
+
+    @cached_property
+    def _orth_index(self) -> Tuple[np.ndarray, np.ndarray]:
+        uniques, inverse = np.unique(self.orth, return_inverse=True)
+        return uniques, inverse.reshape(-1)
+
+    @cached_property
+    def orth_ids(self) -> np.ndarray:
+        """
+        The dense id of the text of every token (its rank among the distinct texts of the document), in the smallest
+        unsigned integer type, which is sorted faster than the hashes.
+        """
+        uniques, inverse = self._orth_index
+        return inverse.astype(np.min_scalar_type(max(len(uniques) - 1, 0)))
+
+    def map_orth(self, function: Callable, dtype: type) -> np.ndarray:
+        """
+        Apply a function to the text of every distinct token and broadcast its result to every token.
+
+        Args:
+            function (Callable[[str], Any]): the function applied to the text of the tokens.
+            dtype (type): the type of the result.
+
+        Returns:
+            np.ndarray: the result of the function for every token.
+        """
+        uniques, inverse = self._orth_index
+        values = np.fromiter(
+            (function(self.strings[orth]) for orth in uniques.tolist()), dtype=dtype, count=len(uniques)
+        )
+        return values[inverse]
+
+    def map_dep(self, function: Callable) -> np.ndarray:
+        """
+        Apply a predicate to every distinct dependency label and broadcast its result to every token.
+
+        Args:
+            function (Callable[[str], bool]): the predicate applied to the dependency labels.
+
+        Returns:
+            np.ndarray: the mask of the tokens whose dependency label fulfills the predicate.
+        """
+        uniques, inverse = np.unique(self.dep, return_inverse=True)
+        values = np.fromiter((function(self.strings[dep]) for dep in uniques.tolist()), dtype=bool, count=len(uniques))
+        return values[inverse.reshape(-1)]
+
+    @cached_property
+    def _lexemes(self) -> np.ndarray:
+        uniques, _ = self._orth_index
+        return LEXEME_TABLE.get_rows(uniques, self.strings)
+
+    def _get_lexeme_attribute(self, attribute: str) -> np.ndarray:
+        _, inverse = self._orth_index
+        return self._lexemes[:, LexemeTable.ATTRIBUTES.index(attribute)][inverse]
+
+    @cached_property
+    def lengths(self) -> np.ndarray:
+        """The number of characters of every token."""
+        return self._get_lexeme_attribute("length")
+
+    @cached_property
+    def lower_lengths(self) -> np.ndarray:
+        """The number of characters of every lowercase token."""
+        return self._get_lexeme_attribute("lower_length")
+
+    @cached_property
+    def syllables(self) -> np.ndarray:
+        """The estimated number of syllables of every token."""
+        return self._get_lexeme_attribute("syllables")
+
+    @cached_property
+    def word_mask(self) -> np.ndarray:
+        """The mask of the real words (not punctuation or quotes)."""
+        return ~self.is_punct & (self._get_lexeme_attribute("has_quote") == 0)
+
+    def get_word_mask(self, min_size: int = 0, without_stop: bool = False) -> np.ndarray:
+        """
+        Get the mask of the real words (see ``get_num_words``).
+
+        Args:
+            min_size (int, optional): minimum size of the word to be taken account of (Default at 0).
+            without_stop (bool, optional): don't count stopwords (Default at False).
+
+        Returns:
+            np.ndarray: the mask of the real words
+        """
+        mask = self.word_mask
+        if min_size > 0:
+            mask = mask & (self.lengths >= min_size)
+        if without_stop:
+            mask = mask & ~self.is_stop
+        return mask
+
+    @cached_property
+    def sentence_ends(self) -> np.ndarray:
+        """The index following the last token of every sentence."""
+        return np.append(self.sentence_starts[1:], len(self)).astype(np.int64)
+
+    @cached_property
+    def tree_roots(self) -> np.ndarray:
+        """
+        The root of the dependency tree of every token (the roots being their own heads), found by pointer jumping: the
+        ancestor at distance 2^k of every token is found from the ancestors at distance 2^(k-1), so a tree of depth d
+        is resolved in log2(d) array operations, without recursion.
+        """
+        roots = self.head
+        for _ in range(len(self).bit_length()):
+            ancestors = roots[roots]
+            if np.array_equal(ancestors, roots):
+                break
+            roots = ancestors
+        return roots
+
+    @cached_property
+    def real_sentence_mask(self) -> np.ndarray:
+        """The mask of the real sentences (the sentences which do not end with a comma)."""
+        if len(self) == 0:
+            return np.zeros(0, dtype=bool)
+        ends_with_comma = self.map_orth(lambda text: text[-1] in [","], dtype=bool)
+        return ~ends_with_comma[self.sentence_ends - 1]
+
+    def sum_by_sentence(self, values: np.ndarray) -> np.ndarray:
+        """
+        Sum token values over every sentence.
+
+        Args:
+            values (np.ndarray): a value for every token.
+
+        Returns:
+            np.ndarray: the sum of the values of every sentence.
+        """
+        if len(self) == 0:
+            return np.zeros(0, dtype=np.int64)
+        return np.add.reduceat(values.astype(np.int64), self.sentence_starts)
+
+
+# The intermediate results of the spaCy objects, with the number of tokens they were computed for. They are kept out of
+# the ``user_data`` of the spaCy objects, which is serialized with them (e.g. ``Doc.to_bytes``, ``DocBin`` or
+# ``nlp.pipe`` with many processes), and are dropped with the spaCy objects.
+_MEMOIZED: "weakref.WeakKeyDictionary[Doc, Tuple[int, Dict[str, Any]]]" = weakref.WeakKeyDictionary()
+
+
+def memoize(sp_object: Doc, key: str, builder: Callable[[Doc], Any]) -> Any:
+    """
+    Get an intermediate result of a spaCy object, built once and shared by all the metrics of the spaCy object. The
+    results are built again when the number of tokens of the spaCy object changed (e.g. after ``Doc.retokenize``).
+
+    Args:
+        sp_object (spacy.tokens.doc.Doc): spaCy object based on the text that will be computed.
+        key (str): the name of the intermediate result.
+        builder (Callable[[Doc], Any]): the function building the intermediate result from the spaCy object.
+
+    Returns:
+        The intermediate result
+    """
+    num_tokens, results = _MEMOIZED.get(sp_object, (-1, None))
+    if results is None or num_tokens != len(sp_object):
+        results = {}
+        _MEMOIZED[sp_object] = (len(sp_object), results)
+    if key not in results:
+        results[key] = builder(sp_object)
+    return results[key]
+
+
+def get_token_table(sp_object: Doc) -> TokenTable:
+    """
+    Get the token table of a spaCy object. It is built once and memoized (see ``memoize``) so that all the metrics of
+    a document share it.
+
+    Args:
+        sp_object (spacy.tokens.doc.Doc): spaCy object based on the text that will be computed.
+
+    Returns:
+        TokenTable: the token table of the spaCy object
+    """
+    return memoize(sp_object, "token_table", TokenTable)
+
+
+def clear_memoized(sp_object: Doc) -> None:
+    """
+    Remove the intermediate results memoized for a spaCy object (the token table and the syntactic counts), e.g.
+    after editing its annotations in place.
+
+    Args:
+        sp_object (spacy.tokens.doc.Doc): spaCy object based on the text that was computed.
+    """
+    _MEMOIZED.pop(sp_object, None)
+
 
 def get_num_words(
     sp_object: Union[Doc, List[Token]],
@@ -28,6 +348,15 @@ def get_num_words(
 
     Original author: Nicolas Garneau
     """
+    if isinstance(sp_object, Doc):
+        token_table = get_token_table(sp_object)
+        mask = token_table.get_word_mask(min_size=min_size, without_stop=without_stop)
+        if get_size:
+            return int(mask.sum()), int(token_table.lower_lengths[mask].sum())
+        if get_unique:
+            return int(mask.sum()), len(np.unique(token_table.lower[mask]))
+        return int(mask.sum())
+
     filtered_words = [
         word.text.lower()
         for word in sp_object
@@ -56,15 +385,14 @@ def get_num_sentences(sp_object: Doc) -> int:
 
     Original author: Nicolas Garneau
     """
-    real_sentences = [sentences for sentences in sp_object.sents if sentences.text[-1] not in [","]]
-    return len(real_sentences)
+    return int(get_token_table(sp_object).real_sentence_mask.sum())
 
 
 def syllables_estimate(string: str) -> int:
     """
     Estimate the syllables.
     """
-    return len(re.findall(r"[aeiouyœéèëêîïôûüùâàô]+", string))
+    return len(_SYLLABLES.findall(string))
 
 
 def get_num_syllables(sp_object: Union[Doc, Token]) -> int:
@@ -87,8 +415,8 @@ def get_num_syllables(sp_object: Union[Doc, Token]) -> int:
             return syllables_estimate(sp_object.text)
         return 0
 
-    filtered_words = [word.text for word in sp_object if not word.is_punct and "'" not in word.text]
-    return syllables_estimate(" ".join(filtered_words))
+    token_table = get_token_table(sp_object)
+    return int(token_table.syllables[token_table.word_mask].sum())
 
 
 def safe_divide(x: Union[int, float], y: Union[int, float], returned_value: Union[int, float] = 0.0) -> float:
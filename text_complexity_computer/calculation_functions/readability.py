@@ -8,6 +8,7 @@ from .metrics_utils import (
     get_num_words,
     get_num_sentences,
     get_num_syllables,
+    get_token_table,
     safe_divide,
 )
 from .syntactic_complexity import mean_length_sentences
@@ -59,14 +60,10 @@ def lm_100(sp_object: Doc) -> float:
     Returns:
         float: the number of syllable per 100 words
     """
-    count = 0
-    counts = []
-    for i in range(0, len(sp_object), 100):
-        for token in sp_object[i : 100 + i]:
-            count += get_num_syllables(token)
-        counts.append(count)
-        count = 0
-    return safe_divide(sum(counts), len(counts))
+    token_table = get_token_table(sp_object)
+    # The syllables are counted by slices of 100 tokens and averaged over the slices
+    num_slices = -(-len(token_table) // 100)
+    return safe_divide(int(token_table.syllables[token_table.word_mask].sum()), num_slices)
 
 
 def km_formula(sp_object: Doc) -> float:
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+from functools import partial
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Tuple
+
+from spacy.tokens import Doc
+
+from . import lexical_diversity, lexicon, metrics_utils, readability, syntactic_complexity, vocabulary_complexity
+
+LANGUAGE = "fr"
+
+# The intermediate statistics shared by the metrics
+TOKEN_TABLE = "token_table"  # metrics_utils.get_token_table
+SENTENCES = "sentences"  # the sentence boundaries of the token table
+SYNTACTIC_STATS = "syntactic_stats"  # syntactic_complexity.get_syntactic_stats
+LEXICON = "lexicon"  # lexicon.get_lexicon
+
+# The builders of the intermediate statistics, in computation order. They are memoized (in the spaCy object or per
+# process) so that every intermediate is computed once whatever the number of metrics using it.
+INTERMEDIATES: Dict[str, Callable[[Doc], Any]] = {
+    TOKEN_TABLE: lambda sp_object: metrics_utils.get_token_table(sp_object).word_mask,
+    SENTENCES: lambda sp_object: metrics_utils.get_token_table(sp_object).real_sentence_mask,
+    SYNTACTIC_STATS: syntactic_complexity.get_syntactic_stats,
+    LEXICON: lambda sp_object: lexicon.get_lexicon(LANGUAGE),
+}
+
+# The spaCy components (of fr_core_news_sm) giving the annotations used by the metrics. The components of MODEL_PIPES
+# that are not required by a plan are disabled while parsing (e.g. the parser for the lexical metrics, and the NER
+# which is never used).
+PARSER_PIPES = ("tok2vec", "parser")
+LEMMATIZER_PIPES = ("tok2vec", "morphologizer", "attribute_ruler", "lemmatizer")
+BIBERPY_PIPES = LEMMATIZER_PIPES
+MODEL_PIPES = ("tok2vec", "morphologizer", "parser", "attribute_ruler", "lemmatizer", "ner")
+
+
+class Metric(NamedTuple):
+    """
+    A metric of the registry.
+
+    Attributes:
+        name (str): the name of the metric, used as column name of the scores.
+        function (Callable[[Doc], float]): the function computing the metric from a spaCy object.
+        requires (FrozenSet[str]): the intermediate statistics used by the function (e.g. ``SYNTACTIC_STATS``).
+        pipes (FrozenSet[str]): the spaCy components giving the annotations used by the function.
+    """
+
+    name: str
+    function: Callable[[Doc], float]
+    requires: FrozenSet[str]
+    pipes: FrozenSet[str]
+
+
+class Plan(NamedTuple):
+    """
+    The computation plan of a selection of metrics (see get_plan).
+
+    Attributes:
+        metrics (Tuple[Metric, ...]): the metrics to compute.
+        with_biberpy (bool): compute the biberpy's metrics.
+        intermediates (Tuple[str, ...]): the intermediate statistics used by the metrics, in computation order.
+        pipes (FrozenSet[str]): the spaCy components giving the annotations used by the metrics.
+    """
+
+    metrics: Tuple[Metric, ...]
+    with_biberpy: bool
+    intermediates: Tuple[str, ...]
+    pipes: FrozenSet[str]
+
+    @property
+    def names(self) -> List[str]:
+        """The names of the metrics of the plan."""
+        return [metric.name for metric in self.metrics]
+
+    def get_disabled_pipes(self, pipe_names: Iterable[str]) -> List[str]:
+        """
+        Get the components of a spaCy pipeline that are not needed by the plan. Only the components of MODEL_PIPES can
+        be disabled, the other components of the pipeline are kept.
+
+        Args:
+            pipe_names (Iterable[str]): the components of the spaCy pipeline.
+
+        Returns:
+            List[str]: the components to disable
+        """
+        return [name for name in pipe_names if name in MODEL_PIPES and name not in self.pipes]
+
+    def compute_intermediates(self, sp_object: Doc) -> None:
+        """
+        Compute (and memoize) the intermediate statistics of the plan, each one once.
+
+        Args:
+            sp_object (spacy.tokens.doc.Doc): spaCy object based on the text that will be computed.
+        """
+        for intermediate in self.intermediates:
+            INTERMEDIATES[intermediate](sp_object)
+
+
+METRICS: Dict[str, Metric] = {}
+
+
+def register_metric(
+    name: str, function: Callable[[Doc], float], requires: Iterable[str] = (), pipes: Iterable[str] = ()
+) -> Metric:
+    """
+    Register a metric, making it available to TextComplexityComputer by its name.
+
+    Args:
+        name (str): the name of the metric.
+        function (Callable[[Doc], float]): the function computing the metric from a spaCy object.
+        requires (Iterable[str], optional): the intermediate statistics used by the function.
+        pipes (Iterable[str], optional): the spaCy components giving the annotations used by the function.
+
+    Returns:
+        Metric: the registered metric
+    """
+    if name in METRICS:
+        raise ValueError(f"A metric named {name} is already registered.")
+    metric = Metric(name, function, frozenset(requires), frozenset(pipes))
+    METRICS[name] = metric
+    return metric
+
+
+def get_metric(name: str) -> Metric:
+    """
+    Get a registered metric.
+
+    Args:
+        name (str): the name of the metric.
+
+    Returns:
+        Metric: the metric
+    """
+    try:
+        return METRICS[name]
+    except KeyError as error:
+        raise ValueError(f"Unknown metric {name}, the registered metrics are {list(METRICS)}.") from error
+
+
+def get_plan(names: Iterable[str], with_biberpy: bool) -> Plan:
+    """
+    Resolve a selection of metrics into the minimal set of intermediate statistics and spaCy components they need.
+
+    Args:
+        names (Iterable[str]): the names of the metrics (duplicates are ignored).
+        with_biberpy (bool): compute the biberpy's metrics.
+
+    Returns:
+        Plan: the computation plan of the metrics
+    """
+    metrics = tuple(get_metric(name) for name in dict.fromkeys(names))
+    requires = set().union(*(metric.requires for metric in metrics))
+    # The intermediates without builder (declared by custom metrics) are left to the metrics
+    intermediates = tuple(intermediate for intermediate in INTERMEDIATES if intermediate in requires)
+    pipes = set().union(*(metric.pipes for metric in metrics))
+    if with_biberpy:
+        pipes.update(BIBERPY_PIPES)
+    return Plan(metrics, with_biberpy, intermediates, frozenset(pipes))
+
+
+for _name, _function in [
+    ("mls", syntactic_complexity.mean_length_sentences),
+    ("ps_30", syntactic_complexity.ps_30),
+    ("nws_90", syntactic_complexity.nws_90),
+    ("mlt", syntactic_complexity.mean_length_tunit),
+    ("tu_s", syntactic_complexity.tu_s),
+    ("ctu_tu", syntactic_complexity.ctu_tu),
+    ("dc_c", syntactic_complexity.dc_c),
+    ("c_s", syntactic_complexity.c_s),
+    ("c_tu", syntactic_complexity.c_tu),
+    ("cp_c", syntactic_complexity.cp_c),
+    ("cp_tu", syntactic_complexity.cp_tu),
+]:
+    register_metric(_name, _function, requires=(TOKEN_TABLE, SENTENCES, SYNTACTIC_STATS), pipes=PARSER_PIPES)
+register_metric(
+    "pa",
+    partial(vocabulary_complexity.pa, language=LANGUAGE),
+    requires=(TOKEN_TABLE, LEXICON),
+    pipes=LEMMATIZER_PIPES,
+)
+register_metric("nlm", vocabulary_complexity.nlm, requires=(TOKEN_TABLE,))
+register_metric(
+    "uni_gram_lem",
+    partial(vocabulary_complexity.uni_gram_lem, language=LANGUAGE),
+    requires=(TOKEN_TABLE, LEXICON),
+    pipes=LEMMATIZER_PIPES,
+)
+register_metric("msttr", lexical_diversity.mean_sequential_ttr, requires=(TOKEN_TABLE,))
+# The "mattr" feature of the model was computed with MTLD (the moving average TTR is "mattr_100")
+register_metric("mattr", lexical_diversity.measure_textual_lexical_diversity, requires=(TOKEN_TABLE,))
+register_metric("mtld", lexical_diversity.measure_textual_lexical_diversity, requires=(TOKEN_TABLE,))
+register_metric("fk_ease", readability.fk_ease, requires=(TOKEN_TABLE, SENTENCES), pipes=PARSER_PIPES)
+register_metric("bingui", readability.bingui, requires=(TOKEN_TABLE, SENTENCES), pipes=PARSER_PIPES)
+register_metric(
+    "km_score",
+    readability.km_formula,
+    requires=(TOKEN_TABLE, SENTENCES, SYNTACTIC_STATS),
+    pipes=PARSER_PIPES,
+)
+
+# The metrics used as features by the model. The metrics registered afterward are computed but not given to the model.
+MODEL_METRICS = list(METRICS)
+
+register_metric("mattr_100", partial(lexical_diversity.moving_average_ttr, window_size=100), requires=(TOKEN_TABLE,))
+register_metric("mtld_ma_bid", lexical_diversity.measure_textual_lexical_diversity_ma_bid, requires=(TOKEN_TABLE,))
@@ -1,11 +1,101 @@
 # -*- coding: utf-8 -*-
 
-from typing import Union, Tuple
+from typing import List, NamedTuple, Union, Tuple
 
 import numpy as np
 from spacy.tokens import Doc, Token
 
-from .metrics_utils import get_num_sentences, get_num_words, safe_divide
+from .metrics_utils import TokenTable, get_token_table, memoize, safe_divide
+
+_SUBORDINATE_DEPS = ("ccomp", "orphan", "advcl")
+
+
+class SyntacticStats(NamedTuple):
+    """
+    Counts shared by all the syntactic complexity metrics.
+
+    Attributes:
+        num_sentences (int): the number of real sentences (see ``metrics_utils.get_num_sentences``).
+        num_words (int): the number of real words (see ``metrics_utils.get_num_words``).
+        sentences_num_words (List[int]): the number of real words of every sentence of the spaCy object.
+        num_clauses (int): the number of clauses.
+        num_dependent_clauses (int): the number of dependent clauses.
+        num_coordinates (int): the number of coordinate phrases.
+        num_t_units (int): the number of T-Units.
+        num_complex_t_units (int): the number of Complex T-Units.
+    """
+
+    num_sentences: int
+    num_words: int
+    sentences_num_words: List[int]
+    num_clauses: int
+    num_dependent_clauses: int
+    num_coordinates: int
+    num_t_units: int
+    num_complex_t_units: int
+
+
+def _is_subordinate(dep: str) -> bool:
+    return dep[:3] == "acl" or dep in _SUBORDINATE_DEPS
+
+
+def _get_num_complex_t_units(token_table: TokenTable, is_subordinate: np.ndarray, is_root: np.ndarray) -> int:
+    """
+    Count the sentences whose last root has a subordinate in its descendants (see ``check_if_complex``). Every
+    subordinate marks the root of its tree (``TokenTable.tree_roots``) as complex, in linear time whatever the depth of
+    the trees.
+    """
+    root_positions = np.flatnonzero(is_root)
+    if len(root_positions) == 0:
+        return 0
+    is_complex = np.zeros(len(token_table), dtype=bool)
+    # The root of a tree is not one of its descendants
+    is_complex[token_table.tree_roots[is_subordinate & (token_table.head != np.arange(len(token_table)))]] = True
+    sentences = np.searchsorted(token_table.sentence_starts, root_positions, side="right") - 1
+    is_last_root = np.append(sentences[1:] != sentences[:-1], True)
+    return int(is_complex[root_positions[is_last_root]].sum())
+
+
+def get_syntactic_stats(sp_object: Doc) -> SyntacticStats:
+    """
+    Collect, in a single pass over the token table of the spaCy object, every count used by the syntactic complexity
+    metrics. The result is memoized (see ``metrics_utils.memoize``) so that all the metrics of a document share the
+    same pass.
+
+    Args:
+        sp_object (spacy.tokens.doc.Doc): spaCy object based on the text that will be computed.
+
+    Returns:
+        SyntacticStats: the counts of the spaCy object
+    """
+    return memoize(sp_object, "syntactic_stats", _compute_syntactic_stats)
+
+
+def _compute_syntactic_stats(sp_object: Doc) -> SyntacticStats:
+    token_table = get_token_table(sp_object)
+    is_subordinate = token_table.map_dep(_is_subordinate)
+    is_root = token_table.map_dep(lambda dep: dep == "ROOT")
+
+    num_sentences = int(token_table.real_sentence_mask.sum())
+    sentences_num_words = token_table.sum_by_sentence(token_table.word_mask).tolist()
+    num_coordinates = int(token_table.map_dep(lambda dep: dep == "conj").sum())
+    num_subordinates = int(is_subordinate.sum())
+
+    num_complex_t_units = _get_num_complex_t_units(token_table, is_subordinate, is_root)
+
+    num_clauses = num_sentences + num_coordinates + num_subordinates
+    return SyntacticStats(
+        num_sentences=num_sentences,
+        num_words=sum(sentences_num_words),
+        sentences_num_words=sentences_num_words,
+        num_clauses=num_clauses,
+        # Coordinates are counted as dependent clauses
+        num_dependent_clauses=num_clauses - num_sentences,
+        num_coordinates=num_coordinates,
+        # At least one T-unit per sentence and the coordinate clauses are counted as separate T-Units.
+        num_t_units=num_sentences + num_coordinates,
+        num_complex_t_units=num_complex_t_units,
+    )
 
 
 def mean_length_sentences(sp_object: Doc) -> float:
@@ -18,7 +108,8 @@ def mean_length_sentences(sp_object: Doc) -> float:
     Returns:
         float: the mean length of sentences
     """
-    return safe_divide(get_num_words(sp_object), get_num_sentences(sp_object))
+    syntactic_stats = get_syntactic_stats(sp_object)
+    return safe_divide(syntactic_stats.num_words, syntactic_stats.num_sentences)
 
 
 def nws_90(sp_object: Doc) -> int:
@@ -34,13 +125,14 @@ def nws_90(sp_object: Doc) -> int:
     if len(sp_object) == 0:
         # Empty document
         return 0
-    sentences = list(range(get_num_sentences(sp_object)))
+    syntactic_stats = get_syntactic_stats(sp_object)
+    sentences = list(range(syntactic_stats.num_sentences))
     if len(sentences) == 0:
         # Fail-case if the SpaCy model could not extract a clear sentence.
         # It happens rarely.
         return 0
     rank = int(np.percentile(sentences, 90))
-    return get_num_words(list(sp_object.sents)[rank])
+    return syntactic_stats.sentences_num_words[rank]
 
 
 def ps_30(sp_object: Doc):
@@ -53,19 +145,23 @@ def ps_30(sp_object: Doc):
     Returns:
         float: the percentage of sentences longer than 30 words
     """
-    sentences_30 = [sentence for sentence in sp_object.sents if get_num_words(sentence) >= 30]
-    return safe_divide(len(sentences_30), get_num_sentences(sp_object))
+    syntactic_stats = get_syntactic_stats(sp_object)
+    sentences_30 = [num_words for num_words in syntactic_stats.sentences_num_words if num_words >= 30]
+    return safe_divide(len(sentences_30), syntactic_stats.num_sentences)
 
 
 # ==================== I - T-UNITS ==================== #
-def check_if_complex(sp_root_token: Token):
-    for child in sp_root_token.children:
-        # Subordinate in the children of the root
-        if child.dep_[:3] == "acl" or child.dep_ in ["ccomp", "orphan", "advcl"]:
-            return True
-        if check_if_complex(child):
-            return True
-    return False
+def check_if_complex(sp_root_token: Token) -> bool:
+    """
+    Check whether a token has a subordinate in its descendants.
+
+    Args:
+        sp_root_token (spacy.tokens.token.Token): the root token of a T-Unit.
+
+    Returns:
+        bool: the T-Unit is complex
+    """
+    return any(_is_subordinate(token.dep_) for token in sp_root_token.subtree if token.i != sp_root_token.i)
 
 
 def _get_t_units(sp_object: Doc, complex_count: bool = False) -> Union[int, Tuple[int, int]]:
@@ -84,26 +180,10 @@ def _get_t_units(sp_object: Doc, complex_count: bool = False) -> Union[int, Tupl
         int: the number of T-Units if complex_count=False
         Tuple[int, int]: the number of T-Units and Complex T-Unit if complex_count=True
     """
-    # At least one T-unit per sentence
-    t_unit_count = get_num_sentences(sp_object)
-    complex_t_unit_count = 0
-
-    for sentence in sp_object.sents:
-        complex_t_unit_pres = False
-        for token in sentence:
-            # The coordinate clauses are counted as separate T-Units. (see Docstring for more)
-            if token.dep_ == "conj":
-                t_unit_count += 1
-            if complex_count:
-                if token.dep_ == "ROOT":
-                    complex_t_unit_pres = check_if_complex(token)
-        if complex_count:
-            if complex_t_unit_pres:
-                complex_t_unit_count += 1
-
+    syntactic_stats = get_syntactic_stats(sp_object)
     if complex_count:
-        return t_unit_count, complex_t_unit_count
-    return t_unit_count
+        return syntactic_stats.num_t_units, syntactic_stats.num_complex_t_units
+    return syntactic_stats.num_t_units
 
 
 def mean_length_tunit(sp_object: Doc) -> float:
@@ -116,8 +196,8 @@ def mean_length_tunit(sp_object: Doc) -> float:
     Returns:
         float: the average size of T-Units
     """
-    t_units = _get_t_units(sp_object)
-    return safe_divide(get_num_words(sp_object), t_units)
+    syntactic_stats = get_syntactic_stats(sp_object)
+    return safe_divide(syntactic_stats.num_words, syntactic_stats.num_t_units)
 
 
 def tu_s(sp_object: Doc) -> float:
@@ -130,7 +210,8 @@ def tu_s(sp_object: Doc) -> float:
     Returns:
         float: the average number of T-Units per sentence
     """
-    return safe_divide(_get_t_units(sp_object), get_num_sentences(sp_object))
+    syntactic_stats = get_syntactic_stats(sp_object)
+    return safe_divide(syntactic_stats.num_t_units, syntactic_stats.num_sentences)
 
 
 def ctu_tu(sp_object: Doc) -> float:
@@ -163,22 +244,10 @@ def _get_clauses(sp_object: Doc, dependent_count: bool = False) -> Union[int, Tu
         int: the number of Clauses if dependent_count=False
         Tuple[int, int]: the number of Clauses and Dependent Clauses if dependent_count=True
     """
-    clause_count = get_num_sentences(sp_object)
-    dc_count = 0
-
-    for token in sp_object:
-        if token.dep_[:3] == "acl" or token.dep_ in [
-            "conj",
-            "ccomp",
-            "orphan",
-            "advcl",
-        ]:
-            clause_count += 1
-            if dependent_count:
-                dc_count += 1
+    syntactic_stats = get_syntactic_stats(sp_object)
     if dependent_count:
-        return clause_count, dc_count
-    return clause_count
+        return syntactic_stats.num_clauses, syntactic_stats.num_dependent_clauses
+    return syntactic_stats.num_clauses
 
 
 def dc_c(sp_object: Doc) -> float:
@@ -205,7 +274,8 @@ def c_s(sp_object: Doc) -> float:
     Returns:
         float: the average number of Clauses per phrase
     """
-    return safe_divide(_get_clauses(sp_object), get_num_sentences(sp_object))
+    syntactic_stats = get_syntactic_stats(sp_object)
+    return safe_divide(syntactic_stats.num_clauses, syntactic_stats.num_sentences)
 
 
 def c_tu(sp_object: Doc) -> float:
@@ -218,7 +288,8 @@ def c_tu(sp_object: Doc) -> float:
     Returns:
         float: the average number of Clauses per T-Unit
     """
-    return safe_divide(_get_clauses(sp_object), _get_t_units(sp_object))
+    syntactic_stats = get_syntactic_stats(sp_object)
+    return safe_divide(syntactic_stats.num_clauses, syntactic_stats.num_t_units)
 
 
 # ====================================================== #
@@ -235,11 +306,7 @@ def _get_coordinate(sp_object: Doc) -> int:
     Returns:
         int: the number of Coordinate phrases
     """
-    coordinate_counter = 0
-    for token in sp_object:
-        if token.dep_ == "conj":
-            coordinate_counter += 1
-    return coordinate_counter
+    return get_syntactic_stats(sp_object).num_coordinates
 
 
 def cp_c(sp_object: Doc) -> float:
@@ -252,7 +319,8 @@ def cp_c(sp_object: Doc) -> float:
     Returns:
         float: the average number of Coordinate phrases per Clause
     """
-    return safe_divide(_get_coordinate(sp_object), _get_clauses(sp_object))
+    syntactic_stats = get_syntactic_stats(sp_object)
+    return safe_divide(syntactic_stats.num_coordinates, syntactic_stats.num_clauses)
 
 
 def cp_tu(sp_object: Doc) -> float:
@@ -265,7 +333,8 @@ def cp_tu(sp_object: Doc) -> float:
     Returns:
         float: the average number of Coordinate phrases per T-Unit
     """
-    return safe_divide(_get_coordinate(sp_object), _get_t_units(sp_object))
+    syntactic_stats = get_syntactic_stats(sp_object)
+    return safe_divide(syntactic_stats.num_coordinates, syntactic_stats.num_t_units)
 
 
 # ====================================================== #
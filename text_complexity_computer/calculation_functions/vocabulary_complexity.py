@@ -1,13 +1,10 @@
 # -*- coding: utf-8 -*-
 
-import json
-import os
-import pkgutil
-from math import log
-
+import numpy as np
 from spacy.tokens import Doc
 
-from .metrics_utils import get_num_words, safe_divide
+from .lexicon import get_lexicon
+from .metrics_utils import get_num_words, get_token_table, safe_divide
 
 
 def pa(sp_object: Doc, language: str) -> float:
@@ -21,13 +18,9 @@ def pa(sp_object: Doc, language: str) -> float:
     Returns:
         float: The average number of word not in a reference list.
     """
-    data = pkgutil.get_data(__name__, os.path.join("../resources", language, "easy_words.txt"))
-    utf8data = data.decode("utf-8")
-
-    count = 0
-    for token in sp_object:
-        if token.lemma_ not in utf8data:
-            count += 1
+    lexicon = get_lexicon(language)
+    lemmas, counts = np.unique(get_token_table(sp_object).lemma, return_counts=True)
+    count = int(counts[~lexicon.are_easy(lemmas)].sum())
     return safe_divide(count, get_num_words(sp_object))
 
 
@@ -71,18 +64,13 @@ def uni_gram_lem(sp_object: Doc, language: str) -> float:
     Returns:
         float: the average probability value of words according to a frequency list.
     """
-    normalized_prob = 0
-    data = pkgutil.get_data(__name__, os.path.join("../resources", language, "word_frequencies.json"))
-    lexique_dic = json.loads(data.decode())
-    lexique_keys = list(lexique_dic.keys())
-
-    for token in sp_object:
-        if token.lemma_ not in lexique_keys:
-            normalized_prob -= 10  # the lowest probability of all the list
-        else:
-            if lexique_dic[token.lemma_] <= 0:
-                normalized_prob -= 10  # the lowest probability of all the list
-            else:
-                normalized_prob += log(lexique_dic[token.lemma_])
+    lexicon = get_lexicon(language)
+    token_table = get_token_table(sp_object)
+    if len(token_table) == 0:
+        return 0.0
+    lemmas, inverse = np.unique(token_table.lemma, return_inverse=True)
+    log_probs = lexicon.log_probs_of(lemmas)
+    # The cumulative sum adds the tokens sequentially, in the order of the text.
+    normalized_prob = float(np.cumsum(log_probs[inverse.reshape(-1)])[-1])
 
     return safe_divide(normalized_prob, get_num_words(sp_object))
@@ -0,0 +1,98 @@
+# pylint: disable=c-extension-no-member
+import os
+import pickle
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import ahocorasick
+import spacy
+from spacy.language import Language
+
+from .bundle import RESOURCES_DIR, get_bundle
+from .scaler import AffineScaler
+from .tools import build_mwe_automaton, read_word_lists
+from .tree_ensemble import TreeEnsemble
+
+# The heavy components are loaded once per process, on first use, and shared by every TextComplexityComputer. The
+# resources are loaded from the resource bundle of the language if it was built (see bundle.py), else read from their
+# files.
+
+
+@lru_cache(maxsize=None)
+def load_tagger(model_name: str) -> Language:
+    """
+    Load a spaCy model, downloading it if it is not installed.
+
+    Args:
+        model_name (str): the name of the spaCy model.
+
+    Returns:
+        Language: the spaCy model
+    """
+    try:
+        tagger = spacy.load(model_name)
+    except OSError:
+        from spacy.cli import download  # pylint: disable=import-outside-toplevel
+
+        print(download(model_name))
+        tagger = spacy.load(model_name)
+    tagger.max_length = 5000000
+    return tagger
+
+
+@lru_cache(maxsize=None)
+def load_word_lists(language: str, verbosity: int) -> Tuple[Dict, Dict, ahocorasick.Automaton, List[str]]:
+    """
+    Load the word lists of biberpy and their multi-word expressions automata.
+
+    Args:
+        language (str): the language of the word lists.
+        verbosity (int): the verbosity of read_word_lists.
+
+    Returns:
+        A tuple (word_lists, mwe_list, mwe_automaton, mwe_classes) (see read_word_lists and build_mwe_automaton)
+    """
+    bundle = get_bundle(language)
+    if bundle is not None:
+        return bundle.get_word_lists()
+    word_lists, mwe_list = read_word_lists(
+        os.path.join(RESOURCES_DIR, language, f"{language}.properties"), verbosity=verbosity
+    )
+    return (word_lists, mwe_list, *build_mwe_automaton(word_lists))
+
+
+@lru_cache(maxsize=None)
+def load_scaler(language: str, scaler: str) -> AffineScaler:
+    """
+    Load a fitted scaler.
+
+    Args:
+        language (str): the language of the scaler.
+        scaler (str): the name of the scaler (MinMaxScaler or StandardScaler).
+
+    Returns:
+        AffineScaler: the scaler
+    """
+    bundle = get_bundle(language)
+    if bundle is not None:
+        return bundle.get_scaler(scaler)
+    with open(os.path.join(RESOURCES_DIR, language, f"{language}_{scaler}.pickle"), "rb") as file:
+        return AffineScaler.from_sklearn(pickle.load(file))
+
+
+@lru_cache(maxsize=None)
+def load_model(language: str) -> TreeEnsemble:
+    """
+    Load the classifier estimating the level of difficulty.
+
+    Args:
+        language (str): the language of the classifier.
+
+    Returns:
+        TreeEnsemble: the classifier
+    """
+    bundle = get_bundle(language)
+    if bundle is not None:
+        return bundle.get_model()
+    with open(os.path.join(RESOURCES_DIR, language, f"{language}_model.pickle"), "rb") as file:
+        return TreeEnsemble.from_sklearn(pickle.load(file))
@@ -0,0 +1,73 @@
+from typing import Iterable, Iterator, List, Union
+
+from spacy.language import Language
+from spacy.tokens import Doc
+from spacy.util import minibatch
+
+from .results import MetricsScores
+from .text_complexity_computer import MODEL_METRICS, TextComplexityComputer
+
+if not Doc.has_extension("tcc_features"):
+    Doc.set_extension("tcc_features", default=None)
+if not Doc.has_extension("tcc_level"):
+    Doc.set_extension("tcc_level", default=None)
+
+
+class TextComplexityComponent:
+    """
+    spaCy pipeline component scoring the parsed documents with TextComplexityComputer. It sets ``doc._.tcc_features``
+    (the scaled metrics scores given to the model, by name) and ``doc._.tcc_level`` (the estimation of the level of
+    difficulty). It must be added after the components giving the POS, morphology, lemmas and dependencies.
+
+    The documents are scored as parsed by the pipeline, without cleaning their text (see ``clean_text``), whereas
+    ``TextComplexityComputer.compute(text)`` scores the spaCy object of ``clean_text(text)``. Both give the same results
+    when the pipeline is given the cleaned text.
+
+    Attributes:
+        tcc (TextComplexityComputer): the computer scoring the documents, using the pipeline as tagger.
+    """
+
+    def __init__(self, nlp: Language, name: str, scaler: Union[str, None] = "MinMaxScaler", batch_size: int = 256):
+        """
+        Args:
+            nlp (Language): the pipeline of the component.
+            name (str): the name of the component in the pipeline.
+            scaler (Union[str, None]): chose the scaler between MinMaxScaler (by default), StandardScaler and none.
+            batch_size (int): number of documents scored together by ``pipe`` (default at 256).
+        """
+        self.name = name
+        self.batch_size = batch_size
+        self.tcc = TextComplexityComputer(scaler=scaler, verbosity=0, tagger=nlp)
+
+    def __call__(self, doc: Doc) -> Doc:
+        metrics_scores = self.tcc.get_metrics_scores(doc, metrics=MODEL_METRICS, as_frame=False)
+        self._set_annotations([doc], metrics_scores)
+        return doc
+
+    def pipe(self, stream: Iterable[Doc], batch_size: Union[int, None] = None) -> Iterator[Doc]:
+        """
+        Score the documents ``batch_size`` (by default, the batch size of the component) at a time, the scaler and the
+        model being called once per batch.
+        """
+        for docs in minibatch(stream, size=batch_size or self.batch_size):
+            self._set_annotations(
+                docs,
+                self.tcc.get_metrics_scores_batch(docs, metrics=MODEL_METRICS, batch_size=len(docs), as_frame=False),
+            )
+            yield from docs
+
+    def _set_annotations(self, docs: List[Doc], metrics_scores: MetricsScores) -> None:
+        levels = self.tcc.predict(metrics_scores)
+        for doc, features, level in zip(docs, metrics_scores.to_records(), levels.tolist()):
+            doc._.tcc_features = features
+            doc._.tcc_level = level
+
+
+@Language.factory("text_complexity", default_config={"scaler": "MinMaxScaler", "batch_size": 256})
+def create_text_complexity_component(
+    nlp: Language, name: str, scaler: Union[str, None], batch_size: int
+) -> TextComplexityComponent:
+    """
+    Factory of the "text_complexity" pipeline component, e.g. ``nlp.add_pipe("text_complexity")``.
+    """
+    return TextComplexityComponent(nlp, name, scaler=scaler, batch_size=batch_size)
@@ -0,0 +1,93 @@
+from typing import Dict, Iterator, List, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+
+class MetricsScores:
+    """
+    Compact metrics scores of one or many texts (see ``as_frame=False`` in TextComplexityComputer), without pandas.
+    The scores are stored column-wise, one column per metric, in an array shared by the conversions to a DataFrame,
+    a dict or an array, which do not copy them.
+
+    Attributes:
+        columns (List[str]): the names of the metrics, in the order of the columns.
+        values (np.ndarray): the scores, one row per text and one column per metric (column-major).
+    """
+
+    __slots__ = ("columns", "values", "_column_index")
+
+    def __init__(self, columns: Sequence[str], values: np.ndarray, column_index: Union[Dict[str, int], None] = None):
+        """
+        Args:
+            columns (Sequence[str]): the names of the metrics, in the order of the columns.
+            values (np.ndarray): the scores, one row per text and one column per metric.
+            column_index (Union[Dict[str, int], None]): the column of every metric, computed from ``columns`` if not
+                given.
+        """
+        self.columns = list(columns)
+        self.values = values
+        self._column_index = column_index if column_index is not None else {name: i for i, name in enumerate(columns)}
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def __getitem__(self, metric: str) -> np.ndarray:
+        """The scores of a metric, one per text."""
+        return self.values[:, self._column_index[metric]]
+
+    def __iter__(self) -> Iterator["MetricsScores"]:
+        """The metrics scores of every text."""
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def __repr__(self) -> str:
+        return f"MetricsScores({len(self)} texts, {len(self.columns)} metrics)"
+
+    def row(self, i: int) -> "MetricsScores":
+        """
+        Get the metrics scores of a text, without copy.
+
+        Args:
+            i (int): the position of the text.
+
+        Returns:
+            MetricsScores: the scores of the text
+        """
+        return MetricsScores(self.columns, self.values[i : i + 1], self._column_index)
+
+    def to_numpy(self) -> np.ndarray:
+        """
+        Get the scores as an array, without copy.
+
+        Returns:
+            np.ndarray: the scores, one row per text and one column per metric
+        """
+        return self.values
+
+    def to_dict(self) -> Dict[str, np.ndarray]:
+        """
+        Get the scores by metric, without copy.
+
+        Returns:
+            Dict[str, np.ndarray]: the scores of every metric, one per text
+        """
+        return {name: self.values[:, i] for i, name in enumerate(self.columns)}
+
+    def to_records(self) -> List[Dict[str, float]]:
+        """
+        Get the scores by text.
+
+        Returns:
+            List[Dict[str, float]]: the scores of every text, by metric
+        """
+        return [dict(zip(self.columns, row)) for row in self.values.tolist()]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Get the scores as a DataFrame (the format of get_metrics_scores), without copy.
+
+        Returns:
+            pd.DataFrame: the scores, one row per text and one column per metric
+        """
+        return pd.DataFrame(self.values, columns=self.columns, copy=False)
@@ -0,0 +1,99 @@
+from typing import Any, Dict, Sequence, Union
+
+import numpy as np
+
+
+class AffineScaler:
+    """
+    NumPy implementation of the fitted scalers of the package (scikit-learn's MinMaxScaler and StandardScaler). It is
+    loaded without scikit-learn and scales any subset of the features, with the same operations as ``transform``.
+
+    Attributes:
+        kind (str): the scikit-learn scaler, MinMaxScaler or StandardScaler.
+        feature_names_in_ (np.ndarray): the names of the features, in order.
+        coefficients (Dict[str, np.ndarray]): the fitted coefficients of every feature (``scale`` and ``min`` for
+            MinMaxScaler, ``mean`` and ``scale`` for StandardScaler).
+        params (Dict[str, Any]): the parameters of the scaler (``clip`` and ``feature_range`` for MinMaxScaler,
+            ``with_mean`` and ``with_std`` for StandardScaler).
+    """
+
+    def __init__(
+        self, kind: str, feature_names: Sequence[str], coefficients: Dict[str, np.ndarray], params: Dict[str, Any]
+    ):
+        if kind not in ("MinMaxScaler", "StandardScaler"):
+            raise ValueError(f"Unknown scaler {kind}, the scaler should be MinMaxScaler or StandardScaler.")
+        self.kind = kind
+        self.feature_names_in_ = np.asarray(feature_names, dtype=object)
+        self.coefficients = coefficients
+        self.params = params
+
+    @classmethod
+    def from_sklearn(cls, scaler: Any) -> "AffineScaler":
+        """
+        Get the affine scaler of a fitted scikit-learn scaler.
+
+        Args:
+            scaler (Union[MinMaxScaler, StandardScaler]): the fitted scaler.
+
+        Returns:
+            AffineScaler: the scaler
+        """
+        kind = type(scaler).__name__
+        if kind == "MinMaxScaler":
+            coefficients = {"scale": scaler.scale_, "min": scaler.min_}
+            params = {"clip": bool(scaler.clip), "feature_range": [float(bound) for bound in scaler.feature_range]}
+        else:
+            coefficients = {"mean": scaler.mean_, "scale": scaler.scale_}
+            params = {"with_mean": bool(scaler.with_mean), "with_std": bool(scaler.with_std)}
+        return cls(kind, list(scaler.feature_names_in_), coefficients, params)
+
+    def subset(self, feature_names: Sequence[str]) -> "AffineScaler":
+        """
+        Get the scaler of some features, with their coefficients gathered once, e.g. to scale the columns of a
+        selection of metrics without indexing the coefficients at every call.
+
+        Args:
+            feature_names (Sequence[str]): the names of the features, in the order of the columns to scale.
+
+        Returns:
+            AffineScaler: the scaler of the features
+        """
+        index = {feature: i for i, feature in enumerate(self.feature_names_in_)}
+        indices = [index[feature] for feature in feature_names]
+        coefficients = {name: np.ascontiguousarray(values[indices]) for name, values in self.coefficients.items()}
+        return AffineScaler(self.kind, feature_names, coefficients, self.params)
+
+    def transform(self, values: Any) -> np.ndarray:
+        """
+        Scale every feature.
+
+        Args:
+            values (Union[np.ndarray, pd.DataFrame]): the values of the features, one column per feature.
+
+        Returns:
+            np.ndarray: the scaled values
+        """
+        return self.transform_columns(np.array(values, dtype=np.float64), slice(None))
+
+    def transform_columns(self, values: np.ndarray, indices: Union[Sequence[int], slice]) -> np.ndarray:
+        """
+        Scale some features, in place.
+
+        Args:
+            values (np.ndarray): the values of the features, one column per feature of ``indices``.
+            indices (Union[Sequence[int], slice]): the indices of the features of the columns.
+
+        Returns:
+            np.ndarray: the scaled values
+        """
+        if self.kind == "MinMaxScaler":
+            values *= self.coefficients["scale"][indices]
+            values += self.coefficients["min"][indices]
+            if self.params["clip"]:
+                np.clip(values, self.params["feature_range"][0], self.params["feature_range"][1], out=values)
+            return values
+        if self.params["with_mean"]:
+            values -= self.coefficients["mean"][indices]
+        if self.params["with_std"]:
+            values /= self.coefficients["scale"][indices]
+        return values
@@ -1,89 +1,180 @@
-import os
-import pickle
+# pylint: disable=c-extension-no-member
+import sys
+import time
 import warnings
-from functools import partial
-from typing import Union
+from collections import deque
+from functools import cached_property
+from itertools import islice, tee
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Sequence, Tuple, Union
 
+import ahocorasick
 import numpy as np
 import pandas as pd
-import spacy
-from spacy.cli import download
-from spacy.tokens import Doc
+from spacy.language import Language
+from spacy.util import get_package_version
+from spacy.tokens import Doc, DocBin
 
-from .calculation_functions import biberpy, vocabulary_complexity
-from .calculation_functions import (
-    readability,
-    syntactic_complexity,
-    lexical_diversity,
-)
-from .tools import clean_text, read_word_lists, read_num_list
+from .calculation_functions import biberpy
+from .calculation_functions.lexicon import Lexicon, get_lexicon
+from .calculation_functions.registry import LANGUAGE, LEXICON, METRICS, MODEL_METRICS, Plan, get_plan
+from .calculation_functions.metrics_utils import clear_memoized
+from .cache import ParseCache, ResultCache, get_cache_key
+from .loaders import load_model, load_scaler, load_tagger, load_word_lists
+from .results import MetricsScores
+from .scaler import AffineScaler
+from .tools import clean_text
+from .tree_ensemble import TreeEnsemble
+from .version import __version__
+
+# The features of the scaler and the model: the metrics of the model and the biberpy's metrics. The other registered
+# metrics are not used by the model nor scaled.
+FEATURES = sorted([*MODEL_METRICS, *biberpy.dimnames.values()])
+_MODEL_PLAN = get_plan(MODEL_METRICS, with_biberpy=True)
+
+
+class _Layout(NamedTuple):
+    """
+    The columns of the metrics scores of a plan, computed once per plan (see TextComplexityComputer._get_layout).
+
+    Attributes:
+        columns (List[str]): the names of the columns, sorted.
+        column_index (Dict[str, int]): the column of every name.
+        metric_columns (List[int]): the column of every metric of the plan, in order.
+        biber_columns (List[Tuple[str, int]]): the biberpy's metrics and their column.
+        scaled_columns (Union[slice, List[int]]): the columns of the features of the scaler.
+        scaler (Union[AffineScaler, None]): the scaler restricted to the scaled columns, if any.
+    """
+
+    columns: List[str]
+    column_index: Dict[str, int]
+    metric_columns: List[int]
+    biber_columns: List[Tuple[str, int]]
+    scaled_columns: Union[slice, List[int]]
+    scaler: Union[AffineScaler, None]
+
+
+MODEL_NAME = "fr_core_news_sm"
 
 
 class TextComplexityComputer:
     """
     TextComplexityComputer class
 
+    The heavy components (spaCy model, word lists, lexicon, scaler and classifier) are loaded on first use, once per
+    process, or all at once with ``warmup``.
+
     Attributes:
-        scaler (Union[str, None]): chose the scaler between MinMaxScaler (by default), StandardScaler and none.
+        tagger (Language): the spaCy pipeline parsing the texts.
+        word_lists (dict): the word lists of biberpy.
+        mwe_list (dict): the multi-word expressions automata of the word lists of biberpy.
+        lexicon (Lexicon): the lexicon of the vocabulary complexity metrics.
+        scaler (Union[AffineScaler, None]): the scaler of the metrics scores, if any.
+        model (TreeEnsemble): the classifier estimating the level of difficulty.
+        cache (Union[ResultCache, None]): the cache of the results of get_metrics_scores and compute, if any.
+        parse_cache (Union[ParseCache, None]): the cache of the spaCy objects, if any.
+        load_times (Dict[str, float]): the time in seconds taken to get each component (close to 0 if it was already
+        loaded by the process).
 
     Methods:
-        get_metrics_scores(text: str, metrics: Union[list, str, None] = 'all', with_biberpy: bool = True): Getter
-    of the metrics scores
+        get_metrics_scores(text: Union[str, Doc], metrics: Union[list, str, None] = 'all', with_biberpy: bool =
+    True, as_frame: bool = True): Getter of the metrics scores
+        get_metrics_scores_batch(texts: Union[Iterable[Union[str, Doc]], DocBin], metrics: Union[list, str, None] =
+    'all', with_biberpy: bool = True, batch_size: int = 256, n_process: int = 1, as_frame: bool = True): Getter of the
+    metrics scores of many texts
+        iter_scores(texts: Union[Iterable[Union[str, Doc]], DocBin], metrics: Union[list, str, None] = 'all',
+    with_biberpy: bool = True, batch_size: int = 256, n_process: int = 1, as_frame: bool = True): Lazy getter of the
+    metrics scores of many texts
         get_sp_object(text: str): Getter of the spaCy object
-        compute(text: str): Compute the text and evaluate the global difficulty level
+        compute(text: Union[str, Doc]): Compute the text and evaluate the global difficulty level
+        compute_batch(texts: Union[Iterable[Union[str, Doc]], DocBin], batch_size: int = 256, n_process: int = 1):
+    Compute many texts and evaluate their global difficulty level
+        warmup(): Load every component
     """
 
-    def __init__(self, scaler: Union[str, None] = "MinMaxScaler", verbosity: int = 1):
+    def __init__(
+        self,
+        scaler: Union[str, None] = "MinMaxScaler",
+        verbosity: int = 1,
+        cache: Union[ResultCache, None] = None,
+        parse_cache: Union[ParseCache, None] = None,
+        tagger: Union[Language, None] = None,
+    ):
         """
         Constructor of TextComplexityComputer
 
         Args:
             scaler (Union[str, None]): chose the scaler between StandardScaler (by default), MinMaxScaler and none.
+            cache (Union[ResultCache, None]): a cache of the results of get_metrics_scores and compute. The results
+            are keyed on the cleaned text, the package version, the spaCy model, the scaler and the metrics, and a
+            cached result is returned without parsing the text. By default, nothing is cached.
+            parse_cache (Union[ParseCache, None]): a cache of the spaCy objects of the texts, keyed on the cleaned text
+            and the spaCy model, shared by all the methods. A cached spaCy object is loaded instead of parsing the
+            text again. With a parse cache, the texts are parsed with every component used by the registered metrics
+            (so without the NER), whatever the selected metrics. By default, nothing is cached.
+            tagger (Union[Language, None]): the spaCy pipeline parsing the texts. It must give the POS, morphology,
+            lemmas and dependencies of fr_core_news_sm. By default, fr_core_news_sm is loaded.
         """
-        model_name = "fr_core_news_sm"
-        try:
-            self.tagger = spacy.load(model_name)
-        except OSError:
-            print(download(model_name))
-            self.tagger = spacy.load(model_name)
+        if tagger is not None:
+            self.tagger = tagger
+        if not scaler:
+            warnings.warn("You are running TextComplexityComputer without scaler (scaler=None).")
 
-        biberpy.language = "fr"
+        self.verbosity = verbosity
+        self.cache = cache
+        self.parse_cache = parse_cache
+        self.load_times = {}
+        self._layouts: Dict[Plan, _Layout] = {}
+        self._scaler_name = scaler
 
-        self.word_lists, self.mwe_list = read_word_lists(
-            os.path.join(os.path.dirname(__file__), 'resources', "fr", "fr.properties"),
-            verbosity=verbosity,
-        )
-        self.tag_list = read_num_list(
-            os.path.join(os.path.dirname(__file__), 'resources', "fr", "fr.tag.num"),
-        )
+    @cached_property
+    def tagger(self) -> Language:
+        return self._load("tagger", load_tagger, MODEL_NAME)
 
-        biberpy.word_lists = self.word_lists
-        biberpy.mwe_list = self.mwe_list
+    @cached_property
+    def _biberpy_resources(self) -> Tuple[Dict, Dict, ahocorasick.Automaton, List[str]]:
+        return self._load("word_lists", load_word_lists, LANGUAGE, self.verbosity)
 
-        biberpy.tag_list = self.tag_list
+    @property
+    def word_lists(self) -> Dict:
+        return self._biberpy_resources[0]
 
-        self.tagger.max_length = 5000000
+    @property
+    def mwe_list(self) -> Dict:
+        return self._biberpy_resources[1]
 
-        if scaler:
-            with open(
-                os.path.join(os.path.dirname(__file__), 'resources', "fr", f"fr_{scaler}.pickle"),
-                "rb",
-            ) as file:
-                self.scaler = pickle.load(file)
-        else:
-            warnings.warn("You are running TextComplexityComputer without scaler (scaler=None).")
-            self.scaler = None
+    @cached_property
+    def lexicon(self) -> Lexicon:
+        return self._load("lexicon", get_lexicon, LANGUAGE)
+
+    @cached_property
+    def scaler(self) -> Union[AffineScaler, None]:
+        if not self._scaler_name:
+            return None
+        return self._load("scaler", load_scaler, LANGUAGE, self._scaler_name)
 
-        # Get Classifier
-        with open(os.path.join(os.path.dirname(__file__), 'resources', "fr", "fr_model.pickle"), "rb") as rb:
-            self.model = pickle.load(rb)
+    @cached_property
+    def model(self) -> TreeEnsemble:
+        return self._load("model", load_model, LANGUAGE)
+
+    def warmup(self) -> Dict[str, float]:
+        """
+        Load every component now instead of on first use (e.g. before serving requests).
+
+        Returns:
+            Dict[str, float]: the time in seconds taken to get each component
+        """
+        for component in ["tagger", "lexicon", "scaler", "model"]:
+            getattr(self, component)
+        self._set_biberpy_resources()
+        return dict(self.load_times)
 
     def get_metrics_scores(
         self,
-        text: str,
+        text: Union[str, Doc],
         metrics: Union[list, str, None] = "all",
         with_biberpy: bool = True,
-    ) -> pd.DataFrame:
+        as_frame: bool = True,
+    ) -> Union[pd.DataFrame, MetricsScores]:
         """
         Getter of the metrics scores
             Details of metrics:
@@ -111,87 +202,407 @@ class TextComplexityComputer:
                 - and others from biberpy module (see biberpy.py documentation for more).
 
         Args:
-            text (string): text that will be computed
+            text (Union[str, Doc]): text that will be computed, or its spaCy object (see get_sp_object). A spaCy
+            object is used as is, without parsing nor caching.
             metrics (Union[list, str, None], optional): list of metrics that will be computed (outside biberpy). By
-            default, it will process them all.
+            default ("all"), it will process all the metrics of the model, the other registered metrics being only
+            computed when listed.
             with_biberpy (bool, optional): process the biberpy's metrics (default at True).
+            as_frame (bool, optional): return a DataFrame (default at True), else the compact MetricsScores.
 
         Returns:
-            pd.DataFrame: the selected metrics scores
+            Union[pd.DataFrame, MetricsScores]: the selected metrics scores
         """
-        text = clean_text(text)
+        plan = self._get_plan(metrics, with_biberpy)
+        return self._get_result(self._get_metrics_values(text, plan), plan, as_frame)
 
-        metrics_call = {
-            "mls": syntactic_complexity.mean_length_sentences,
-            "ps_30": syntactic_complexity.ps_30,
-            "nws_90": syntactic_complexity.nws_90,
-            "mlt": syntactic_complexity.mean_length_tunit,
-            "tu_s": syntactic_complexity.tu_s,
-            "ctu_tu": syntactic_complexity.ctu_tu,
-            "dc_c": syntactic_complexity.dc_c,
-            "c_s": syntactic_complexity.c_s,
-            "c_tu": syntactic_complexity.c_tu,
-            "cp_c": syntactic_complexity.cp_c,
-            "cp_tu": syntactic_complexity.cp_tu,
-            "pa": partial(vocabulary_complexity.pa, language="fr"),
-            "nlm": vocabulary_complexity.nlm,
-            "uni_gram_lem": partial(vocabulary_complexity.uni_gram_lem, language="fr"),
-            "msttr": lexical_diversity.mean_sequential_ttr,
-            "mattr": lexical_diversity.measure_textual_lexical_diversity,
-            "mtld": lexical_diversity.measure_textual_lexical_diversity,
-            "fk_ease": readability.fk_ease,
-            "bingui": readability.bingui,
-            "km_score": readability.km_formula,
-        }
-
-        all_metrics = list(metrics_call.keys())
+    def get_metrics_scores_batch(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        texts: Union[Iterable[Union[str, Doc]], DocBin],
+        metrics: Union[list, str, None] = "all",
+        with_biberpy: bool = True,
+        batch_size: int = 256,
+        n_process: int = 1,
+        as_frame: bool = True,
+    ) -> Union[pd.DataFrame, MetricsScores]:
+        """
+        Getter of the metrics scores of many texts. The texts are streamed through spaCy's ``nlp.pipe`` and the
+        scaler is applied once per batch.
 
-        if metrics == "all":
-            metrics = all_metrics
-        elif isinstance(metrics, str):
-            metrics = [metrics]
-        elif metrics is None:
-            metrics = []
+        Args:
+            texts (Union[Iterable[Union[str, Doc]], DocBin]): texts that will be computed, or their spaCy objects (see
+            get_sp_object). The spaCy objects are used as is, without parsing.
+            metrics (Union[list, str, None], optional): list of metrics that will be computed (outside biberpy). By
+            default ("all"), it will process all the metrics of the model, the other registered metrics being only
+            computed when listed.
+            with_biberpy (bool, optional): process the biberpy's metrics (default at True).
+            batch_size (int, optional): number of texts processed together (default at 256).
+            n_process (int, optional): number of processes used by spaCy to parse the texts (default at 1).
+            as_frame (bool, optional): return a DataFrame (default at True), else the compact MetricsScores.
 
-        sp_object = self.tagger(text)
-        metrics_scores = pd.DataFrame(np.zeros((1, len(all_metrics))), columns=all_metrics)
-        for metric in metrics:
-            metrics_scores[metric][0] = metrics_call[metric](sp_object)
-
-        if with_biberpy:
-            biber = biberpy.getbiberdims(text)
-            metrics_scores = metrics_scores.assign(**biber)
-            metrics = [*metrics, *list(biberpy.dimnames.values())]
-        else:
-            for metric in biberpy.dimnames.values():
-                metrics_scores[metric] = 0
-
-        if self.scaler:
-            scaled_metrics_scores = pd.DataFrame(
-                self.scaler.transform(metrics_scores[sorted(metrics_scores.columns)]),
-                columns=sorted(metrics_scores.columns),
-            )
-            metrics_scores = scaled_metrics_scores
-        return metrics_scores[sorted(metrics)]
+        Returns:
+            Union[pd.DataFrame, MetricsScores]: the selected metrics scores, one row per text in the same order as
+            ``texts``
+        """
+        plan = self._get_plan(metrics, with_biberpy)
+        batches = list(self._iter_batch_values(texts, plan, batch_size, n_process))
+        if len(batches) == 0:
+            return self._get_result(self._get_values([], plan), plan, as_frame)
+        # Concatenated column by column, the scores staying column-major
+        return self._get_result(np.concatenate([values.T for values in batches], axis=1).T, plan, as_frame)
+
+    def iter_scores(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        texts: Union[Iterable[Union[str, Doc]], DocBin],
+        metrics: Union[list, str, None] = "all",
+        with_biberpy: bool = True,
+        batch_size: int = 256,
+        n_process: int = 1,
+        as_frame: bool = True,
+    ) -> Iterator[Union[pd.DataFrame, MetricsScores]]:
+        """
+        Lazy getter of the metrics scores of many texts. The texts are consumed ``batch_size`` at a time and the
+        scores are yielded one text at a time, in the same order as ``texts``.
+
+        Args:
+            texts (Union[Iterable[Union[str, Doc]], DocBin]): texts that will be computed, or their spaCy objects (see
+            get_sp_object). The spaCy objects are used as is, without parsing.
+            metrics (Union[list, str, None], optional): list of metrics that will be computed (outside biberpy). By
+            default ("all"), it will process all the metrics of the model, the other registered metrics being only
+            computed when listed.
+            with_biberpy (bool, optional): process the biberpy's metrics (default at True).
+            batch_size (int, optional): number of texts processed together (default at 256).
+            n_process (int, optional): number of processes used by spaCy to parse the texts (default at 1).
+            as_frame (bool, optional): return a DataFrame (default at True), else the compact MetricsScores.
+
+        Yields:
+            Union[pd.DataFrame, MetricsScores]: the selected metrics scores of a text (same format as
+            ``get_metrics_scores``)
+        """
+        plan = self._get_plan(metrics, with_biberpy)
+        for values in self._iter_batch_values(texts, plan, batch_size, n_process):
+            for i in range(len(values)):
+                yield self._get_result(values[i : i + 1], plan, as_frame)
 
     def get_sp_object(self, text: str) -> Doc:
         """
         Getter of the spaCy object
         Args:
-            text (string): text that will be computed
+            text (string): text that will be computed. With a parse cache, the spaCy object is the one used to score
+            the text (see ``parse_cache``).
 
         Returns:
             spacy.tokens.doc.Doc: the spaCy object
         """
-        return self.tagger(clean_text(text))
+        return self._parse(clean_text(text))
 
-    def compute(self, text: str):
+    def compute(self, text: Union[str, Doc]):
         """
         Compute the text and evaluate the global difficulty level
         Args:
-            text (string): text that will be computed
+            text (Union[str, Doc]): text that will be computed, or its spaCy object (see get_sp_object). A spaCy
+            object is used as is, without parsing nor caching.
 
         Returns:
             int: estimation of the level of difficulty
         """
-        return self.model.predict(self.get_metrics_scores(text))
+        if self.cache is None or isinstance(text, Doc):
+            return self._predict(self._get_metrics_values(text, _MODEL_PLAN))
+
+        cache_key = self._get_cache_key(clean_text(text), "level")
+        level = self.cache.get(cache_key)
+        if level is None:
+            level = self._predict(self._get_metrics_values(text, _MODEL_PLAN))
+            self.cache.set(cache_key, level.copy())
+        return level.copy()
+
+    def compute_batch(self, texts: Union[Iterable[Union[str, Doc]], DocBin], batch_size: int = 256, n_process: int = 1):
+        """
+        Compute many texts and evaluate their global difficulty level. The model is called once per batch.
+        Args:
+            texts (Union[Iterable[Union[str, Doc]], DocBin]): texts that will be computed, or their spaCy objects (see
+            get_sp_object). The spaCy objects are used as is, without parsing.
+            batch_size (int, optional): number of texts processed together (default at 256).
+            n_process (int, optional): number of processes used by spaCy to parse the texts (default at 1).
+
+        Returns:
+            np.ndarray: estimation of the level of difficulty of each text, in the same order as ``texts``
+        """
+        predictions = [
+            self._predict(values) for values in self._iter_batch_values(texts, _MODEL_PLAN, batch_size, n_process)
+        ]
+        if len(predictions) == 0:
+            return np.empty(0, dtype=self.model.classes_.dtype)
+        return np.concatenate(predictions)
+
+    def predict(self, metrics_scores: MetricsScores) -> np.ndarray:
+        """
+        Evaluate the global difficulty level of metrics scores already computed, from their array.
+        Args:
+            metrics_scores (MetricsScores): the metrics scores of the model (``metrics=MODEL_METRICS`` and
+            ``as_frame=False``).
+
+        Returns:
+            np.ndarray: estimation of the level of difficulty of each text of the metrics scores
+
+        Raises:
+            ValueError: if the metrics scores are not the ones of the model.
+        """
+        if metrics_scores.columns != FEATURES:
+            raise ValueError("The metrics scores are not the ones of the model (see MODEL_METRICS).")
+        return self._predict(metrics_scores.values)
+
+    def _get_metrics_values(self, text: Union[str, Doc], plan: Plan) -> np.ndarray:
+        """
+        Get the scaled metrics scores of a single text (see get_metrics_scores) as a row of the layout of the plan,
+        from the result cache if any.
+        """
+        if isinstance(text, Doc):
+            self._prepare(plan)
+            return self._get_values([text], plan)
+
+        text = clean_text(text)
+        if self.cache is not None:
+            cache_key = self._get_cache_key(text, "metrics_values", sorted(plan.names), plan.with_biberpy)
+            cached_values = self.cache.get(cache_key)
+            if cached_values is not None:
+                return cached_values.copy()
+
+        self._prepare(plan)
+        sp_object = self._parse(text, plan.get_disabled_pipes(self.tagger.pipe_names))
+        values = self._get_values([sp_object], plan)
+
+        if self.cache is not None:
+            self.cache.set(cache_key, values.copy())
+        return values
+
+    def _iter_batch_values(
+        self,
+        texts: Union[Iterable[Union[str, Doc]], DocBin],
+        plan: Plan,
+        batch_size: int,
+        n_process: int,
+    ) -> Iterator[np.ndarray]:
+        """
+        Stream the texts through spaCy and yield the scaled metrics scores of each batch of ``batch_size`` texts.
+        """
+        self._prepare(plan)
+
+        if isinstance(texts, DocBin):
+            texts = texts.get_docs(self.tagger.vocab)
+        sp_objects = self._pipe(texts, batch_size, n_process, plan.get_disabled_pipes(self.tagger.pipe_names))
+        while True:
+            batch = list(islice(sp_objects, batch_size))
+            if len(batch) == 0:
+                return
+            yield self._get_values(batch, plan)
+
+    def _parse(self, text: str, disable: Sequence[str] = ()) -> Doc:
+        """
+        Parse a cleaned text with spaCy, without the ``disable`` components, or load its spaCy object from the parse
+        cache. The texts of the parse cache are parsed for every metric, whatever ``disable``.
+        """
+        if self.parse_cache is None:
+            return self.tagger(text, disable=disable)
+        parse_key = get_cache_key(text, self._spacy_model)
+        sp_object = self.parse_cache.get(parse_key, self.tagger.vocab)
+        if sp_object is None:
+            sp_object = self.tagger(text, disable=self._get_cached_disabled_pipes())
+            self.parse_cache.add(parse_key, sp_object)
+        return sp_object
+
+    def _get_cached_disabled_pipes(self) -> List[str]:
+        """
+        The components disabled to parse the texts of the parse cache: the ones used by none of the registered
+        metrics, so that a cached spaCy object can be scored with any selection of metrics.
+        """
+        return get_plan(METRICS, with_biberpy=True).get_disabled_pipes(self.tagger.pipe_names)
+
+    def _pipe(
+        self, texts: Iterable[Union[str, Doc]], batch_size: int, n_process: int, disable: Sequence[str]
+    ) -> Iterator[Doc]:
+        """
+        Stream the texts through spaCy without the ``disable`` components, in order. The spaCy objects given instead of
+        texts are passed through.
+        """
+        texts, sources = tee(texts)
+        sp_objects = self._pipe_texts(
+            (clean_text(text) for text in texts if not isinstance(text, Doc)), batch_size, n_process, disable
+        )
+        # Every text of sources has its spaCy object in sp_objects, in the same order
+        for source in sources:
+            yield source if isinstance(source, Doc) else next(sp_objects)  # pylint: disable=stop-iteration-return
+
+    def _pipe_texts(
+        self, texts: Iterable[str], batch_size: int, n_process: int, disable: Sequence[str]
+    ) -> Iterator[Doc]:
+        """
+        Stream cleaned texts through spaCy, loading the spaCy objects found in the parse cache instead of parsing them.
+        The texts not found are parsed for every metric, whatever ``disable``, in a single stream, so that the processes
+        of spaCy are started once, and the spaCy objects found are held until the texts before them are parsed.
+        """
+        if self.parse_cache is None:
+            yield from self.tagger.pipe(texts, batch_size=batch_size, n_process=n_process, disable=disable)
+            return
+        # The parse key and the cached spaCy object, or None, of every text read by spaCy but not yielded yet
+        pending = deque()
+
+        def get_missing_texts() -> Iterator[str]:
+            for text in texts:
+                parse_key = get_cache_key(text, self._spacy_model)
+                sp_object = self.parse_cache.get(parse_key, self.tagger.vocab)
+                pending.append((parse_key, sp_object))
+                if sp_object is None:
+                    yield text
+
+        for sp_object in self.tagger.pipe(
+            get_missing_texts(), batch_size=batch_size, n_process=n_process, disable=self._get_cached_disabled_pipes()
+        ):
+            # The first text not found in pending is the one parsed, the ones found before it are yielded first
+            while pending[0][1] is not None:
+                yield pending.popleft()[1]
+            parse_key, _ = pending.popleft()
+            self.parse_cache.add(parse_key, sp_object)
+            yield sp_object
+        # Every text is read by now: the ones left were found in the cache
+        for _, sp_object in pending:
+            yield sp_object
+        self.parse_cache.flush()
+
+    def _get_cache_key(self, text: str, *parts) -> str:
+        """
+        Key of a result of the cleaned text in the cache, given the configuration of the computer.
+        """
+        return get_cache_key(text, __version__, self._spacy_model, self._scaler_name, *parts)
+
+    @cached_property
+    def _spacy_model(self) -> str:
+        """
+        Name and version of the spaCy model, read from the installed package when the model is not loaded yet so that
+        the cached results are found without loading it.
+        """
+        version = get_package_version(MODEL_NAME)
+        if "tagger" in self.__dict__ or version is None:
+            return f"{self.tagger.meta['lang']}_{self.tagger.meta['name']}-{self.tagger.meta['version']}"
+        return f"{MODEL_NAME}-{version}"
+
+    @cached_property
+    def _model_columns(self) -> Union[slice, List[int]]:
+        """
+        The columns of the features of the model in the layout of the model plan (FEATURES), in the order of the model.
+        """
+        if list(self.model.feature_names_in_) == FEATURES:
+            return slice(None)
+        return [FEATURES.index(feature) for feature in self.model.feature_names_in_]
+
+    def _load(self, component: str, load: Callable, *args) -> Any:
+        """
+        Get a component with its (per process) loader and record the time taken.
+        """
+        start = time.perf_counter()
+        value = load(*args)
+        self.load_times[component] = time.perf_counter() - start
+        if self.verbosity > 1:
+            print(f"Loaded {component} in {self.load_times[component]:.3f}s", file=sys.stderr)
+        return value
+
+    def _set_biberpy_resources(self) -> None:
+        biberpy.language = LANGUAGE
+        biberpy.word_lists, biberpy.mwe_list, biberpy.mwe_automaton, biberpy.mwe_classes = self._biberpy_resources
+
+    def _prepare(self, plan: Plan) -> None:
+        """
+        Load the resources used by the metrics of the plan.
+        """
+        if LEXICON in plan.intermediates:
+            _ = self.lexicon
+        if plan.with_biberpy:
+            self._set_biberpy_resources()
+
+    @staticmethod
+    def _get_plan(metrics: Union[list, str, None], with_biberpy: bool) -> Plan:
+        """
+        Resolve the selected metrics ("all" being the metrics of the model) into their computation plan.
+        """
+        if metrics == "all":
+            metrics = MODEL_METRICS
+        elif isinstance(metrics, str):
+            metrics = [metrics]
+        elif metrics is None:
+            metrics = []
+        return get_plan(metrics, with_biberpy)
+
+    def _get_layout(self, plan: Plan) -> _Layout:
+        """
+        Get the columns of the metrics scores of a plan, and the scaler restricted to the scaled columns, computed on
+        the first use of the plan. The registered metrics that are not features of the scaler are not scaled.
+        """
+        layout = self._layouts.get(plan)
+        if layout is None:
+            columns = plan.names
+            if plan.with_biberpy:
+                columns = [*columns, *biberpy.dimnames.values()]
+            columns = sorted(columns)
+            column_index = {column: i for i, column in enumerate(columns)}
+            biber_columns = (
+                [(name, column_index[name]) for name in biberpy.dimnames.values()] if plan.with_biberpy else []
+            )
+
+            scaled_columns, scaler = [], None
+            if self.scaler:
+                features = set(self.scaler.feature_names_in_)
+                scaled_columns = [i for i, column in enumerate(columns) if column in features]
+                if len(scaled_columns) > 0:
+                    scaler = self.scaler.subset([columns[i] for i in scaled_columns])
+                if len(scaled_columns) == len(columns):
+                    scaled_columns = slice(None)
+            layout = _Layout(
+                columns,
+                column_index,
+                [column_index[name] for name in plan.names],
+                biber_columns,
+                scaled_columns,
+                scaler,
+            )
+            self._layouts[plan] = layout
+        return layout
+
+    def _get_values(self, sp_objects: List[Doc], plan: Plan) -> np.ndarray:
+        """
+        Compute the metrics scores of many spaCy objects into a preallocated column-major array, one row per spaCy
+        object in the columns of the layout of the plan, and scale them all at once, in place.
+        """
+        layout = self._get_layout(plan)
+        values = np.zeros((len(sp_objects), len(layout.columns)), order="F")
+        for row, sp_object in zip(values, sp_objects):
+            plan.compute_intermediates(sp_object)
+            for metric, column in zip(plan.metrics, layout.metric_columns):
+                row[column] = metric.function(sp_object)
+            clear_memoized(sp_object)
+            if plan.with_biberpy:
+                biber_scores = biberpy.getbiberdims_from_doc(sp_object)
+                for name, column in layout.biber_columns:
+                    row[column] = biber_scores[name]
+
+        if layout.scaler is not None:
+            if isinstance(layout.scaled_columns, slice):
+                layout.scaler.transform_columns(values, layout.scaled_columns)
+            else:
+                values[:, layout.scaled_columns] = layout.scaler.transform_columns(
+                    values[:, layout.scaled_columns], slice(None)
+                )
+        return values
+
+    def _predict(self, values: np.ndarray) -> np.ndarray:
+        """
+        Estimate the levels of difficulty of the metrics scores of the model plan.
+        """
+        return self.model.predict(values[:, self._model_columns])
+
+    def _get_result(self, values: np.ndarray, plan: Plan, as_frame: bool) -> Union[pd.DataFrame, MetricsScores]:
+        """
+        Wrap the metrics scores of a plan, without copy, into a DataFrame or a MetricsScores.
+        """
+        layout = self._get_layout(plan)
+        metrics_scores = MetricsScores(layout.columns, values, layout.column_index)
+        return metrics_scores.to_frame() if as_frame else metrics_scores
@@ -1,12 +1,32 @@
 # pylint: disable=c-extension-no-member, consider-using-set-comprehension
 import re
 import sys
-from typing import Dict, Tuple
+from array import array
+from typing import Callable, Dict, List, Pattern, Set, Tuple, Union
 
 import ahocorasick
 
+# The substitutions of clean_text, compiled once and applied in order: each one can match the output of the previous
+# ones (e.g. "3.- 4 -" becomes "3. " then " "). The substitutions which commute are merged into one pattern. The
+# patterns only start at the beginning of a run of digits, word characters or dots (the lookbehinds and word
+# boundaries): a match starting inside a run would also start at its beginning, and the patterns run in linear time
+# whatever the text instead of retrying every position of a long run.
+_ELLIPSES = {"[…]": " ", "…": " . "}
+_CLEANING_SUBSTITUTIONS: List[Tuple[Pattern, Union[str, Callable]]] = [
+    # bullet list markers, underscores and ellipses
+    (re.compile(r"\[…\]|[_•○…]"), lambda match: _ELLIPSES.get(match.group(), " ")),
+    # page numbers
+    (re.compile(r"- \d+ -"), " "),
+    # numbered list markers
+    (re.compile(r"\d(?<!\d\d)\d*\)?\. "), " "),
+    (re.compile(r"(?:\(\d|\d(?<!\d\d)(?<!\d\.\d))\d*(?:\.\d+)*\)?\.? "), " "),
+    (re.compile(r"\(?\b\w+\) "), " "),
+    # a space after the points followed by a word, and the space multiplications (the single spaces are kept as is)
+    (re.compile(r"\.(?<!\.\.)\.*(?=\w)|\s{2,}|[^\S ]"), lambda match: ". " if match.group()[0] == "." else " "),
+]
 
-def clean_text(text: str) -> str:
+
+def clean_text(text: str, return_offsets: bool = False) -> Union[str, Tuple[str, array]]:
     """
     Text cleaner
     Below is a comprehensive list of changes:
@@ -17,22 +37,34 @@ def clean_text(text: str) -> str:
 
     Args:
         text (string): text that will be computed
+        return_offsets (bool, optional): also return the offset of every character of the cleaned text in ``text``
+        (default at False). The characters inserted by a substitution are mapped to the start of the replaced
+        characters.
 
     Returns:
-        string: cleaned text
+        string: cleaned text, and the offsets (array.array of int) if ``return_offsets``
     """
-    text = text.replace("_", " ")
-    text = text.replace("•", " ")
-    text = text.replace("○", " ")
-    text = re.sub(r"\[…\]", " ", text)
-    text = text.replace("…", " . ")
-    text = re.sub(r"- \d+ -", " ", text)
-    text = re.sub(r"\d+\)?\. ", " ", text)
-    text = re.sub(r"\(?\d+(\.\d+)*\)?\.? ", " ", text)
-    text = re.sub(r"\(?\w+\) ", " ", text)
-    text = re.sub(r"\.+(\w+)", r". \g<1>", text)
-    text = re.sub(r"\s+", " ", text)
-    return text
+    if not return_offsets:
+        for pattern, replacement in _CLEANING_SUBSTITUTIONS:
+            text = pattern.sub(replacement, text)
+        return text
+
+    offsets = array("q", range(len(text)))
+    for pattern, replacement in _CLEANING_SUBSTITUTIONS:
+        pieces, new_offsets, end = [], array("q"), 0
+        for match in pattern.finditer(text):
+            substitute = replacement if isinstance(replacement, str) else replacement(match)
+            pieces.append(text[end : match.start()])
+            pieces.append(substitute)
+            new_offsets.extend(offsets[end : match.start()])
+            new_offsets.extend([offsets[match.start()]] * len(substitute))
+            end = match.end()
+        if end == 0:
+            continue
+        pieces.append(text[end:])
+        new_offsets.extend(offsets[end:])
+        text, offsets = "".join(pieces), new_offsets
+    return text, offsets
 
 
 def read_word_lists(file_path: str, verbosity: int) -> Tuple[Dict, Dict]:
@@ -73,6 +105,35 @@ def read_word_lists(file_path: str, verbosity: int) -> Tuple[Dict, Dict]:
     return word_lists, mwe_list
 
 
+def build_mwe_automaton(word_lists: Dict[str, Set[str]]) -> Tuple[ahocorasick.Automaton, List[str]]:
+    """
+    Builds a single automaton finding the multi-word expressions (the entries with a space) of all the word lists.
+    The payload of an expression is its length and the identifiers of the word lists it belongs to, so that one scan
+    of a text counts the expressions of every word list.
+
+    Args:
+        word_lists (dict): the word lists, by name (see read_word_lists).
+
+    Returns:
+        A tuple (automaton, mwe_classes), mwe_classes being the names of the word lists indexed by identifier. The
+        automaton is empty if there is no multi-word expression.
+    """
+    mwe_classes = []
+    mwe_ids = {}
+    for word_type, values in word_lists.items():
+        mwes = set(mwe.lower() for mwe in values if mwe.find(" ") > 0)
+        if len(mwes) > 0:
+            for mwe in mwes:
+                mwe_ids.setdefault(mwe, []).append(len(mwe_classes))
+            mwe_classes.append(word_type)
+    automaton = ahocorasick.Automaton()
+    for mwe, class_ids in mwe_ids.items():
+        automaton.add_word(mwe, (len(mwe), tuple(class_ids)))
+    if len(mwe_ids) > 0:
+        automaton.make_automaton()
+    return automaton, mwe_classes
+
+
 def read_num_list(file_path: str) -> Dict:
     """
     Reads a numfile in the format: `"1625260 years year NOUN Number=Plur"`.
@@ -0,0 +1,149 @@
+from typing import Any, Sequence
+
+import numpy as np
+
+
+class TreeEnsemble:
+    """
+    NumPy implementation of the fitted classifier of the package (scikit-learn's RandomForestClassifier). The nodes of
+    all the trees are stored in flat arrays, so that the classifier is loaded without scikit-learn and a batch of texts
+    is evaluated in one descent of every tree at once, with the same decisions and probabilities as ``predict``.
+
+    Attributes:
+        feature_names_in_ (np.ndarray): the names of the features, in order.
+        classes_ (np.ndarray): the classes (levels of difficulty).
+        roots (np.ndarray): the index of the root node of every tree.
+        feature (np.ndarray): the feature tested by every node (0 for the leaves).
+        threshold (np.ndarray): the float32 threshold of every node: the samples whose feature is lower or equal go to
+            the left child.
+        children_left (np.ndarray): the left child of every node (the node itself for the leaves).
+        children_right (np.ndarray): the right child of every node (the node itself for the leaves).
+        missing_go_to_left (np.ndarray): whether the samples whose feature is NaN go to the left child of every node.
+        values (np.ndarray): the class values of every node (``tree_.value``), one row per node.
+        max_depth (int): the depth of the deepest tree.
+    """
+
+    def __init__(
+        self,
+        feature_names: Sequence[str],
+        classes: np.ndarray,
+        roots: np.ndarray,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        children_left: np.ndarray,
+        children_right: np.ndarray,
+        missing_go_to_left: np.ndarray,
+        values: np.ndarray,
+        max_depth: int,
+    ):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self.feature_names_in_ = np.asarray(feature_names, dtype=object)
+        self.classes_ = classes
+        self.roots = roots
+        self.feature = feature
+        self.threshold = threshold
+        self.children_left = children_left
+        self.children_right = children_right
+        self.missing_go_to_left = missing_go_to_left
+        self.values = values
+        self.max_depth = max_depth
+        # The child of every node indexed by the decision (0: right, 1: left)
+        self._children = np.stack([children_right, children_left], axis=1)
+
+    @classmethod
+    def from_sklearn(cls, model: Any) -> "TreeEnsemble":
+        """
+        Export a fitted scikit-learn random forest into flat node arrays.
+
+        Args:
+            model (RandomForestClassifier): the fitted classifier (with a single output).
+
+        Returns:
+            TreeEnsemble: the classifier
+        """
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        offsets = np.cumsum([0, *(tree.node_count for tree in trees)])
+        feature, threshold, children_left, children_right, missing_go_to_left, values = [], [], [], [], [], []
+        for offset, tree in zip(offsets, trees):
+            nodes = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, 0.0, tree.threshold))
+            children_left.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+            children_right.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+            missing_go_to_left.append(np.asarray(getattr(tree, "missing_go_to_left", np.zeros(tree.node_count)), bool))
+            # Taken as is, as DecisionTreeClassifier.predict_proba does since scikit-learn 1.4
+            values.append(tree.value[:, 0, : model.n_classes_])
+
+        return cls(
+            list(model.feature_names_in_),
+            np.asarray(model.classes_),
+            offsets[:-1].astype(np.int32),
+            np.concatenate(feature).astype(np.int32),
+            _round_down_to_float32(np.concatenate(threshold)),
+            np.concatenate(children_left).astype(np.int32),
+            np.concatenate(children_right).astype(np.int32),
+            np.concatenate(missing_go_to_left),
+            np.concatenate(values),
+            max(tree.max_depth for tree in trees),
+        )
+
+    def predict_proba(self, values: Any) -> np.ndarray:
+        """
+        Estimate the probability of every class, the mean of the values of the leaves reached in every tree.
+
+        Args:
+            values (Union[np.ndarray, pd.DataFrame]): the values of the features, one row per sample. The columns of a
+                DataFrame are taken by name.
+
+        Returns:
+            np.ndarray: the probabilities, one row per sample and one column per class
+        """
+        features = self._get_features(values)
+        has_missing = bool(np.isnan(features).any())
+        flat_features = features.ravel()
+        row_offsets = np.arange(features.shape[0]) * features.shape[1]
+        # One node per (tree, sample), all the trees descending together (the leaves point to themselves)
+        nodes = np.repeat(self.roots[:, np.newaxis], features.shape[0], axis=1)
+        for _ in range(self.max_depth):
+            feature_values = flat_features[row_offsets + self.feature[nodes]]
+            go_left = feature_values <= self.threshold[nodes]
+            if has_missing:
+                go_left |= np.isnan(feature_values) & self.missing_go_to_left[nodes]
+            nodes = self._children[nodes, go_left.view(np.uint8)]
+        # Summed tree by tree, in the order of the forest
+        probabilities = self.values[nodes].sum(axis=0)
+        probabilities /= len(self.roots)
+        return probabilities
+
+    def predict(self, values: Any) -> np.ndarray:
+        """
+        Estimate the class of every sample.
+
+        Args:
+            values (Union[np.ndarray, pd.DataFrame]): the values of the features, one row per sample. The columns of a
+                DataFrame are taken by name.
+
+        Returns:
+            np.ndarray: the classes
+        """
+        return self.classes_.take(np.argmax(self.predict_proba(values), axis=1), axis=0)
+
+    def _get_features(self, values: Any) -> np.ndarray:
+        if hasattr(values, "columns"):
+            values = values[list(self.feature_names_in_)]
+        # The trees compare float32 features, as scikit-learn does
+        features = np.ascontiguousarray(values, dtype=np.float32)
+        if features.ndim != 2 or features.shape[1] != len(self.feature_names_in_):
+            raise ValueError(
+                f"Expected samples of {len(self.feature_names_in_)} features, got an array of shape {features.shape}."
+            )
+        return features
+
+
+def _round_down_to_float32(threshold: np.ndarray) -> np.ndarray:
+    # The largest float32 lower or equal to each threshold, so that comparing float32 features to it gives the same
+    # decisions as comparing them to the float64 threshold
+    rounded = threshold.astype(np.float32)
+    above = rounded.astype(np.float64) > threshold
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded